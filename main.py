@@ -166,6 +166,8 @@ def run_cli_mode(config, args):
                 break
             except Exception as e:
                 print(f"❌ Erro na tradução: {e}")
+        
+        translator.close()
     
     except Exception as e:
         logging.error(f"Erro no modo CLI: {e}")
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import argparse
 import datetime as dt
 import json
+import statistics
+import sys
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import sacrebleu
 import torch
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
 
+DEFAULT_MODEL = "Helsinki-NLP/opus-mt-pt-en"
+# tests/translation_samples.json holds pt -> en references only.
+SAMPLES_PAIR = ("pt", "en")
+
 
 def _load_samples(path: Path) -> List[Dict[str, str]]:
     data = json.loads(path.read_text(encoding="utf-8"))
@@ -18,18 +25,123 @@ def _load_samples(path: Path) -> List[Dict[str, str]]:
     return data
 
 
-@torch.inference_mode()
-def _translate_batch(model_id: str, texts: List[str]) -> Tuple[List[str], float]:
+def _use_repo_imports() -> None:
+    repo_root = str(Path(__file__).resolve().parents[1])
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+
+def _check_model_pair(model_id: str) -> None:
+    """Rejects models that do not translate the language pair of the samples."""
+    _use_repo_imports()
+    from src.api.models_config import MODELS_MAP
+
+    pairs = sorted(pair for pair, spec in MODELS_MAP.items() if spec.model_id == model_id)
+    if SAMPLES_PAIR not in pairs:
+        served = ", ".join(f"{a}-{b}" for a, b in pairs) or "par desconhecido"
+        raise SystemExit(
+            f"sem amostras para {model_id} ({served}): tests/translation_samples.json só cobre "
+            f"{SAMPLES_PAIR[0]}-{SAMPLES_PAIR[1]}"
+        )
+
+
+def _quantize(model: Any) -> Any:
+    _use_repo_imports()
+    from src.api.quantization import quantize_dynamic_int8
+
+    return quantize_dynamic_int8(model)
+
+
+def _load(model_id: str) -> Tuple[Any, Any]:
     tokenizer = AutoTokenizer.from_pretrained(model_id)
     model = AutoModelForSeq2SeqLM.from_pretrained(model_id)
     model.eval()
+    return tokenizer, model
+
+
+@torch.inference_mode()
+def _translate_batch(
+    tokenizer: Any,
+    model: Any,
+    texts: List[str],
+    buckets: Sequence[int] = (),
+    max_batch_tokens: int = 0,
+) -> Tuple[List[str], float]:
+    """Translates ``texts`` in length buckets; without buckets or a token budget, as one padded batch."""
+    _use_repo_imports()
+    from src.api.inference import generate_bucketed
 
     started = time.perf_counter()
-    inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
-    out = model.generate(**inputs, max_new_tokens=256)
-    preds = tokenizer.batch_decode(out, skip_special_tokens=True)
+    outputs = generate_bucketed(
+        tokenizer,
+        model,
+        texts,
+        {"max_new_tokens": 256},
+        with_confidence=False,
+        boundaries=buckets,
+        max_tokens=max_batch_tokens,
+    )
     elapsed = time.perf_counter() - started
-    return preds, elapsed
+    return [text for text, _ in outputs], elapsed
+
+
+def _int8_comparison(
+    tokenizer: Any,
+    model: Any,
+    texts: List[str],
+    repeats: int = 3,
+    buckets: Sequence[int] = (),
+    max_batch_tokens: int = 0,
+) -> Tuple[List[str], float, float]:
+    """Times ``model`` against its dynamic int8 copy; returns the int8 predictions and both times.
+
+    Like :func:`_confidence_cost`, both variants first run once untimed, then ``repeats`` timed
+    rounds alternate which one goes first; the median round of each is returned (fp32, int8).
+    """
+    variants = {"fp32": model, "int8": _quantize(model)}
+    preds = {name: _translate_batch(tokenizer, m, texts, buckets, max_batch_tokens)[0] for name, m in variants.items()}
+
+    timings: Dict[str, List[float]] = {name: [] for name in variants}
+    for round_ in range(max(1, repeats)):
+        order = ("fp32", "int8") if round_ % 2 == 0 else ("int8", "fp32")
+        for name in order:
+            timings[name].append(_translate_batch(tokenizer, variants[name], texts, buckets, max_batch_tokens)[1])
+    return preds["int8"], statistics.median(timings["fp32"]), statistics.median(timings["int8"])
+
+
+def _confidence_cost(model_id: str, texts: List[str], repeats: int = 3) -> Dict[str, Any]:
+    """Times the API generation path with and without confidence scoring on one loaded model.
+
+    Both variants first run once untimed, then ``repeats`` timed rounds alternate which one goes
+    first, so neither pays the cold caches alone; the median round of each is reported.
+    """
+    _use_repo_imports()
+    from src.api.inference import generate_batch
+
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_id)
+    model.eval()
+    kwargs = {"max_new_tokens": 256}
+    for with_confidence in (True, False):
+        generate_batch(tokenizer, model, texts, kwargs, with_confidence)
+
+    timings: Dict[bool, List[float]] = {True: [], False: []}
+    for round_ in range(max(1, repeats)):
+        order = (True, False) if round_ % 2 == 0 else (False, True)
+        for with_confidence in order:
+            started = time.perf_counter()
+            generate_batch(tokenizer, model, texts, kwargs, with_confidence)
+            timings[with_confidence].append(time.perf_counter() - started)
+
+    with_s = statistics.median(timings[True])
+    without_s = statistics.median(timings[False])
+    per_sample = 1000 / max(len(texts), 1)
+    return {
+        "with_confidence_ms": int(with_s * per_sample),
+        "without_confidence_ms": int(without_s * per_sample),
+        "saved_ms_per_sample": round((with_s - without_s) * per_sample, 2),
+        "repeats": max(1, repeats),
+    }
 
 
 def _try_google_translate(texts: List[str]) -> Optional[List[str]]:
@@ -67,18 +179,72 @@ def _write_badge(path: Path, bleu: float) -> None:
     path.write_text(svg, encoding="utf-8")
 
 
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="BLEU/latency benchmark of the NeuroTranslator models")
+    parser.add_argument(
+        "--model", default=DEFAULT_MODEL, help="Hugging Face model id to benchmark (must serve pt-en, like the samples)"
+    )
+    parser.add_argument(
+        "--compare-int8",
+        action="store_true",
+        help="also run the model with dynamic int8 quantization and report BLEU/latency side by side",
+    )
+    parser.add_argument(
+        "--int8-repeats",
+        type=int,
+        default=3,
+        help="timed rounds per variant for --compare-int8 (after a warm-up, alternating order, median reported)",
+    )
+    parser.add_argument(
+        "--compare-confidence",
+        action="store_true",
+        help="report the per-sample latency saved by skipping confidence scoring",
+    )
+    parser.add_argument(
+        "--confidence-repeats",
+        type=int,
+        default=3,
+        help="timed rounds per variant for --compare-confidence (alternating order, median reported)",
+    )
+    parser.add_argument(
+        "--buckets",
+        default="16,32,64,128,256",
+        help="token-length bucket boundaries for batching (empty: a single bucket)",
+    )
+    parser.add_argument(
+        "--max-batch-tokens",
+        type=int,
+        default=4096,
+        help="padded tokens per generate batch (0: no limit); with no buckets either, one padded batch",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="write the results here instead of docs/metrics.json; comparison and non-default model runs "
+        "are only printed without it",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = _parse_args()
     repo_root = Path(__file__).resolve().parents[1]
     samples_path = repo_root / "tests" / "translation_samples.json"
     out_metrics = repo_root / "docs" / "metrics.json"
     out_badge = repo_root / "docs" / "metrics_badge.svg"
 
+    _check_model_pair(args.model)
     samples = _load_samples(samples_path)
     src_texts = [s["source"] for s in samples]
     refs = [s["target"] for s in samples]
 
-    model_id = "Helsinki-NLP/opus-mt-pt-en"
-    preds, elapsed = _translate_batch(model_id, src_texts)
+    _use_repo_imports()
+    from src.api.bucketing import parse_buckets
+
+    model_id = args.model
+    buckets = parse_buckets(args.buckets)
+    tokenizer, model = _load(model_id)
+    preds, elapsed = _translate_batch(tokenizer, model, src_texts, buckets, args.max_batch_tokens)
 
     bleu = float(sacrebleu.corpus_bleu(preds, [refs]).score)
     avg_latency_ms = int((elapsed / max(len(src_texts), 1)) * 1000)
@@ -101,10 +267,38 @@ def main() -> None:
         "google_diff_percent": round(diff_percent, 2) if diff_percent is not None else None,
     }
 
-    out_metrics.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    _write_badge(out_badge, bleu)
+    if args.compare_int8:
+        # The headline run above was cold; the comparison times warm, alternating rounds of both.
+        int8_preds, fp32_elapsed, int8_elapsed = _int8_comparison(
+            tokenizer, model, src_texts, args.int8_repeats, buckets, args.max_batch_tokens
+        )
+        int8_bleu = float(sacrebleu.corpus_bleu(int8_preds, [refs]).score)
+        per_sample = 1000 / max(len(src_texts), 1)
+        payload["int8"] = {
+            "bleu_score": round(int8_bleu, 2),
+            "avg_latency_ms": int(int8_elapsed * per_sample),
+            "fp32_avg_latency_ms": int(fp32_elapsed * per_sample),
+            "bleu_delta": round(int8_bleu - bleu, 2),
+            "speedup": round(fp32_elapsed / int8_elapsed, 2) if int8_elapsed > 0 else None,
+            "repeats": max(1, args.int8_repeats),
+        }
+
+    if args.compare_confidence:
+        payload["confidence_cost"] = _confidence_cost(model_id, src_texts, args.confidence_repeats)
+
+    report = json.dumps(payload, ensure_ascii=False, indent=2)
+    # Only the plain fp32 run of the default model is the project's headline metric.
+    headline = model_id == DEFAULT_MODEL and not args.compare_int8 and not args.compare_confidence
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(report, encoding="utf-8")
+    elif headline:
+        out_metrics.write_text(report, encoding="utf-8")
+        _write_badge(out_badge, bleu)
+    else:
+        print("docs/metrics.json não foi alterado; use --output para salvar este resultado", file=sys.stderr)
 
-    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    print(report)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.api.models_config import MODELS_MAP  # noqa: E402
+from src.api.onnx_backend import export_onnx_model  # noqa: E402
+from src.api.routing import Router  # noqa: E402
+from src.api.settings import SETTINGS  # noqa: E402
+from src.api.warmup import parse_pairs  # noqa: E402
+
+
+def _model_ids(raw_pairs: str) -> List[str]:
+    if not raw_pairs:
+        return sorted({spec.model_id for spec in MODELS_MAP.values()})
+    router = Router(
+        {pair: spec.model_id for pair, spec in MODELS_MAP.items()},
+        max_hops=SETTINGS.route_max_hops,
+        hop_penalty_ms=SETTINGS.route_hop_penalty_ms,
+    )
+    model_ids: List[str] = []
+    for src, tgt in parse_pairs(raw_pairs):
+        try:
+            hops = router.route(src, tgt)
+        except ValueError:
+            raise SystemExit(f"par não suportado: {src}-{tgt}") from None
+        for hop in hops:
+            model_id = MODELS_MAP[hop].model_id
+            if model_id not in model_ids:
+                model_ids.append(model_id)
+    return model_ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export NeuroTranslator models to ONNX for the onnx inference backend")
+    parser.add_argument("--pairs", default="", help="comma-separated pairs (e.g. pt-en,en-pt); all models when omitted")
+    parser.add_argument("--cache-dir", default=SETTINGS.onnx_cache_dir, help="export directory (NT_ONNX_CACHE_DIR)")
+    parser.add_argument("--overwrite", action="store_true", help="re-export models that already have an export")
+    args = parser.parse_args()
+
+    for model_id in _model_ids(args.pairs):
+        path = export_onnx_model(model_id, args.cache_dir, overwrite=args.overwrite)
+        print(f"{model_id} -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+@dataclass
+class _Pending:
+    item: Any
+    future: Future
+    enqueued_at: float
+
+
+@dataclass
+class _Lane:
+    items: Deque[_Pending] = field(default_factory=deque)
+    cond: Condition = field(default_factory=Condition)
+    thread: Optional[Thread] = None
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+class MicroBatcher:
+    """Groups concurrent submissions per key into a single call to ``run_batch``.
+
+    Each key gets its own lane and dispatcher thread. A batch is dispatched as
+    soon as ``max_batch`` items are waiting or ``window_ms`` has elapsed since
+    the oldest item was enqueued, whichever comes first. When ``submit`` is given
+    (e.g. an executor's ``submit``), batches run there and the lane waits for them,
+    so items arriving meanwhile accumulate into the next batch. ``on_dispatch`` is called
+    with the key, batch size and per-item queue waits (ms) of every dispatched batch.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[str, List[Any]], List[Any]],
+        window_ms: float = 10.0,
+        max_batch: int = 8,
+        max_queue: int = 256,
+        stats_window: int = 1024,
+        submit: Optional[Callable[..., Future]] = None,
+        on_dispatch: Optional[Callable[[str, int, List[float]], None]] = None,
+    ) -> None:
+        self._run_batch = run_batch
+        self._submit = submit
+        self._on_dispatch = on_dispatch
+        self.window_s = max(0.0, window_ms) / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.max_queue = max(1, max_queue)
+        self._lanes: Dict[str, _Lane] = {}
+        self._lanes_lock = Lock()
+        self._stats_lock = Lock()
+        self._batches = 0
+        self._requests = 0
+        self._last_batch_size = 0
+        self._max_batch_seen = 0
+        self._recent_sizes: Deque[int] = deque(maxlen=stats_window)
+        self._recent_waits_ms: Deque[float] = deque(maxlen=stats_window)
+
+    def submit(self, key: str, item: Any) -> Future:
+        lane = self._lane(key)
+        fut: Future = Future()
+        with lane.cond:
+            if len(lane.items) >= self.max_queue:
+                raise QueueFullError(key)
+            lane.items.append(_Pending(item, fut, time.perf_counter()))
+            lane.cond.notify()
+        return fut
+
+    def queue_depth(self, key: Optional[str] = None) -> int:
+        with self._lanes_lock:
+            if key is None:
+                lanes = list(self._lanes.values())
+            else:
+                lanes = [self._lanes[key]] if key in self._lanes else []
+        return sum(len(lane.items) for lane in lanes)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lanes_lock:
+            depths = {k: len(lane.items) for k, lane in self._lanes.items()}
+        with self._stats_lock:
+            sizes = list(self._recent_sizes)
+            waits = list(self._recent_waits_ms)
+            batches = self._batches
+            requests = self._requests
+            last_size = self._last_batch_size
+            max_seen = self._max_batch_seen
+        return {
+            "window_ms": round(self.window_s * 1000.0, 3),
+            "max_batch_size": self.max_batch,
+            "max_queue": self.max_queue,
+            "queue_depth": sum(depths.values()),
+            "queue_depth_by_model": {k: v for k, v in depths.items() if v},
+            "batches": batches,
+            "requests": requests,
+            "last_batch_size": last_size,
+            "max_observed_batch_size": max_seen,
+            "avg_batch_size": round(sum(sizes) / len(sizes), 3) if sizes else 0.0,
+            "queue_wait_ms": {
+                "avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "p50": round(_percentile(waits, 0.50), 3),
+                "p95": round(_percentile(waits, 0.95), 3),
+                "max": round(max(waits), 3) if waits else 0.0,
+            },
+        }
+
+    def _lane(self, key: str) -> _Lane:
+        lane = self._lanes.get(key)
+        if lane is not None:
+            return lane
+        with self._lanes_lock:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = _Lane()
+                lane.thread = Thread(target=self._run_lane, args=(key, lane), name=f"batcher:{key}", daemon=True)
+                self._lanes[key] = lane
+                lane.thread.start()
+            return lane
+
+    def _take_batch(self, lane: _Lane) -> List[_Pending]:
+        with lane.cond:
+            while not lane.items:
+                lane.cond.wait()
+            deadline = lane.items[0].enqueued_at + self.window_s
+            while len(lane.items) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                lane.cond.wait(remaining)
+            count = min(self.max_batch, len(lane.items))
+            return [lane.items.popleft() for _ in range(count)]
+
+    def _run_lane(self, key: str, lane: _Lane) -> None:
+        while True:
+            batch = [p for p in self._take_batch(lane) if p.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            dispatched_at = time.perf_counter()
+            waits_ms = [(dispatched_at - p.enqueued_at) * 1000.0 for p in batch]
+            self._record(len(batch), waits_ms)
+            if self._on_dispatch is not None:
+                self._on_dispatch(key, len(batch), waits_ms)
+            try:
+                items = [p.item for p in batch]
+                if self._submit is not None:
+                    results = self._submit(self._run_batch, key, items).result()
+                else:
+                    results = self._run_batch(key, items)
+                if len(results) != len(batch):
+                    raise RuntimeError("batch_result_size_mismatch")
+            except BaseException as exc:
+                for p in batch:
+                    p.future.set_exception(exc)
+                continue
+            for p, result in zip(batch, results):
+                p.future.set_result(result)
+
+    def _record(self, size: int, waits_ms: List[float]) -> None:
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += size
+            self._last_batch_size = size
+            self._max_batch_seen = max(self._max_batch_seen, size)
+            self._recent_sizes.append(size)
+            self._recent_waits_ms.extend(waits_ms)
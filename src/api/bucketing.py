@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import List, Sequence, Tuple
+
+DEFAULT_BUCKETS: Tuple[int, ...] = (16, 32, 64, 128, 256)
+
+
+def parse_buckets(raw: str) -> Tuple[int, ...]:
+    """Parses ``"16,32,64"`` into sorted, distinct, positive bucket boundaries; bad items are skipped."""
+    bounds = set()
+    for part in raw.split(","):
+        part = part.strip()
+        if part.isdigit() and int(part) > 0:
+            bounds.add(int(part))
+    return tuple(sorted(bounds))
+
+
+def bucket_batches(
+    lengths: Sequence[int], boundaries: Sequence[int] = DEFAULT_BUCKETS, max_tokens: int = 0, max_items: int = 0
+) -> List[List[int]]:
+    """Groups input indices into batches of similar token length.
+
+    Inputs are sorted by length and only share a batch when they fall in the same bucket
+    (``boundaries`` are inclusive upper bounds; longer inputs form a last bucket). A batch
+    is closed once adding the next input would pad it past ``max_tokens``
+    (items x longest input) or grow it past ``max_items``; ``0`` disables either limit. An
+    input longer than ``max_tokens`` still gets a batch of its own.
+    """
+    bounds = sorted(boundaries)
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_bucket = -1
+    for i in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        bucket = bisect_left(bounds, lengths[i])
+        if current and (
+            bucket != current_bucket
+            or (max_tokens > 0 and (len(current) + 1) * lengths[i] > max_tokens)
+            or (max_items > 0 and len(current) >= max_items)
+        ):
+            batches.append(current)
+            current = []
+        current.append(i)
+        current_bucket = bucket
+    if current:
+        batches.append(current)
+    return batches
+
+
+def padding_ratio(lengths: Sequence[int], batches: Sequence[Sequence[int]]) -> float:
+    """Share of the padded positions of ``batches`` that are padding."""
+    padded = sum(len(batch) * max(lengths[i] for i in batch) for batch in batches if batch)
+    return 1.0 - sum(lengths) / padded if padded else 0.0
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Protocol, Tuple, Union
+
+CacheKey = Tuple[str, str, Tuple[Tuple[str, Any], ...]]
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def _approx_size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (tuple, list)):
+        return sum(_approx_size(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_approx_size(k) + _approx_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class BackingStore(Protocol):
+    def get(self, key: CacheKey) -> Optional[Any]: ...
+
+    def put(self, key: CacheKey, value: Any) -> None: ...
+
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class TranslationCache:
+    """Thread-safe LRU cache bounded by entry count and approximate payload bytes, with optional TTL.
+
+    With a ``store`` (e.g. a persistent :class:`~translation_memory.TranslationMemory`) the
+    cache reads through to it on a miss and writes every ``put`` behind to it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_s: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        store: Optional[BackingStore] = None,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl_s = ttl_s if ttl_s and ttl_s > 0 else None
+        self._clock = clock
+        self.store = store
+        self._data: OrderedDict[CacheKey, Tuple[Any, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.store_hits = 0
+
+    @staticmethod
+    def make_key(model_id: str, text: str, params: Optional[Mapping[str, Any]] = None) -> CacheKey:
+        return model_id, normalize_text(text), tuple(sorted((params or {}).items()))
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        value = self.peek(key)
+        self.count_lookup(value is not None)
+        return value
+
+    def peek(self, key: CacheKey, local: bool = False) -> Optional[Any]:
+        """Like :meth:`get`, but not counted as a hit or miss.
+
+        For lookups that keep counters of their own (e.g. placeholder templates) and for
+        callers that try several keys per input and count it once with :meth:`count_lookup`.
+        ``local`` skips the store, for callers that must not block on its I/O.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, size, stored_at = entry
+                if self.ttl_s is None or self._clock() - stored_at <= self.ttl_s:
+                    self._data.move_to_end(key)
+                    return value
+                self._remove(key, size)
+                self.expirations += 1
+            if self.store is None or local:
+                return None
+
+        value = self.store.get(key)
+        if value is None:
+            return None
+        with self._lock:
+            self.store_hits += 1
+        self._insert(key, value)
+        return value
+
+    def count_lookup(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def put(self, key: CacheKey, value: Any) -> None:
+        self._insert(key, value)
+        if self.store is not None:
+            self.store.put(key, value)
+
+    def warm(self, entries: Iterable[Tuple[CacheKey, Any]]) -> int:
+        count = 0
+        for key, value in entries:
+            self.put(key, value)
+            count += 1
+        return count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        store = self.store.stats() if self.store is not None else None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "store_hits": self.store_hits,
+                "store": store,
+            }
+
+    def _insert(self, key: CacheKey, value: Any) -> None:
+        size = _approx_size(key[0]) + _approx_size(key[1]) + _approx_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size, self._clock())
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, (_, old_size, _) = next(iter(self._data.items()))
+                self._remove(old_key, old_size)
+                self.evictions += 1
+
+    def _remove(self, key: CacheKey, size: int) -> None:
+        del self._data[key]
+        self._bytes -= size
+
+
+def read_warm_file(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yields records from a ``.json`` list or a ``.jsonl`` file (one object per line)."""
+    p = Path(path)
+    raw = p.read_text(encoding="utf-8")
+    if p.suffix == ".jsonl":
+        for line in raw.splitlines():
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    yield record
+        return
+    data = json.loads(raw)
+    if isinstance(data, list):
+        yield from (r for r in data if isinstance(r, dict))
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator
+
+
+class OverloadedError(RuntimeError):
+    def __init__(self, retry_after_s: int) -> None:
+        super().__init__("overloaded")
+        self.retry_after_s = retry_after_s
+
+
+def _set_torch_threads(num_threads: int) -> None:
+    if num_threads <= 0:
+        return
+    try:
+        import torch
+
+        torch.set_num_threads(num_threads)
+    except Exception:
+        pass
+
+
+class InferenceExecutor:
+    """Dedicated worker pool for model inference with request admission control.
+
+    ``workers`` bounds how many ``generate`` calls run at once and ``torch_threads`` sets the
+    intra-op thread count of each worker, so ``workers * torch_threads`` should not exceed the
+    available cores. :meth:`admit` rejects new requests with :class:`OverloadedError` once
+    ``max_pending`` requests are already being served.
+    """
+
+    def __init__(self, workers: int = 2, torch_threads: int = 0, max_pending: int = 64) -> None:
+        self.workers = max(1, workers)
+        self.torch_threads = max(0, torch_threads)
+        self.max_pending = max(1, max_pending)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="inference",
+            initializer=_set_torch_threads,
+            initargs=(self.torch_threads,),
+        )
+        self._lock = Lock()
+        self._pending = 0
+        self._running_tasks = 0
+        self._queued_tasks = 0
+        self._avg_task_s = 0.0
+        self.rejected = 0
+        self.completed_tasks = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            self._queued_tasks += 1
+        return self._pool.submit(self._timed, fn, *args)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise OverloadedError(self._retry_after_locked())
+            self._pending += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def retry_after_s(self) -> int:
+        with self._lock:
+            return self._retry_after_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "torch_threads": self.torch_threads or None,
+                "max_pending": self.max_pending,
+                "pending_requests": self._pending,
+                "queued_tasks": self._queued_tasks,
+                "running_tasks": self._running_tasks,
+                "completed_tasks": self.completed_tasks,
+                "rejected": self.rejected,
+                "avg_task_ms": round(self._avg_task_s * 1000, 3),
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _timed(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            self._queued_tasks -= 1
+            self._running_tasks += 1
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running_tasks -= 1
+                self.completed_tasks += 1
+                self._avg_task_s = elapsed if self.completed_tasks == 1 else 0.9 * self._avg_task_s + 0.1 * elapsed
+
+    def _retry_after_locked(self) -> int:
+        backlog = self._queued_tasks + self._running_tasks
+        return max(1, math.ceil(backlog * self._avg_task_s / self.workers))
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import re
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+try:
+    from .cache import CacheKey, TranslationCache, normalize_text
+except Exception:
+    from cache import CacheKey, TranslationCache, normalize_text  # type: ignore
+
+# URLs first so that their digits are not masked on their own; trailing sentence punctuation is not part of a URL.
+_MASKABLE = re.compile(
+    r"(?:https?://|www\.)[^\s<>\"']*[^\s<>\"'.,;:!?)\]]"
+    r"|[\w.+-]+@[\w-]+(?:\.[\w-]+)+"
+    r"|(?<!\w)\d+(?:[.,:/]\d+)*(?!\w)"
+)
+_PLACEHOLDER = re.compile(r"⟦(\d+)⟧")
+_NOT_WORD = re.compile(r"[^\w\s⟦⟧]+")
+_MERSENNE = (1 << 61) - 1
+
+
+@dataclass(frozen=True)
+class Masked:
+    template: str
+    values: Tuple[str, ...]
+
+
+def mask(text: str) -> Masked:
+    """Replaces URLs, e-mail addresses and numbers with numbered placeholders (``⟦0⟧``, ``⟦1⟧``, ...)."""
+    values: List[str] = []
+
+    def sub(match: re.Match) -> str:
+        values.append(match.group(0))
+        return f"⟦{len(values) - 1}⟧"
+
+    return Masked(_MASKABLE.sub(sub, text), tuple(values))
+
+
+def fill(template: str, values: Tuple[str, ...]) -> str:
+    return _PLACEHOLDER.sub(lambda m: values[int(m.group(1))], template)
+
+
+def template_translation(translation: str, values: Tuple[str, ...]) -> Optional[str]:
+    """Turns a translation back into a template by masking the source ``values`` in it.
+
+    Only safe when every value is distinct and appears exactly once, verbatim, in the
+    translation (the model may reorder them); otherwise returns ``None``.
+    """
+    if len(set(values)) != len(values):
+        return None
+    spans: List[Tuple[int, int, int]] = []
+    for i, value in enumerate(values):
+        found = [m.span() for m in re.finditer(rf"(?<![\w.,]){re.escape(value)}(?![\w]|[.,]\d)", translation)]
+        if len(found) != 1:
+            return None
+        spans.append((found[0][0], found[0][1], i))
+    spans.sort()
+    if any(a[1] > b[0] for a, b in zip(spans, spans[1:])):
+        return None
+    out, last = [], 0
+    for start, end, i in spans:
+        out.append(translation[last:start])
+        out.append(f"⟦{i}⟧")
+        last = end
+    out.append(translation[last:])
+    return "".join(out)
+
+
+def _shingles(text: str, n: int) -> FrozenSet[int]:
+    norm = " ".join(_NOT_WORD.sub(" ", text.casefold()).split())
+    padded = f" {norm} "
+    if len(padded) <= n:
+        return frozenset({zlib.crc32(padded.encode("utf-8"))})
+    return frozenset(zlib.crc32(padded[i : i + n].encode("utf-8")) for i in range(len(padded) - n + 1))
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of character n-grams for near-duplicate lookups.
+
+    Texts are compared case- and punctuation-insensitively. Each text gets ``bands`` x
+    ``rows`` MinHash values; texts sharing all rows of any band become candidates, and the
+    candidate with the highest exact Jaccard similarity of n-gram sets is returned if it
+    reaches ``threshold``. Entries are scoped (e.g. per model and generation parameters)
+    and the index keeps at most ``max_entries``, dropping the least recently added.
+    """
+
+    def __init__(
+        self, threshold: float = 0.9, ngram: int = 3, bands: int = 8, rows: int = 4, max_entries: int = 100_000
+    ) -> None:
+        self.threshold = threshold
+        self.ngram = max(1, ngram)
+        self.bands = max(1, bands)
+        self.rows = max(1, rows)
+        self.max_entries = max(1, max_entries)
+        # Fixed coefficients keep signatures stable across processes and restarts.
+        coeffs = [zlib.crc32(f"minhash-{i}".encode()) for i in range(2 * self.bands * self.rows)]
+        self._perms = [(coeffs[2 * i] | 1, coeffs[2 * i + 1]) for i in range(self.bands * self.rows)]
+        self._entries: OrderedDict[Any, Tuple[str, FrozenSet[int], int, List[Tuple[Any, ...]]]] = OrderedDict()
+        self._buckets: Dict[Tuple[Any, ...], Set[Any]] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, scope: str, text: str, ref: Any, placeholders: int = 0) -> None:
+        shingles = _shingles(text, self.ngram)
+        bands = self._bands(scope, placeholders, shingles)
+        with self._lock:
+            self._discard(ref)
+            self._entries[ref] = (scope, shingles, placeholders, bands)
+            for band in bands:
+                self._buckets.setdefault(band, set()).add(ref)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def query(self, scope: str, text: str, placeholders: int = 0) -> Optional[Tuple[Any, float]]:
+        shingles = _shingles(text, self.ngram)
+        bands = self._bands(scope, placeholders, shingles)
+        best: Optional[Tuple[Any, float]] = None
+        with self._lock:
+            candidates: Set[Any] = set()
+            for band in bands:
+                candidates.update(self._buckets.get(band, ()))
+            for ref in candidates:
+                other = self._entries[ref][1]
+                similarity = len(shingles & other) / len(shingles | other)
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (ref, similarity)
+        return best
+
+    def discard(self, ref: Any) -> None:
+        with self._lock:
+            self._discard(ref)
+
+    def _bands(self, scope: str, placeholders: int, shingles: FrozenSet[int]) -> List[Tuple[Any, ...]]:
+        signature = [min((a * x + b) % _MERSENNE for x in shingles) for a, b in self._perms]
+        return [
+            (scope, placeholders, band, tuple(signature[band * self.rows : (band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def _discard(self, ref: Any) -> None:
+        entry = self._entries.pop(ref, None)
+        if entry is None:
+            return
+        for band in entry[3]:
+            refs = self._buckets.get(band)
+            if refs is not None:
+                refs.discard(ref)
+                if not refs:
+                    del self._buckets[band]
+
+
+def _text_of(value: Any) -> str:
+    return value if isinstance(value, str) else value[0]
+
+
+def _with_text(value: Any, text: str) -> Any:
+    return text if isinstance(value, str) else (text, *value[1:])
+
+
+class FuzzyMatcher:
+    """Placeholder and near-duplicate lookups in front of a :class:`~cache.TranslationCache`.
+
+    Values are translations, either a string or a tuple whose first item is the
+    translation (like the API's ``(translation, confidence)``). ``put`` stores, next to the
+    caller's exact entry, a template of the translation under the masked source (numbers,
+    URLs and e-mails replaced by placeholders), so "Pedido 1234 enviado" answers
+    "Pedido 5678 enviado" with the new number filled in. With an ``index``, sources within
+    its similarity threshold of a stored one are answered from it as well. Templates live
+    in the same cache, so they also reach its persistent store, but their lookups are
+    counted here (:meth:`stats`) rather than in the cache's hits and misses.
+    """
+
+    def __init__(self, cache: TranslationCache, index: Optional[NearDuplicateIndex] = None) -> None:
+        self.cache = cache
+        self.index = index
+        self._lock = Lock()
+        self.template_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    def get(
+        self, model_id: str, text: str, params: Optional[Mapping[str, Any]] = None, *fallbacks: Optional[Mapping[str, Any]]
+    ) -> Optional[Tuple[Any, float]]:
+        """Returns ``(value, similarity)`` for a template or near-duplicate hit, else ``None``.
+
+        Call it after the exact cache lookup missed; exact entries are not looked up again.
+        ``fallbacks`` are further generation parameters whose entries may answer too (e.g.
+        translations stored without a confidence); the lookup is counted once either way.
+        """
+        masked = mask(normalize_text(text))
+        for option in (params, *fallbacks):
+            hit = self._find(model_id, masked, option)
+            if hit is not None:
+                return hit
+        with self._lock:
+            self.misses += 1
+        return None
+    def put(self, model_id: str, text: str, params: Optional[Mapping[str, Any]], value: Any) -> None:
+        """Records a translation the caller already stored under its exact key."""
+        masked = mask(normalize_text(text))
+        ref: Optional[CacheKey] = None
+        if not masked.values:
+            ref = TranslationCache.make_key(model_id, text, params)
+        else:
+            template = template_translation(_text_of(value), masked.values)
+            if template is not None:
+                ref = self._template_key(model_id, masked.template, params)
+                self.cache.put(ref, _with_text(value, template))
+        if ref is not None and self.index is not None:
+            self.index.add(self._scope(model_id, params), masked.template, ref, len(masked.values))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.template_hits + self.fuzzy_hits + self.misses
+            return {
+                "template_hits": self.template_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.template_hits + self.fuzzy_hits) / lookups, 4) if lookups else 0.0,
+                "fuzzy_threshold": self.index.threshold if self.index is not None else None,
+                "indexed": len(self.index) if self.index is not None else 0,
+            }
+
+    def _find(self, model_id: str, masked: Masked, params: Optional[Mapping[str, Any]]) -> Optional[Tuple[Any, float]]:
+        if masked.values:
+            value = self.cache.peek(self._template_key(model_id, masked.template, params))
+            if value is not None:
+                with self._lock:
+                    self.template_hits += 1
+                return _with_text(value, fill(_text_of(value), masked.values)), 1.0
+
+        if self.index is not None:
+            hit = self.index.query(self._scope(model_id, params), masked.template, len(masked.values))
+            if hit is not None:
+                ref, similarity = hit
+                value = self.cache.peek(ref)
+                if value is None:
+                    self.index.discard(ref)
+                else:
+                    with self._lock:
+                        self.fuzzy_hits += 1
+                    if masked.values:
+                        value = _with_text(value, fill(_text_of(value), masked.values))
+                    return value, similarity
+        return None
+
+    @staticmethod
+    def _template_key(model_id: str, template: str, params: Optional[Mapping[str, Any]]) -> CacheKey:
+        return TranslationCache.make_key(model_id, template, {**(params or {}), "masked": True})
+
+    @staticmethod
+    def _scope(model_id: str, params: Optional[Mapping[str, Any]]) -> str:
+        return f"{model_id}|{sorted((params or {}).items())!r}"
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import torch
+from transformers import TextStreamer
+
+try:
+    from .bucketing import DEFAULT_BUCKETS, bucket_batches
+    from .tokenization import pad_batch
+except Exception:
+    from bucketing import DEFAULT_BUCKETS, bucket_batches  # type: ignore
+    from tokenization import pad_batch  # type: ignore
+
+
+def _sequence_confidences(model: Any, out: Any, batch_size: int, eos_token_id: Optional[int]) -> List[float]:
+    """Mean probability of the generated tokens, up to and including the first eos.
+
+    Uses the chosen-token log-probs from ``compute_transition_scores`` (a single gather over
+    the step scores, following beam indices when beam search ran) instead of a per-token loop.
+    """
+    scores = out.scores or []
+    if not scores:
+        return [0.0] * batch_size
+    beam_indices = getattr(out, "beam_indices", None)
+    # Beam search already hands out log-softmaxed scores; greedy/sampling hand out logits.
+    transition = model.compute_transition_scores(
+        out.sequences, scores, beam_indices, normalize_logits=beam_indices is None
+    )
+    tokens = out.sequences[:, -transition.shape[1] :]
+    keep = torch.ones_like(tokens, dtype=torch.bool)
+    if eos_token_id is not None:
+        is_eos = (tokens == eos_token_id).int()
+        keep = (is_eos.cumsum(dim=1) - is_eos) == 0
+    if beam_indices is not None:
+        keep &= beam_indices[:, : transition.shape[1]] >= 0
+    probs = torch.where(keep, transition.float().exp(), torch.zeros_like(transition, dtype=torch.float))
+    counts = keep.sum(dim=1).clamp(min=1)
+    return (probs.sum(dim=1) / counts).tolist()
+
+
+class CallbackStreamer(TextStreamer):
+    """Hands each decoded chunk of a single-sequence ``generate`` to ``on_text``."""
+
+    def __init__(self, tokenizer: Any, on_text: Callable[[str], None]) -> None:
+        # skip_prompt drops the decoder start token that encoder-decoder models feed first.
+        super().__init__(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        self._on_text = on_text
+
+    def on_finalized_text(self, text: str, stream_end: bool = False) -> None:
+        if text:
+            self._on_text(text)
+
+
+@torch.inference_mode()
+def generate_batch(
+    tokenizer: Any,
+    model: Any,
+    prepared: List[str],
+    generation_kwargs: Mapping[str, Any],
+    with_confidence: bool = True,
+    streamer: Any = None,
+    timings: Optional[Dict[str, float]] = None,
+    encode: Optional[Callable[[List[str]], Dict[str, Any]]] = None,
+) -> List[Tuple[str, float]]:
+    """Translates ``prepared`` in one ``generate`` call.
+
+    ``encode`` replaces the tokenizer call (e.g. an ``EncodingCache.encoder``). When
+    ``timings`` is given, it receives the seconds spent in the ``tokenize``, ``generate``
+    and ``decode`` (detokenization plus confidence scoring) stages.
+    """
+    started = time.perf_counter()
+    if encode is not None:
+        inputs = encode(prepared)
+    else:
+        inputs = tokenizer(prepared, return_tensors="pt", padding=True, truncation=True)
+    device = getattr(model, "device", None)
+    if isinstance(device, torch.device) and device.type != "cpu":
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+    tokenized = time.perf_counter()
+    # Step scores are only kept when a confidence is wanted; without them generate keeps
+    # no per-step vocabulary-sized tensors.
+    out = model.generate(
+        **inputs,
+        **generation_kwargs,
+        return_dict_in_generate=True,
+        output_scores=with_confidence,
+        streamer=streamer,
+    )
+    generated = time.perf_counter()
+    decoded = tokenizer.batch_decode(out.sequences, skip_special_tokens=True)
+
+    confidences = [0.0] * len(prepared)
+    if with_confidence:
+        try:
+            confidences = _sequence_confidences(model, out, len(prepared), getattr(tokenizer, "eos_token_id", None))
+        except Exception:
+            pass
+
+    if timings is not None:
+        timings["tokenize"] = tokenized - started
+        timings["generate"] = generated - tokenized
+        timings["decode"] = time.perf_counter() - generated
+    return [(decoded[i] if i < len(decoded) else "", confidences[i]) for i in range(len(prepared))]
+
+
+def generate_bucketed(
+    tokenizer: Any,
+    model: Any,
+    prepared: List[str],
+    generation_kwargs: Mapping[str, Any],
+    with_confidence: bool = True,
+    timings: Optional[Dict[str, float]] = None,
+    token_ids: Optional[Callable[[List[str]], List[List[int]]]] = None,
+    boundaries: Sequence[int] = DEFAULT_BUCKETS,
+    max_tokens: int = 0,
+    max_items: int = 0,
+) -> List[Tuple[str, float]]:
+    """Translates ``prepared`` in ``generate`` batches of similar token length.
+
+    Inputs are tokenized once (through ``token_ids``, e.g. ``EncodingCache.token_ids``,
+    when given), grouped by :func:`~bucketing.bucket_batches` and each group is padded only
+    to its own longest input. Results keep the input order; ``timings`` receives the stage
+    seconds summed over the groups.
+    """
+    if not prepared:
+        return []
+    started = time.perf_counter()
+    ids = token_ids(prepared) if token_ids is not None else tokenizer(prepared, truncation=True)["input_ids"]
+    ids = [list(row) for row in ids]
+    batches = bucket_batches([len(row) for row in ids], boundaries, max_tokens, max_items)
+    totals: Dict[str, float] = {"tokenize": time.perf_counter() - started}
+
+    results: List[Tuple[str, float]] = [("", 0.0)] * len(prepared)
+    for batch in batches:
+        stage: Dict[str, float] = {}
+        outputs = generate_batch(
+            tokenizer,
+            model,
+            [prepared[i] for i in batch],
+            generation_kwargs,
+            with_confidence,
+            timings=stage,
+            encode=lambda _texts, rows=batch: pad_batch(tokenizer, [ids[i] for i in rows]),  # type: ignore[misc]
+        )
+        for i, output in zip(batch, outputs):
+            results[i] = output
+        for name, seconds in stage.items():
+            totals[name] = totals.get(name, 0.0) + seconds
+    if timings is not None:
+        timings.update(totals)
+    return results
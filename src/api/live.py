@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import Any, Callable, Dict, List, Tuple
+
+try:
+    from .segmentation import split_sentences
+except Exception:
+    from segmentation import split_sentences  # type: ignore
+
+
+class LiveSession:
+    """Incremental translation of a transcript that grows with every recognizer partial.
+
+    Each :meth:`update` receives the whole transcript so far. Sentences already translated
+    in the previous update keep their translation; only new or revised sentences (normally
+    just the trailing one) go to ``translate``. The returned diff lists the segments from
+    the first one that changed, so clients keep their stable prefix untouched. With a
+    coroutine function as ``translate``, use :meth:`aupdate` instead of :meth:`update`.
+    """
+
+    def __init__(self, translate: Callable[[List[str]], Any]) -> None:
+        self._translate = translate
+        self._lock = Lock()
+        self.revision = 0
+        self.translated_sentences = 0
+        self.reused_sentences = 0
+        # (source sentence, separator, translation) of the last update.
+        self._segments: List[Tuple[str, str, str]] = []
+
+    def reset(self) -> None:
+        with self._lock:
+            self._segments = []
+
+    def update(self, text: str) -> Dict[str, Any]:
+        with self._lock:
+            segments = split_sentences(text)
+            misses = self._misses(segments)
+            return self._apply(segments, misses, self._translate(misses) if misses else [])
+
+    async def aupdate(self, text: str) -> Dict[str, Any]:
+        """:meth:`update` awaiting an async ``translate``; updates of one session must not overlap."""
+        segments = split_sentences(text)
+        with self._lock:
+            misses = self._misses(segments)
+        translations = await self._translate(misses) if misses else []
+        with self._lock:
+            return self._apply(segments, misses, translations)
+
+    def _misses(self, segments: List[Tuple[str, str]]) -> List[str]:
+        known = {sentence for sentence, _, _ in self._segments}
+        return list(dict.fromkeys(s for s, _ in segments if s and s not in known))
+
+    def _apply(self, segments: List[Tuple[str, str]], misses: List[str], translations: List[str]) -> Dict[str, Any]:
+        known = {sentence: translation for sentence, _, translation in self._segments}
+        known.update(zip(misses, translations))
+
+        updated = [(s, sep, known.get(s, "") if s else "") for s, sep in segments]
+        start = 0
+        while start < min(len(updated), len(self._segments)) and updated[start] == self._segments[start]:
+            start += 1
+
+        self.revision += 1
+        self.translated_sentences += len(misses)
+        self.reused_sentences += sum(1 for s, _ in segments if s) - len(misses)
+        self._segments = updated
+        return {
+            "revision": self.revision,
+            "start": start,
+            "count": len(updated),
+            "segments": [{"text": t, "separator": sep} for _, sep, t in updated[start:]],
+            "translated_text": "".join(t + sep for _, sep, t in updated),
+            "translated": len(misses),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "revision": self.revision,
+                "segments": len(self._segments),
+                "translated_sentences": self.translated_sentences,
+                "reused_sentences": self.reused_sentences,
+            }
@@ -1,27 +1,78 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import logging
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, asynccontextmanager
+from functools import partial
 from pathlib import Path
-from threading import Lock
-from typing import Any, Dict, List, Optional, Tuple
+from threading import Thread
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
-import torch
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from huggingface_hub.utils import EntryNotFoundError, RepositoryNotFoundError
 from pydantic import BaseModel, Field
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
 
 try:
+    from .batching import MicroBatcher, QueueFullError
+    from .bucketing import parse_buckets
+    from .cache import CacheKey, TranslationCache, read_warm_file
+    from .executor import InferenceExecutor, OverloadedError
+    from .fuzzy import FuzzyMatcher, NearDuplicateIndex
+    from .inference import CallbackStreamer, generate_batch, generate_bucketed
+    from .live import LiveSession
+    from .model_pool import ModelPool, current_rss_bytes, model_nbytes
     from .models_config import MODELS_MAP, ModelSpec
+    from .onnx_backend import load_onnx_model, onnx_model_nbytes
+    from .quantization import quantize_dynamic_int8
+    from .routing import Router
+    from .segmentation import split_sentences
+    from .settings import SETTINGS
+    from .singleflight import SingleFlight
+    from .telemetry import Telemetry
+    from .tokenization import EncodingCache
+    from .tracing import JsonLogExporter, Tracer, TracingMiddleware, add_span, mark_since_start, span
+    from .translation_memory import TranslationMemory
+    from .warmup import Warmup, parse_pairs
+    from .workers import ProcessWorkerPool
 except Exception:
+    from batching import MicroBatcher, QueueFullError  # type: ignore
+    from bucketing import parse_buckets  # type: ignore
+    from cache import CacheKey, TranslationCache, read_warm_file  # type: ignore
+    from executor import InferenceExecutor, OverloadedError  # type: ignore
+    from fuzzy import FuzzyMatcher, NearDuplicateIndex  # type: ignore
+    from inference import CallbackStreamer, generate_batch, generate_bucketed  # type: ignore
+    from live import LiveSession  # type: ignore
+    from model_pool import ModelPool, current_rss_bytes, model_nbytes  # type: ignore
     from models_config import MODELS_MAP, ModelSpec  # type: ignore
+    from onnx_backend import load_onnx_model, onnx_model_nbytes  # type: ignore
+    from quantization import quantize_dynamic_int8  # type: ignore
+    from routing import Router  # type: ignore
+    from segmentation import split_sentences  # type: ignore
+    from settings import SETTINGS  # type: ignore
+    from singleflight import SingleFlight  # type: ignore
+    from telemetry import Telemetry  # type: ignore
+    from tokenization import EncodingCache  # type: ignore
+    from tracing import JsonLogExporter, Tracer, TracingMiddleware, add_span, mark_since_start, span  # type: ignore
+    from translation_memory import TranslationMemory  # type: ignore
+    from warmup import Warmup, parse_pairs  # type: ignore
+    from workers import ProcessWorkerPool  # type: ignore
+
+logger = logging.getLogger(__name__)
 
 
 class TranslateRequest(BaseModel):
     text: str = Field(min_length=1, max_length=5000)
     source: str = Field(min_length=2, max_length=10)
     target: str = Field(min_length=2, max_length=10)
+    # Bulk jobs that ignore the score can skip it; confidence is then reported as 0.0.
+    with_confidence: bool = True
 
 
 class TranslateResponse(BaseModel):
@@ -31,6 +82,45 @@ class TranslateResponse(BaseModel):
     latency_ms: int
 
 
+class StreamTranslateRequest(TranslateRequest):
+    # Also stream the last hop of each sentence token by token (sentences then run one at a time).
+    tokens: bool = False
+
+
+class BatchTranslateRequest(BaseModel):
+    items: List[TranslateRequest] = Field(min_length=1, max_length=SETTINGS.bulk_max_items)
+    with_confidence: bool = True
+
+
+class BatchItemResult(BaseModel):
+    translated_text: Optional[str] = None
+    model_used: Optional[str] = None
+    confidence: float = 0.0
+    latency_ms: int = 0
+    error: Optional[str] = None
+
+
+class FanoutTranslateRequest(BaseModel):
+    text: str = Field(min_length=1, max_length=5000)
+    source: str = Field(min_length=2, max_length=10)
+    targets: List[str] = Field(min_length=1, max_length=16)
+    with_confidence: bool = True
+
+
+class FanoutItemResult(BatchItemResult):
+    target: str
+
+
+class FanoutTranslateResponse(BaseModel):
+    results: List[FanoutItemResult]
+    latency_ms: int
+
+
+class BatchTranslateResponse(BaseModel):
+    results: List[BatchItemResult]
+    latency_ms: int
+
+
 def _memory_used_mb() -> Optional[float]:
     try:
         import resource  # type: ignore
@@ -45,26 +135,140 @@ def _memory_used_mb() -> Optional[float]:
         return None
 
 
-MODEL_CACHE: Dict[str, Tuple[Any, Any]] = {}
-MODEL_LOCK = Lock()
 STARTED_AT = time.time()
+GENERATION_KWARGS: Dict[str, Any] = {"max_new_tokens": 256}
+# transformers cannot stream beam search (Opus-MT configs use beams), so token streaming decodes
+# greedily: the first tokens arrive sooner at the cost of slightly lower translation quality.
+STREAM_GENERATION_KWARGS: Dict[str, Any] = {**GENERATION_KWARGS, "num_beams": 1}
+BUCKETS = parse_buckets(SETTINGS.batch_buckets)
+TM: Optional[TranslationMemory] = None
+if SETTINGS.tm_path:
+    TM = TranslationMemory(
+        SETTINGS.tm_path,
+        max_entries=SETTINGS.tm_max_entries,
+        max_bytes=SETTINGS.tm_max_bytes,
+        ttl_s=SETTINGS.cache_ttl_s,
+        flush_interval_s=SETTINGS.tm_flush_ms / 1000.0,
+    )
+# Translation-memory reads hit SQLite; async handlers run them here instead of on the event loop.
+# One thread matches the memory's single reader connection.
+STORE_READER: Optional[ThreadPoolExecutor] = (
+    ThreadPoolExecutor(max_workers=1, thread_name_prefix="translation-memory-read") if TM is not None else None
+)
+CACHE = TranslationCache(
+    max_entries=SETTINGS.cache_max_entries,
+    max_bytes=SETTINGS.cache_max_bytes,
+    ttl_s=SETTINGS.cache_ttl_s,
+    store=TM,
+)
+FUZZY: Optional[FuzzyMatcher] = None
+if SETTINGS.cache_placeholders:
+    FUZZY = FuzzyMatcher(
+        CACHE,
+        NearDuplicateIndex(SETTINGS.cache_fuzzy_threshold, max_entries=SETTINGS.cache_max_entries)
+        if SETTINGS.cache_fuzzy_threshold > 0
+        else None,
+    )
+INFLIGHT = SingleFlight()
+PROCESS_POOL: Optional[ProcessWorkerPool] = None
+if SETTINGS.inference_processes > 0:
+    PROCESS_POOL = ProcessWorkerPool(
+        SETTINGS.inference_processes,
+        torch_threads=SETTINGS.executor_torch_threads,
+        encoding_cache_entries=SETTINGS.encoding_cache_entries,
+        buckets=BUCKETS,
+        max_batch_tokens=SETTINGS.batch_max_tokens,
+    )
+ENCODINGS: Optional[EncodingCache] = (
+    EncodingCache(SETTINGS.encoding_cache_entries) if SETTINGS.encoding_cache_entries > 0 else None
+)
+EXECUTOR = InferenceExecutor(
+    # With worker processes the executor threads only wait on them, one per process is enough.
+    workers=max(SETTINGS.executor_workers, SETTINGS.inference_processes),
+    torch_threads=SETTINGS.executor_torch_threads,
+    max_pending=SETTINGS.max_pending_requests,
+)
 
 
-def _load_model(model_id: str) -> Tuple[Any, Any]:
-    cached = MODEL_CACHE.get(model_id)
-    if cached:
-        return cached
+SPECS_BY_MODEL: Dict[str, ModelSpec] = {spec.model_id: spec for spec in MODELS_MAP.values()}
+ROUTER = Router(
+    {pair: spec.model_id for pair, spec in MODELS_MAP.items()},
+    max_hops=SETTINGS.route_max_hops,
+    hop_penalty_ms=SETTINGS.route_hop_penalty_ms,
+    rebuild_interval_s=SETTINGS.route_rebuild_s,
+)
+
+
+def _is_quantized(model_id: str) -> bool:
+    spec = SPECS_BY_MODEL.get(model_id)
+    if spec is not None and spec.quantize is not None:
+        return spec.quantize
+    return SETTINGS.quantize_int8
+
+
+def _backend(model_id: str) -> str:
+    spec = SPECS_BY_MODEL.get(model_id)
+    if spec is not None and spec.backend:
+        return spec.backend
+    return SETTINGS.inference_backend
+
+
+def _is_missing_checkpoint(exc: BaseException) -> bool:
+    # transformers wraps Hub errors in OSError; the original is chained as the cause.
+    seen: Optional[BaseException] = exc
+    while seen is not None:
+        if isinstance(seen, (RepositoryNotFoundError, EntryNotFoundError)):
+            return True
+        seen = seen.__cause__ or seen.__context__
+    return False
 
-    with MODEL_LOCK:
-        cached = MODEL_CACHE.get(model_id)
-        if cached:
-            return cached
 
-        tokenizer = AutoTokenizer.from_pretrained(model_id)
+def _load_model(model_id: str) -> Tuple[Any, Any]:
+    if _backend(model_id) == "onnx":
+        # ONNX Runtime sessions are not shared with worker processes nor quantized here;
+        # they run in the inference threads with their own intra-op thread pool.
+        return load_onnx_model(model_id, SETTINGS.onnx_cache_dir, threads=SETTINGS.executor_torch_threads)
+    try:
+        tokenizer = AutoTokenizer.from_pretrained(model_id, use_fast=True)
         model = AutoModelForSeq2SeqLM.from_pretrained(model_id)
-        model.eval()
-        MODEL_CACHE[model_id] = (tokenizer, model)
-        return tokenizer, model
+    except OSError as exc:
+        # Only a checkpoint that does not exist is routed around for good; network and disk
+        # errors are transient and the next request retries the load.
+        if _is_missing_checkpoint(exc):
+            ROUTER.disable_model(model_id)
+        raise
+    model.eval()
+    if not getattr(tokenizer, "is_fast", False):
+        # Marian checkpoints only ship a SentencePiece (slow) tokenizer; ENCODINGS covers repeats.
+        logger.info("No fast tokenizer for %s; using %s", model_id, type(tokenizer).__name__)
+    if _is_quantized(model_id):
+        model = quantize_dynamic_int8(model)
+    if PROCESS_POOL is not None:
+        # Weights live in shared memory so worker processes map them instead of copying
+        # (packed int8 weights of quantized models are not tensors and still get copied).
+        model.share_memory()
+    return tokenizer, model
+
+
+def _model_nbytes(model: Any) -> int:
+    return onnx_model_nbytes(model) or model_nbytes(model)
+
+
+MODEL_POOL = ModelPool(
+    _load_model,
+    sizer=_model_nbytes,
+    max_bytes=SETTINGS.model_pool_max_bytes,
+    max_rss_bytes=SETTINGS.model_pool_max_rss_mb * 1024 * 1024,
+    on_evict=PROCESS_POOL.drop if PROCESS_POOL is not None else None,
+    on_load=lambda model_id, seconds: TELEMETRY.observe_model_load(model_id, seconds),
+)
+TELEMETRY: Telemetry = Telemetry(
+    ROUTER.languages(),
+    cache_stats=CACHE.stats,
+    fuzzy_stats=FUZZY.stats if FUZZY is not None else None,
+    pool_stats=MODEL_POOL.stats,
+    rss_bytes=current_rss_bytes,
+)
 
 
 def _build_input(text: str, spec: ModelSpec) -> str:
@@ -73,91 +277,521 @@ def _build_input(text: str, spec: ModelSpec) -> str:
     return text
 
 
-@torch.inference_mode()
-def _translate_once(text: str, source: str, target: str) -> Tuple[str, str, float, int]:
+def _cache_params(spec: ModelSpec, with_confidence: bool = True, streamed: bool = False) -> Dict[str, Any]:
+    params = dict(STREAM_GENERATION_KWARGS if streamed else GENERATION_KWARGS)
+    if not with_confidence:
+        params["confidence"] = False
+    if _backend(spec.model_id) == "onnx":
+        params["backend"] = "onnx"
+    elif _is_quantized(spec.model_id):
+        params["int8"] = True
+    return params
+
+
+def _cache_key(spec: ModelSpec, prepared: str, with_confidence: bool = True, streamed: bool = False) -> CacheKey:
+    return TranslationCache.make_key(spec.model_id, prepared, _cache_params(spec, with_confidence, streamed))
+
+
+def _generate_batch(
+    model_id: str,
+    prepared: List[str],
+    with_confidence: bool = True,
+    timings: Optional[Dict[str, float]] = None,
+    observe_cost: bool = True,
+) -> List[Tuple[str, float]]:
+    """Runs one ``generate`` batch; ``timings`` receives the load (if any) and inference stage seconds.
+
+    ``observe_cost=False`` keeps the batch out of the router's edge costs (e.g. cold warm-up runs).
+    """
+    timings = {} if timings is None else timings
+    resident = model_id in MODEL_POOL
+    acquire_started = time.perf_counter()
+    with MODEL_POOL.acquire(model_id) as (tokenizer, model):
+        if not resident:
+            timings["load"] = time.perf_counter() - acquire_started
+        started = time.perf_counter()
+        if PROCESS_POOL is not None and _backend(model_id) == "torch":
+            results = PROCESS_POOL.generate(
+                model_id, tokenizer, model, prepared, GENERATION_KWARGS, with_confidence, timings=timings
+            )
+        else:
+            token_ids = partial(ENCODINGS.token_ids, model_id, tokenizer) if ENCODINGS is not None else None
+            results = generate_bucketed(
+                tokenizer,
+                model,
+                prepared,
+                GENERATION_KWARGS,
+                with_confidence,
+                timings=timings,
+                token_ids=token_ids,
+                boundaries=BUCKETS,
+                max_tokens=SETTINGS.batch_max_tokens,
+            )
+    if observe_cost:
+        ROUTER.observe(model_id, (time.perf_counter() - started) * 1000 / max(1, len(prepared)))
+    TELEMETRY.observe_generate(model_id, len(prepared), timings)
+    return results
+
+
+def _generate_lane(
+    model_id: str, items: List[Tuple[str, bool]]
+) -> List[Tuple[Tuple[str, float], Dict[str, float]]]:
+    # One batch serves both kinds of request; scores are computed if any item wants them.
+    # Every item also gets the batch's stage timings for its request trace.
+    timings: Dict[str, float] = {}
+    results = _generate_batch(model_id, [prepared for prepared, _ in items], any(wants for _, wants in items), timings)
+    return [(result, timings) for result in results]
+
+
+BATCHER = MicroBatcher(
+    _generate_lane,
+    window_ms=SETTINGS.batch_window_ms,
+    max_batch=SETTINGS.batch_max_size,
+    max_queue=SETTINGS.batch_max_queue,
+    submit=EXECUTOR.submit,
+    on_dispatch=TELEMETRY.observe_batch,
+)
+
+
+_GENERATION_STAGES = ("load", "tokenize", "generate", "decode")
+
+
+def _trace_generation(timings: Dict[str, float], waited_s: float) -> None:
+    """Adds the stages of the batch a request rode in; the rest of its wait was queueing."""
+    spent = 0.0
+    for stage in _GENERATION_STAGES:
+        if stage in timings:
+            add_span(stage, timings[stage])
+            spent += timings[stage]
+    add_span("queue", max(0.0, waited_s - spent))
+
+
+async def _result(future: Future) -> Any:
+    """Awaits a batcher or executor future without holding a thread.
+
+    Shielded: the future may be shared with other requests, and a request that goes away
+    must not cancel their work.
+    """
+    return await asyncio.shield(asyncio.wrap_future(future))
+
+
+def _generation(spec: ModelSpec, prepared: str, with_confidence: bool) -> Future:
+    """Submits one input to the micro-batcher; resolves to ``(result, timings)`` once it is cached."""
+    out: Future = Future()
+
+    def done(fut: Future) -> None:
+        try:
+            (translated, confidence), timings = fut.result()
+        except BaseException as exc:
+            out.set_exception(exc)
+            return
+        result = (translated, confidence if with_confidence else 0.0)
+        _remember(spec, prepared, with_confidence, result)
+        out.set_result((result, timings))
+
+    BATCHER.submit(spec.model_id, (prepared, with_confidence)).add_done_callback(done)
+    return out
+
+
+def _remember(
+    spec: ModelSpec, prepared: str, with_confidence: bool, result: Tuple[str, float], streamed: bool = False
+) -> None:
+    # Greedy streamed translations get their own keys so they never stand in for beam results.
+    CACHE.put(_cache_key(spec, prepared, with_confidence, streamed), result)
+    if FUZZY is not None:
+        FUZZY.put(spec.model_id, prepared, _cache_params(spec, with_confidence, streamed), result)
+
+
+def _cached(
+    spec: ModelSpec, prepared: str, with_confidence: bool, streamed: bool = False, local: bool = False
+) -> Optional[Tuple[str, float]]:
+    # Scored translations also answer requests without confidence, and beam-search ones also
+    # answer token streams (``streamed``). Each input counts as one cache lookup whatever keys
+    # it tries; FUZZY counts its template and near-duplicate lookups. ``local`` only checks
+    # the exact keys in memory and leaves a miss uncounted for the full lookup that follows.
+    keys = [_cache_key(spec, prepared)]
+    if not with_confidence:
+        keys.append(_cache_key(spec, prepared, with_confidence=False))
+    if streamed:
+        keys.append(_cache_key(spec, prepared, with_confidence, streamed=True))
+    cached = next((value for value in (CACHE.peek(key, local) for key in keys) if value is not None), None)
+    if cached is None and local:
+        return None
+    CACHE.count_lookup(cached is not None)
+    if cached is None and FUZZY is not None:
+        fallbacks = [] if with_confidence else [_cache_params(spec, with_confidence=False)]
+        hit = FUZZY.get(spec.model_id, prepared, _cache_params(spec), *fallbacks)
+        if hit is not None:
+            # Near-duplicate answers are only as trustworthy as the source texts are alike.
+            (translated, confidence), similarity = hit
+            cached = (translated, confidence * similarity)
+    return cached
+
+
+async def _lookup(
+    spec: ModelSpec, prepared: List[str], with_confidence: bool, streamed: bool = False
+) -> List[Optional[Tuple[str, float]]]:
+    """:func:`_cached` for several inputs of one model, without blocking the event loop.
+
+    Only the in-memory LRU is checked on the loop. With a translation memory, the inputs it
+    misses are looked up in full (store, templates, near-duplicates) in one call on the
+    store reader thread.
+    """
+    if STORE_READER is None:
+        return [_cached(spec, p, with_confidence, streamed) for p in prepared]
+    found = [_cached(spec, p, with_confidence, streamed, local=True) for p in prepared]
+    missing = [i for i, value in enumerate(found) if value is None]
+    if missing:
+        stored = await asyncio.get_running_loop().run_in_executor(
+            STORE_READER, lambda: [_cached(spec, prepared[i], with_confidence, streamed) for i in missing]
+        )
+        for i, value in zip(missing, stored):
+            found[i] = value
+    return found
+
+
+async def _translate_once(
+    text: str, source: str, target: str, with_confidence: bool = True
+) -> Tuple[str, str, float, int]:
     spec = MODELS_MAP.get((source, target))
     if not spec:
         raise ValueError("pair_not_supported")
 
-    tokenizer, model = _load_model(spec.model_id)
     prepared = _build_input(text, spec)
+    key = _cache_key(spec, prepared, with_confidence)
 
     started = time.perf_counter()
-    inputs = tokenizer(prepared, return_tensors="pt", padding=True, truncation=True)
-    out = model.generate(
-        **inputs,
-        max_new_tokens=256,
-        return_dict_in_generate=True,
-        output_scores=True,
-    )
+    cached = (await _lookup(spec, [prepared], with_confidence))[0]
+    if cached is not None:
+        translated, confidence = cached
+    else:
+        generation = INFLIGHT.share(key, partial(_generation, spec, prepared, with_confidence))
+        (translated, confidence), timings = await _result(generation)
+        _trace_generation(timings, time.perf_counter() - started)
     latency_ms = int((time.perf_counter() - started) * 1000)
 
-    decoded = tokenizer.batch_decode(out.sequences, skip_special_tokens=True)
-    translated = decoded[0] if decoded else ""
+    return translated, spec.model_id, confidence, latency_ms
 
-    confidence = 0.0
-    try:
-        scores = out.scores or []
-        if scores:
-            gen_tokens = out.sequences[0, -len(scores) :]
-            probs: List[float] = []
-            for i, step_scores in enumerate(scores):
-                token_id = gen_tokens[i].item()
-                step_logprobs = torch.log_softmax(step_scores[0], dim=-1)
-                probs.append(float(step_logprobs[token_id].exp().item()))
-            confidence = float(sum(probs) / len(probs))
-    except Exception:
-        confidence = 0.0
 
-    return translated, spec.model_id, confidence, latency_ms
+def _generate_streaming(
+    spec: ModelSpec,
+    prepared: str,
+    on_text: Callable[[str], None],
+    with_confidence: bool,
+    timings: Dict[str, float],
+) -> Tuple[str, float]:
+    # Streaming needs the model in this process, so it bypasses the batcher and worker processes.
+    resident = spec.model_id in MODEL_POOL
+    acquire_started = time.perf_counter()
+    with MODEL_POOL.acquire(spec.model_id) as (tokenizer, model):
+        if not resident:
+            timings["load"] = time.perf_counter() - acquire_started
+        streamer = CallbackStreamer(tokenizer, on_text)
+        encode = ENCODINGS.encoder(spec.model_id, tokenizer) if ENCODINGS is not None else None
+        result = generate_batch(
+            tokenizer, model, [prepared], STREAM_GENERATION_KWARGS, with_confidence, streamer, timings, encode
+        )[0]
+    TELEMETRY.observe_generate(spec.model_id, 1, timings)
+    _remember(spec, prepared, with_confidence, result, streamed=True)
+    return result
 
 
 def _resolve_path(source: str, target: str) -> List[Tuple[str, str]]:
-    if (source, target) in MODELS_MAP:
-        return [(source, target)]
-    if source != "en" and target != "en":
-        if (source, "en") in MODELS_MAP and ("en", target) in MODELS_MAP:
-            return [(source, "en"), ("en", target)]
-    raise ValueError("pair_not_supported")
+    return ROUTER.route(source, target)
+
 
+def _reroute(steps: List[Tuple[str, str]], position: int, exc: BaseException) -> List[Tuple[str, str]]:
+    """Route that replaces ``steps`` after hop ``position`` failed with ``exc``.
 
-def _translate_with_pivot(text: str, source: str, target: str) -> Tuple[str, str, float, int]:
+    Re-raises ``exc`` unless the hop's checkpoint is missing from the Hub and ``_load_model``
+    disabled its model; the rest of the route is then resolved again around it, and
+    ``ValueError`` means no route is left.
+    """
+    a, _ = steps[position]
+    if not (_is_missing_checkpoint(exc) and ROUTER.is_disabled(MODELS_MAP[steps[position]].model_id)):
+        raise exc
+    return steps[:position] + _resolve_path(a, steps[-1][1])
+
+
+async def _translate_with_pivot(
+    text: str, source: str, target: str, with_confidence: bool = True
+) -> Tuple[str, str, float, int]:
     if source == target:
         return text, "identity", 1.0, 0
 
-    steps = _resolve_path(source, target)
+    with span("route"):
+        steps = _resolve_path(source, target)
     current = text
     model_used_parts: List[str] = []
     confidences: List[float] = []
     total_ms = 0
-    for a, b in steps:
-        translated, model_used, conf, ms = _translate_once(current, a, b)
+    position = 0
+    while position < len(steps):
+        a, b = steps[position]
+        try:
+            with span(f"hop{position + 1}", desc=f"{a}-{b}"):
+                translated, model_used, conf, ms = await _translate_once(current, a, b, with_confidence)
+        except Exception as exc:
+            steps = _reroute(steps, position, exc)
+            continue
         current = translated
         model_used_parts.append(model_used)
         confidences.append(conf)
         total_ms += ms
+        position += 1
 
     return current, " | ".join(model_used_parts), float(sum(confidences) / len(confidences)), total_ms
 
 
-def _models_supported_pairs() -> List[Dict[str, Any]]:
-    langs = sorted({a for a, _ in MODELS_MAP.keys()} | {b for _, b in MODELS_MAP.keys()} | {"en"})
-    pairs: List[Dict[str, Any]] = []
-    for src in langs:
-        for tgt in langs:
-            if src == tgt:
+async def _submit_hop(
+    spec: ModelSpec, texts: List[str], with_confidence: bool = True
+) -> Callable[[], Awaitable[List[Tuple[str, float, int]]]]:
+    """Submits the cache misses of one hop in chunks; the returned coroutine function awaits them.
+
+    Submitting every hop group before waiting lets hops on different models run in parallel.
+    """
+    unique: Dict[str, Tuple[str, float, int]] = {}
+    misses: List[str] = []
+    distinct = list(dict.fromkeys(texts))
+    found = await _lookup(spec, [_build_input(text, spec) for text in distinct], with_confidence)
+    for text, cached in zip(distinct, found):
+        if cached is not None:
+            unique[text] = (cached[0], cached[1], 0)
+        else:
+            misses.append(text)
+
+    # Chunks of similar length need little padding; each is bucketed again by token length in generate.
+    misses.sort(key=len)
+    chunk = SETTINGS.bulk_chunk_size
+    submitted = []
+    for start in range(0, len(misses), chunk):
+        batch = misses[start : start + chunk]
+        prepared = [_build_input(text, spec) for text in batch]
+        timings: Dict[str, float] = {}
+        future = EXECUTOR.submit(_generate_batch, spec.model_id, prepared, with_confidence, timings)
+        submitted.append((batch, prepared, time.perf_counter(), timings, future))
+
+    async def collect() -> List[Tuple[str, float, int]]:
+        for batch, prepared, started, timings, future in submitted:
+            translated = await _result(future)
+            _trace_generation(timings, time.perf_counter() - started)
+            ms = int((time.perf_counter() - started) * 1000)
+            for text, prep, (out_text, conf) in zip(batch, prepared, translated):
+                _remember(spec, prep, with_confidence, (out_text, conf))
+                unique[text] = (out_text, conf, ms)
+        return [unique[text] for text in texts]
+
+    return collect
+
+
+async def _translate_bulk(
+    items: List[Tuple[str, str, str]], with_confidence: bool = True
+) -> List[Optional[Tuple[str, str, float, int]]]:
+    results: List[Optional[Tuple[str, str, float, int]]] = [None] * len(items)
+    routes: Dict[int, List[Tuple[str, str]]] = {}
+    current: Dict[int, str] = {}
+    with span("route"):
+        for idx, (text, source, target) in enumerate(items):
+            if source == target:
+                results[idx] = (text, "identity", 1.0, 0)
                 continue
             try:
-                steps = _resolve_path(src, tgt)
-            except Exception:
+                routes[idx] = _resolve_path(source, target)
+            except ValueError:
                 continue
-            pivot = len(steps) > 1
-            models = [MODELS_MAP[s].model_id for s in steps if s in MODELS_MAP]
-            pairs.append({"source": src, "target": tgt, "pivot": pivot, "models": models})
+            current[idx] = text
+
+    model_used: Dict[int, List[str]] = {idx: [] for idx in routes}
+    confidences: Dict[int, List[float]] = {idx: [] for idx in routes}
+    latency: Dict[int, int] = {idx: 0 for idx in routes}
+    position: Dict[int, int] = {idx: 0 for idx in routes}
+
+    hop = 0
+    while True:
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for idx, steps in routes.items():
+            if position[idx] < len(steps):
+                groups.setdefault(steps[position[idx]], []).append(idx)
+        if not groups:
+            break
+        with span(f"hop{hop + 1}", desc=" ".join(f"{a}-{b}" for a, b in groups)):
+            collects = await asyncio.gather(
+                *(_submit_hop(MODELS_MAP[pair], [current[i] for i in idxs], with_confidence) for pair, idxs in groups.items())
+            )
+            pending = [(MODELS_MAP[pair], idxs, collect) for (pair, idxs), collect in zip(groups.items(), collects)]
+            for spec, idxs, collect in pending:
+                try:
+                    outputs = await collect()
+                except Exception as exc:
+                    # Items of a model missing from the Hub continue on a route around it in the
+                    # next round; items left without one are unsupported. Other groups are unaffected.
+                    for i in idxs:
+                        try:
+                            routes[i] = _reroute(routes[i], position[i], exc)
+                        except ValueError:
+                            del routes[i]
+                    continue
+                for i, (translated, conf, ms) in zip(idxs, outputs):
+                    current[i] = translated
+                    model_used[i].append(spec.model_id)
+                    confidences[i].append(conf)
+                    latency[i] += ms
+                    position[i] += 1
+        hop += 1
+
+    for idx in routes:
+        confs = confidences[idx]
+        results[idx] = (current[idx], " | ".join(model_used[idx]), float(sum(confs) / len(confs)), latency[idx])
+    return results
+
+
+async def _translate_document(
+    text: str, source: str, target: str, with_confidence: bool = True
+) -> Tuple[str, str, float, int]:
+    """Translates ``text`` sentence by sentence, keeping its whitespace and paragraph breaks.
+
+    Repeated sentences are translated once, each sentence is looked up in the cache on its
+    own, and the misses of every hop run as batches. Single-sentence inputs take the regular
+    per-request path.
+    """
+    if len(split_sentences(text, max_chars=SETTINGS.segment_max_chars)) <= 1:
+        return await _translate_with_pivot(text, source, target, with_confidence)
+    result = (await _translate_fanout(text, source, [target], with_confidence))[0]
+    if result is None:
+        raise ValueError("pair_not_supported")
+    return result
+
+
+async def _translate_fanout(
+    text: str, source: str, targets: List[str], with_confidence: bool = True
+) -> List[Optional[Tuple[str, str, float, int]]]:
+    """Translates one (possibly multi-sentence) text into several targets.
+
+    All targets go through one bulk job, so the ``src → en`` hop shared by pivot routes runs
+    once per sentence and every ``en → tgt`` hop runs as its own batch, in parallel with the
+    others. Targets without a route get ``None``.
+    """
+    segments = split_sentences(text, max_chars=SETTINGS.segment_max_chars)
+    sentences = list(dict.fromkeys(sentence for sentence, _ in segments if sentence))
+    started = time.perf_counter()
+    items = [(sentence, source, target) for target in targets for sentence in sentences]
+    outputs = await _translate_bulk(items, with_confidence)
+    latency_ms = int((time.perf_counter() - started) * 1000)
+
+    results: List[Optional[Tuple[str, str, float, int]]] = []
+    for i in range(len(targets)):
+        per_sentence = outputs[i * len(sentences) : (i + 1) * len(sentences)]
+        if not per_sentence or any(out is None for out in per_sentence):
+            results.append(None)
+            continue
+        by_sentence = {sentence: out for sentence, out in zip(sentences, per_sentence) if out is not None}
+        translated = "".join((by_sentence[s][0] if s else "") + sep for s, sep in segments)
+        confidences = [by_sentence[s][2] for s, _ in segments if s]
+        model_used = by_sentence[sentences[0]][1]
+        results.append((translated, model_used, float(sum(confidences) / len(confidences)), latency_ms))
+    return results
+
+
+def _models_supported_pairs(table: Dict[Tuple[str, str], List[Tuple[str, str]]]) -> List[Dict[str, Any]]:
+    pairs: List[Dict[str, Any]] = []
+    for (src, tgt), steps in sorted(table.items()):
+        pivot = len(steps) > 1
+        models = [MODELS_MAP[s].model_id for s in steps]
+        pairs.append({"source": src, "target": tgt, "pivot": pivot, "models": models})
     return pairs
 
 
-app = FastAPI(title="NeuroTranslator API", version="5.0.0")
+class _ModelsCatalog:
+    """``/models`` body, ETag and pair index, rebuilt only when the router's table changes."""
+
+    def __init__(self, table: Dict[Tuple[str, str], List[Tuple[str, str]]]) -> None:
+        pairs = _models_supported_pairs(table)
+        self.table = table
+        self.body = json.dumps({"pairs": pairs}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.index = {(p["source"], p["target"]): p for p in pairs}
+
+
+_MODELS_CATALOG = _ModelsCatalog(ROUTER.table())
+
+
+def _models_catalog() -> _ModelsCatalog:
+    global _MODELS_CATALOG
+    # The router swaps in a new table object only when a route changed.
+    table = ROUTER.table()
+    if _MODELS_CATALOG.table is not table:
+        _MODELS_CATALOG = _ModelsCatalog(table)
+    return _MODELS_CATALOG
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+
+
+def _warm_cache_from_file(path: str) -> int:
+    count = 0
+    for record in read_warm_file(path):
+        spec = SPECS_BY_MODEL.get(str(record.get("model_id", "")))
+        if spec is None:
+            spec = MODELS_MAP.get((str(record.get("source", "")).lower(), str(record.get("target", "")).lower()))
+        text = record.get("text")
+        translation = record.get("translation")
+        if spec is None or not isinstance(text, str) or not isinstance(translation, str):
+            continue
+        confidence = float(record.get("confidence", 1.0))
+        _remember(spec, _build_input(text.strip(), spec), True, (translation, confidence))
+        count += 1
+    return count
+
+
+def _warm_generate(model_id: str, prepared: List[str]) -> None:
+    """Runs a warm-up generation, on every worker process when there are any.
+
+    First generations pay one-off allocations; their latency would skew the router's costs.
+    """
+    if PROCESS_POOL is None or _backend(model_id) != "torch":
+        _generate_batch(model_id, prepared, observe_cost=False)
+        return
+    with MODEL_POOL.acquire(model_id) as (tokenizer, model):
+        PROCESS_POOL.warm(model_id, tokenizer, model, prepared, GENERATION_KWARGS)
+
+
+WARMUP = Warmup(
+    lambda src, tgt: [MODELS_MAP[step].model_id for step in _resolve_path(src, tgt)],
+    MODEL_POOL.get,
+    lambda model_id, texts: EXECUTOR.submit(partial(_warm_generate, model_id, texts)).result(),
+    batch_size=SETTINGS.batch_max_size,
+)
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if SETTINGS.cache_warm_file:
+        try:
+            count = _warm_cache_from_file(SETTINGS.cache_warm_file)
+            logger.info("Translation cache warmed with %d entries from %s", count, SETTINGS.cache_warm_file)
+        except Exception:
+            logger.exception("Failed to warm translation cache from %s", SETTINGS.cache_warm_file)
+
+    pairs = parse_pairs(SETTINGS.preload_pairs)
+    if pairs:
+        Thread(target=WARMUP.run, args=(pairs,), name="warmup", daemon=True).start()
+    else:
+        WARMUP.run([])
+    try:
+        yield
+    finally:
+        if STORE_READER is not None:
+            STORE_READER.shutdown(wait=True)
+        if TM is not None:
+            # Commits the translations still queued for the translation memory.
+            TM.close()
+
+
+app = FastAPI(title="NeuroTranslator API", version="5.0.0", lifespan=_lifespan)
+
+TRACER = Tracer([JsonLogExporter()] if SETTINGS.trace_log else [])
 
 app.add_middleware(
     CORSMiddleware,
@@ -172,27 +806,61 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Request-ID"],
 )
+app.add_middleware(TracingMiddleware, tracer=TRACER)
 
 
 @app.get("/health")
 def health() -> Dict[str, Any]:
     mem_mb = _memory_used_mb()
-    loaded = list(MODEL_CACHE.keys())
+    rss = current_rss_bytes()
+    loaded = MODEL_POOL.loaded()
     return {
         "status": "ok",
         "loaded_models": loaded,
         "loaded_models_count": len(loaded),
         "memory_mb": mem_mb,
+        "rss_mb": round(rss / 1024 / 1024, 2) if rss else None,
+        "batching": BATCHER.stats(),
+        "executor": EXECUTOR.stats(),
+        "processes": PROCESS_POOL.stats() if PROCESS_POOL is not None else None,
+        "cache": CACHE.stats(),
+        "models": MODEL_POOL.stats(),
+        "routing": ROUTER.stats(),
+        "coalescing": INFLIGHT.stats(),
+        "encodings": ENCODINGS.stats() if ENCODINGS is not None else None,
+        "fuzzy": FUZZY.stats() if FUZZY is not None else None,
+        "warmup": WARMUP.state,
         "started_at": int(STARTED_AT),
         "uptime_s": int(time.time() - STARTED_AT),
         "timestamp": int(time.time()),
     }
 
 
+@app.get("/ready")
+def ready() -> JSONResponse:
+    report = WARMUP.report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
 @app.get("/models")
-def models() -> Dict[str, Any]:
-    return {"pairs": _models_supported_pairs()}
+async def models(request: Request) -> Response:
+    catalog = _models_catalog()
+    headers = {"ETag": catalog.etag, "Cache-Control": f"public, max-age={SETTINGS.models_max_age_s}"}
+    if _etag_matches(request.headers.get("if-none-match", ""), catalog.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(catalog.body, media_type="application/json", headers=headers)
+
+
+@app.get("/models/{source}/{target}")
+async def model_route(source: str, target: str) -> JSONResponse:
+    catalog = _models_catalog()
+    pair = catalog.index.get((source.strip().lower(), target.strip().lower()))
+    if pair is None:
+        raise HTTPException(status_code=404, detail="Unsupported language pair")
+    headers = {"ETag": catalog.etag, "Cache-Control": f"public, max-age={SETTINGS.models_max_age_s}"}
+    return JSONResponse(pair, headers=headers)
 
 
 @app.get("/metrics")
@@ -206,18 +874,72 @@ def metrics() -> Dict[str, Any]:
         return {}
 
 
+@app.get("/metrics/prometheus")
+def prometheus_metrics() -> Response:
+    # Plain def: the scrape reads the translation memory's totals from SQLite, off the event loop.
+    body, content_type = TELEMETRY.render()
+    return Response(body, media_type=content_type)
+
+
+def _overloaded(exc: OverloadedError) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many pending translations",
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
+
+
+def _queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Translation queue is full",
+        headers={"Retry-After": str(EXECUTOR.retry_after_s())},
+    )
+
+
+def _observe_items(
+    endpoint: str,
+    pairs: List[Tuple[str, str]],
+    outputs: Optional[List[Optional[Tuple[str, str, float, int]]]],
+    status: str = "error",
+) -> None:
+    """Counts every item of a bulk request; ``outputs`` is None when the whole request failed."""
+    for idx, (source, target) in enumerate(pairs):
+        out = outputs[idx] if outputs is not None else None
+        if out is not None:
+            TELEMETRY.observe_request(endpoint, source, target, out[3] / 1000.0)
+        else:
+            TELEMETRY.observe_request(endpoint, source, target, 0.0, "unsupported" if outputs is not None else status)
+
+
 @app.post("/translate", response_model=TranslateResponse)
-def translate(req: TranslateRequest) -> TranslateResponse:
+async def translate(req: TranslateRequest) -> TranslateResponse:
     source = req.source.strip().lower()
     target = req.target.strip().lower()
     text = req.text.strip()
+    mark_since_start("validation")
 
+    started = time.perf_counter()
+    status = "error"
     try:
-        translated_text, model_used, confidence, latency_ms = _translate_with_pivot(text, source, target)
+        with EXECUTOR.admit():
+            translated_text, model_used, confidence, latency_ms = await _translate_document(
+                text, source, target, req.with_confidence
+            )
+        status = "ok"
+    except OverloadedError as exc:
+        status = "overloaded"
+        raise _overloaded(exc) from None
     except ValueError:
+        status = "unsupported"
         raise HTTPException(status_code=400, detail="Unsupported language pair") from None
+    except QueueFullError:
+        status = "queue_full"
+        raise _queue_full() from None
     except Exception:
         raise HTTPException(status_code=500, detail="Translation failed") from None
+    finally:
+        TELEMETRY.observe_request("translate", source, target, time.perf_counter() - started, status)
 
     return TranslateResponse(
         translated_text=translated_text,
@@ -226,3 +948,333 @@ def translate(req: TranslateRequest) -> TranslateResponse:
         latency_ms=latency_ms,
     )
 
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_hop(spec: ModelSpec, text: str, with_confidence: bool) -> AsyncIterator[Tuple[str, Any]]:
+    """Yields ``("token", chunk)`` events of one streamed hop, then ``("result", (text, confidence))``."""
+    prepared = _build_input(text, spec)
+    cached = (await _lookup(spec, [prepared], with_confidence, streamed=True))[0]
+    if cached is None:
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        timings: Dict[str, float] = {}
+        submitted = time.perf_counter()
+        task = asyncio.ensure_future(
+            EXECUTOR.run(
+                _generate_streaming,
+                spec,
+                prepared,
+                lambda chunk: loop.call_soon_threadsafe(chunks.put_nowait, chunk),
+                with_confidence,
+                timings,
+            )
+        )
+        # Runs after every chunk the worker scheduled before finishing.
+        task.add_done_callback(lambda _: loop.call_soon(chunks.put_nowait, None))
+        while (chunk := await chunks.get()) is not None:
+            yield "token", chunk
+        cached = await task
+        _trace_generation(timings, time.perf_counter() - submitted)
+    yield "result", cached
+
+
+async def _stream_tokens(
+    sentence: str, steps: List[Tuple[str, str]], with_confidence: bool
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Yields ``("token", chunk)`` events for the last hop, then ``("result", translation)``."""
+    started = time.perf_counter()
+    current = sentence
+    models_used: List[str] = []
+    confidences: List[float] = []
+    position = 0
+    while position < len(steps):
+        a, b = steps[position]
+        try:
+            if position < len(steps) - 1:
+                current, model_used, conf, _ = await _translate_once(current, a, b, with_confidence)
+            else:
+                async for kind, payload in _stream_hop(MODELS_MAP[(a, b)], current, with_confidence):
+                    if kind == "token":
+                        yield kind, payload
+                current, conf = payload
+                model_used = MODELS_MAP[(a, b)].model_id
+        except Exception as exc:
+            steps = _reroute(steps, position, exc)
+            continue
+        models_used.append(model_used)
+        confidences.append(conf)
+        position += 1
+    latency_ms = int((time.perf_counter() - started) * 1000)
+    yield "result", (current, " | ".join(models_used), float(sum(confidences) / len(confidences)), latency_ms)
+
+
+@app.post("/translate/stream")
+async def translate_stream(req: StreamTranslateRequest) -> StreamingResponse:
+    source = req.source.strip().lower()
+    target = req.target.strip().lower()
+    text = req.text.strip()
+
+    mark_since_start("validation")
+    try:
+        with span("route"):
+            steps = _resolve_path(source, target) if source != target else []
+    except ValueError:
+        TELEMETRY.observe_request("stream", source, target, 0.0, "unsupported")
+        raise HTTPException(status_code=400, detail="Unsupported language pair") from None
+
+    admission = ExitStack()
+    try:
+        admission.enter_context(EXECUTOR.admit())
+    except OverloadedError as exc:
+        TELEMETRY.observe_request("stream", source, target, 0.0, "overloaded")
+        raise _overloaded(exc) from None
+
+    segments = [
+        (sentence, sep) for sentence, sep in split_sentences(text, max_chars=SETTINGS.segment_max_chars) if sentence
+    ]
+
+    async def events() -> AsyncIterator[str]:
+        started = time.perf_counter()
+        first_segment_ms: Optional[int] = None
+        parts: List[str] = []
+        models_used = "identity"
+        confidences: List[float] = []
+        tasks: List[asyncio.Future] = []
+        with admission:
+            try:
+                if steps and not req.tokens:
+                    # Every sentence is submitted up front so they share micro-batches; results
+                    # are still emitted in input order.
+                    tasks = [
+                        asyncio.ensure_future(_translate_with_pivot(sentence, source, target, req.with_confidence))
+                        for sentence, _ in segments
+                    ]
+                for idx, (sentence, sep) in enumerate(segments):
+                    if not steps:
+                        result: Tuple[str, str, float, int] = (sentence, "identity", 1.0, 0)
+                    elif tasks:
+                        result = await tasks[idx]
+                    else:
+                        async for kind, payload in _stream_tokens(sentence, steps, req.with_confidence):
+                            if kind == "token":
+                                yield _sse("token", {"index": idx, "text": payload})
+                            else:
+                                result = payload
+                    translated, models_used, confidence, latency_ms = result
+                    parts.append(translated + sep)
+                    confidences.append(confidence)
+                    event: Dict[str, Any] = {
+                        "index": idx,
+                        "text": translated,
+                        "separator": sep,
+                        "source_text": sentence,
+                        "model_used": models_used,
+                        "confidence": confidence,
+                        "latency_ms": latency_ms,
+                        "elapsed_ms": int((time.perf_counter() - started) * 1000),
+                    }
+                    if first_segment_ms is None:
+                        first_segment_ms = event["elapsed_ms"]
+                        event["time_to_first_segment_ms"] = first_segment_ms
+                    yield _sse("segment", event)
+            except QueueFullError:
+                TELEMETRY.observe_request("stream", source, target, 0.0, "queue_full")
+                yield _sse("error", {"detail": "Translation queue is full"})
+                return
+            except Exception:
+                logger.exception("Streaming translation failed")
+                TELEMETRY.observe_request("stream", source, target, 0.0, "error")
+                yield _sse("error", {"detail": "Translation failed"})
+                return
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        TELEMETRY.observe_request("stream", source, target, time.perf_counter() - started)
+
+        yield _sse(
+            "done",
+            {
+                "translated_text": "".join(parts),
+                "model_used": models_used,
+                "confidence": float(sum(confidences) / len(confidences)) if confidences else 0.0,
+                "segments": len(parts),
+                "latency_ms": int((time.perf_counter() - started) * 1000),
+                "time_to_first_segment_ms": first_segment_ms,
+            },
+        )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+LIVE_MAX_CHARS = 5000
+
+
+def _live_translator(source: str, target: str) -> Callable[[List[str]], Awaitable[List[str]]]:
+    async def translate(texts: List[str]) -> List[str]:
+        if source == target:
+            return list(texts)
+        # A single trailing sentence goes through the micro-batcher and batches with other
+        # sessions; larger catch-ups run as one bulk job.
+        if len(texts) == 1:
+            return [(await _translate_with_pivot(texts[0], source, target, False))[0]]
+        outputs = await _translate_bulk([(text, source, target) for text in texts], False)
+        return [out[0] if out is not None else "" for out in outputs]
+
+    return translate
+
+
+async def _live_update(session: LiveSession, message: Dict[str, Any], pair: Tuple[str, str]) -> Dict[str, Any]:
+    if "error" in message:
+        return {"type": "error", "detail": message["error"]}
+    final = bool(message.get("final"))
+    started = time.perf_counter()
+    try:
+        with EXECUTOR.admit():
+            diff = await session.aupdate(message["text"])
+    except OverloadedError as exc:
+        TELEMETRY.observe_request("live", *pair, 0.0, "overloaded")
+        return {"type": "error", "detail": "Too many pending translations", "retry_after_s": exc.retry_after_s}
+    except QueueFullError:
+        TELEMETRY.observe_request("live", *pair, 0.0, "queue_full")
+        return {"type": "error", "detail": "Translation queue is full", "retry_after_s": EXECUTOR.retry_after_s()}
+    except Exception:
+        logger.exception("Live translation update failed")
+        TELEMETRY.observe_request("live", *pair, 0.0, "error")
+        return {"type": "error", "detail": "Translation failed"}
+    TELEMETRY.observe_request("live", *pair, time.perf_counter() - started)
+    if final:
+        session.reset()
+    return {"type": "update", "final": final, "latency_ms": int((time.perf_counter() - started) * 1000), **diff}
+
+
+@app.websocket("/translate/live")
+async def translate_live(websocket: WebSocket) -> None:
+    source = websocket.query_params.get("source", "").strip().lower()
+    target = websocket.query_params.get("target", "").strip().lower()
+    await websocket.accept()
+    try:
+        if source != target:
+            _resolve_path(source, target)
+    except ValueError:
+        await websocket.close(code=1008, reason="Unsupported language pair")
+        return
+
+    session = LiveSession(_live_translator(source, target))
+    pending: List[Dict[str, Any]] = []
+    wakeup = asyncio.Event()
+
+    async def receive() -> None:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except WebSocketDisconnect:
+                return
+            except ValueError:
+                message = {"error": "Invalid JSON"}
+            else:
+                text = message.get("text") if isinstance(message, dict) else None
+                if not isinstance(text, str) or len(text) > LIVE_MAX_CHARS:
+                    message = {"error": "Expected {\"text\": str, \"final\": bool}"}
+            # Partials that a newer message supersedes are never translated; finals always are.
+            pending[:] = [m for m in pending if m.get("final")]
+            pending.append(message)
+            wakeup.set()
+
+    receiver = asyncio.ensure_future(receive())
+    try:
+        while True:
+            waiter = asyncio.ensure_future(wakeup.wait())
+            await asyncio.wait({waiter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver.done():
+                waiter.cancel()
+                return
+            wakeup.clear()
+            while pending:
+                await websocket.send_json(await _live_update(session, pending.pop(0), (source, target)))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+
+
+@app.post("/translate/batch", response_model=BatchTranslateResponse)
+async def translate_batch(req: BatchTranslateRequest) -> BatchTranslateResponse:
+    items = [(item.text.strip(), item.source.strip().lower(), item.target.strip().lower()) for item in req.items]
+    mark_since_start("validation")
+
+    pairs = [(source, target) for _, source, target in items]
+    started = time.perf_counter()
+    try:
+        with EXECUTOR.admit():
+            outputs = await _translate_bulk(items, req.with_confidence)
+    except OverloadedError as exc:
+        _observe_items("batch", pairs, None, "overloaded")
+        raise _overloaded(exc) from None
+    except Exception:
+        _observe_items("batch", pairs, None, "error")
+        raise HTTPException(status_code=500, detail="Translation failed") from None
+    latency_ms = int((time.perf_counter() - started) * 1000)
+    _observe_items("batch", pairs, outputs)
+
+    results: List[BatchItemResult] = []
+    for out in outputs:
+        if out is None:
+            results.append(BatchItemResult(error="Unsupported language pair"))
+            continue
+        translated_text, model_used, confidence, item_ms = out
+        results.append(
+            BatchItemResult(
+                translated_text=translated_text,
+                model_used=model_used,
+                confidence=confidence,
+                latency_ms=item_ms,
+            )
+        )
+    return BatchTranslateResponse(results=results, latency_ms=latency_ms)
+
+
+@app.post("/translate/fanout", response_model=FanoutTranslateResponse)
+async def translate_fanout(req: FanoutTranslateRequest) -> FanoutTranslateResponse:
+    source = req.source.strip().lower()
+    targets = list(dict.fromkeys(t.strip().lower() for t in req.targets))
+    text = req.text.strip()
+    mark_since_start("validation")
+
+    pairs = [(source, target) for target in targets]
+    started = time.perf_counter()
+    try:
+        with EXECUTOR.admit():
+            outputs = await _translate_fanout(text, source, targets, req.with_confidence)
+    except OverloadedError as exc:
+        _observe_items("fanout", pairs, None, "overloaded")
+        raise _overloaded(exc) from None
+    except Exception:
+        _observe_items("fanout", pairs, None, "error")
+        raise HTTPException(status_code=500, detail="Translation failed") from None
+    latency_ms = int((time.perf_counter() - started) * 1000)
+    _observe_items("fanout", pairs, outputs)
+
+    results: List[FanoutItemResult] = []
+    for target, out in zip(targets, outputs):
+        if out is None:
+            results.append(FanoutItemResult(target=target, error="Unsupported language pair"))
+            continue
+        translated_text, model_used, confidence, item_ms = out
+        results.append(
+            FanoutItemResult(
+                target=target,
+                translated_text=translated_text,
+                model_used=model_used,
+                confidence=confidence,
+                latency_ms=item_ms,
+            )
+        )
+    return FanoutTranslateResponse(results=results, latency_ms=latency_ms)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .singleflight import SingleFlight
+except Exception:
+    from singleflight import SingleFlight  # type: ignore
+
+ModelPair = Tuple[Any, Any]
+
+
+def _tensor_nbytes(value: Any) -> int:
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_nbytes(v) for v in value)
+    if hasattr(value, "numel") and hasattr(value, "element_size"):
+        return int(value.numel() * value.element_size())
+    return 0
+
+
+def model_nbytes(model: Any) -> int:
+    # state_dict also covers the packed weights of dynamically quantized layers,
+    # which are not exposed through parameters().
+    state_dict = getattr(model, "state_dict", None)
+    if state_dict is None:
+        return 0
+    return sum(_tensor_nbytes(v) for v in state_dict().values())
+
+
+def current_rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+@dataclass
+class _Resident:
+    pair: ModelPair
+    nbytes: int
+    loaded_at: float
+    last_used: float
+    in_flight: int = 0
+
+
+class ModelPool:
+    """LRU pool of ``(tokenizer, model)`` pairs kept under a parameter-byte and/or RSS budget.
+
+    Models are evicted least-recently-used first, but never while a caller holds them
+    through :meth:`acquire`. The budget may be exceeded temporarily when every resident
+    model is in use. Loads are single-flight per model id: concurrent first requests for
+    one model wait on a single load, while loads of different models run in parallel.
+    ``on_load`` receives the model id and load duration in seconds after every load.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], ModelPair],
+        max_bytes: int = 0,
+        max_rss_bytes: int = 0,
+        sizer: Callable[[Any], int] = model_nbytes,
+        rss_probe: Callable[[], Optional[int]] = current_rss_bytes,
+        on_evict: Optional[Callable[[str], None]] = None,
+        on_load: Optional[Callable[[str, float], None]] = None,
+    ) -> None:
+        self._loader = loader
+        self._on_evict = on_evict
+        self._on_load = on_load
+        self.max_bytes = max(0, max_bytes)
+        self.max_rss_bytes = max(0, max_rss_bytes)
+        self._sizer = sizer
+        self._rss_probe = rss_probe
+        self._entries: OrderedDict[str, _Resident] = OrderedDict()
+        self._lock = Lock()
+        self._loads = SingleFlight()
+        self._resident_bytes = 0
+        self.load_counts: Dict[str, int] = {}
+        self.eviction_counts: Dict[str, int] = {}
+        self.load_seconds: Dict[str, float] = {}
+
+    def __contains__(self, model_id: str) -> bool:
+        return model_id in self._entries
+
+    def loaded(self) -> List[str]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    @contextmanager
+    def acquire(self, model_id: str) -> Iterator[ModelPair]:
+        pair = self._checkout(model_id)
+        try:
+            yield pair
+        finally:
+            self._release(model_id)
+
+    def get(self, model_id: str) -> ModelPair:
+        with self.acquire(model_id) as pair:
+            return pair
+
+    def evict(self, model_id: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is None or entry.in_flight:
+                return False
+            self._drop_locked(model_id)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            resident = [
+                {
+                    "model_id": model_id,
+                    "bytes": entry.nbytes,
+                    "in_flight": entry.in_flight,
+                    "idle_s": round(now - entry.last_used, 1),
+                    "loaded_at": int(entry.loaded_at),
+                }
+                for model_id, entry in self._entries.items()
+            ]
+            return {
+                "resident": resident,
+                "resident_bytes": self._resident_bytes,
+                "loading": [str(k) for k in self._loads.in_flight()],
+                "max_bytes": self.max_bytes or None,
+                "max_rss_bytes": self.max_rss_bytes or None,
+                "loads": sum(self.load_counts.values()),
+                "evictions": sum(self.eviction_counts.values()),
+                "load_counts": dict(self.load_counts),
+                "eviction_counts": dict(self.eviction_counts),
+                "load_seconds": {k: round(v, 3) for k, v in self.load_seconds.items()},
+            }
+
+    def _pin_locked(self, model_id: str) -> Optional[ModelPair]:
+        entry = self._entries.get(model_id)
+        if entry is None:
+            return None
+        entry.in_flight += 1
+        entry.last_used = time.time()
+        self._entries.move_to_end(model_id)
+        return entry.pair
+
+    def _checkout(self, model_id: str) -> ModelPair:
+        while True:
+            with self._lock:
+                pair = self._pin_locked(model_id)
+                if pair is not None:
+                    self._enforce_budget_locked()
+                    return pair
+            # The loaded entry may be evicted before this caller pins it; loop and retry.
+            self._loads.do(model_id, lambda: self._load(model_id))
+
+    def _load(self, model_id: str) -> None:
+        if model_id in self._entries:
+            return
+        started = time.perf_counter()
+        pair = self._loader(model_id)
+        elapsed = time.perf_counter() - started
+        nbytes = self._sizer(pair[1])
+
+        with self._lock:
+            now = time.time()
+            self._entries[model_id] = _Resident(pair, nbytes, now, now)
+            self._resident_bytes += nbytes
+            self.load_counts[model_id] = self.load_counts.get(model_id, 0) + 1
+            self.load_seconds[model_id] = elapsed
+        if self._on_load is not None:
+            self._on_load(model_id, elapsed)
+
+    def _release(self, model_id: str) -> None:
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is not None and entry.in_flight > 0:
+                entry.in_flight -= 1
+            self._enforce_budget_locked()
+
+    def _enforce_budget_locked(self) -> None:
+        rss = self._rss_probe() if self.max_rss_bytes else None
+        freed = 0
+
+        def over_budget() -> bool:
+            if self.max_bytes and self._resident_bytes > self.max_bytes:
+                return True
+            return bool(rss is not None and rss - freed > self.max_rss_bytes)
+
+        while over_budget():
+            victim = next((k for k, e in self._entries.items() if e.in_flight == 0), None)
+            if victim is None:
+                return
+            freed += self._drop_locked(victim)
+            self.eviction_counts[victim] = self.eviction_counts.get(victim, 0) + 1
+
+    def _drop_locked(self, model_id: str) -> int:
+        entry = self._entries.pop(model_id)
+        self._resident_bytes -= entry.nbytes
+        if self._on_evict is not None:
+            self._on_evict(model_id)
+        return entry.nbytes
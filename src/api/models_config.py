@@ -8,6 +8,10 @@ from typing import Dict, Optional, Tuple
 class ModelSpec:
     model_id: str
     target_token: Optional[str] = None
+    # None follows NT_QUANTIZE_INT8; True/False forces dynamic int8 quantization for this pair.
+    quantize: Optional[bool] = None
+    # None follows NT_INFERENCE_BACKEND; "torch" or "onnx" pins the backend for this pair.
+    backend: Optional[str] = None
 
 
 MODELS_MAP: Dict[Tuple[str, str], ModelSpec] = {
@@ -35,5 +39,21 @@ MODELS_MAP: Dict[Tuple[str, str], ModelSpec] = {
     ("en", "nb"): ModelSpec("Helsinki-NLP/opus-mt-en-gmq", target_token="nob"),
     ("el", "en"): ModelSpec("Helsinki-NLP/opus-mt-el-en"),
     ("en", "el"): ModelSpec("Helsinki-NLP/opus-mt-en-el"),
+    # Direct models between Portuguese and the other desktop-app languages; the router
+    # prefers them over pivoting through English unless they measure slower.
+    ("pt", "es"): ModelSpec("Helsinki-NLP/opus-mt-pt-es"),
+    ("es", "pt"): ModelSpec("Helsinki-NLP/opus-mt-es-pt"),
+    ("pt", "fr"): ModelSpec("Helsinki-NLP/opus-mt-pt-fr"),
+    ("fr", "pt"): ModelSpec("Helsinki-NLP/opus-mt-fr-pt"),
+    ("pt", "de"): ModelSpec("Helsinki-NLP/opus-mt-pt-de"),
+    ("de", "pt"): ModelSpec("Helsinki-NLP/opus-mt-de-pt"),
+    ("pt", "it"): ModelSpec("Helsinki-NLP/opus-mt-pt-it"),
+    ("it", "pt"): ModelSpec("Helsinki-NLP/opus-mt-it-pt"),
+    ("pt", "ru"): ModelSpec("Helsinki-NLP/opus-mt-pt-ru"),
+    ("ru", "pt"): ModelSpec("Helsinki-NLP/opus-mt-ru-pt"),
+    ("pt", "zh"): ModelSpec("Helsinki-NLP/opus-mt-pt-zh"),
+    ("zh", "pt"): ModelSpec("Helsinki-NLP/opus-mt-zh-pt"),
+    ("pt", "ja"): ModelSpec("Helsinki-NLP/opus-mt-pt-ja"),
+    ("ja", "pt"): ModelSpec("Helsinki-NLP/opus-mt-ja-pt"),
 }
 
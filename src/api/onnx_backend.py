@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import Any, Tuple
+
+BACKENDS = ("torch", "onnx")
+
+
+def _ort_model_class() -> Any:
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as exc:
+        raise RuntimeError("onnx backend requires optimum[onnxruntime] (see requirements-onnx.txt)") from exc
+    return ORTModelForSeq2SeqLM
+
+
+def onnx_export_dir(cache_dir: str, model_id: str) -> Path:
+    return Path(cache_dir) / model_id.replace("/", "--")
+
+
+def has_onnx_export(cache_dir: str, model_id: str) -> bool:
+    path = onnx_export_dir(cache_dir, model_id)
+    return (path / "config.json").is_file() and any(path.glob("encoder_model*.onnx"))
+
+
+def export_onnx_model(model_id: str, cache_dir: str, overwrite: bool = False) -> Path:
+    """Exports the encoder and the past-key-value decoder of ``model_id`` to ``cache_dir``.
+
+    The export is written next to its final location and renamed into place, so a
+    crashed export never leaves a half-written model that :func:`load_onnx_model` would pick up.
+    """
+    from transformers import AutoTokenizer
+
+    target = onnx_export_dir(cache_dir, model_id)
+    if has_onnx_export(cache_dir, model_id) and not overwrite:
+        return target
+
+    model = _ort_model_class().from_pretrained(model_id, export=True, use_cache=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+
+    staging = target.with_name(target.name + ".partial")
+    shutil.rmtree(staging, ignore_errors=True)
+    model.save_pretrained(staging)
+    tokenizer.save_pretrained(staging)
+    if target.exists():
+        shutil.rmtree(target)
+    staging.rename(target)
+    return target
+
+
+def load_onnx_model(model_id: str, cache_dir: str, threads: int = 0) -> Tuple[Any, Any]:
+    from transformers import AutoTokenizer
+
+    path = onnx_export_dir(cache_dir, model_id)
+    if not has_onnx_export(cache_dir, model_id):
+        raise FileNotFoundError(f"no ONNX export of {model_id} in {path}; run scripts/export_onnx.py first")
+
+    model_cls = _ort_model_class()
+    import onnxruntime
+
+    session_options = onnxruntime.SessionOptions()
+    if threads > 0:
+        session_options.intra_op_num_threads = threads
+    model = model_cls.from_pretrained(
+        path,
+        use_cache=True,
+        provider="CPUExecutionProvider",
+        session_options=session_options,
+    )
+    tokenizer = AutoTokenizer.from_pretrained(path, use_fast=True)
+    return tokenizer, model
+
+
+def onnx_model_nbytes(model: Any) -> int:
+    save_dir = getattr(model, "model_save_dir", None)
+    if save_dir is None:
+        return 0
+    return sum(p.stat().st_size for p in Path(save_dir).glob("*.onnx*") if p.is_file())
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Set, Tuple
+
+Pair = Tuple[str, str]
+Route = List[Pair]
+
+
+class Router:
+    """Cheapest-path routing over the graph of available translation models.
+
+    Every ``(source, target)`` edge is a model. An edge costs its measured latency per input
+    (an exponentially weighted average of :meth:`observe` calls); until measured it costs the
+    mean of the measured edges, or ``default_cost_ms`` before any measurement. Each hop past
+    the first adds ``hop_penalty_ms`` as a quality handicap for chained translations. The
+    cheapest route of every pair, up to ``max_hops`` models, is precomputed into a table;
+    lookups never search. The table is rebuilt when an edge is disabled and at most every
+    ``rebuild_interval_s`` as latencies are observed. A rebuild only moves a pair to a new
+    route when every edge on it has been measured (or its current route lost an edge), so an
+    unknown cost never displaces a known route; ``version`` only changes when a route does.
+    """
+
+    def __init__(
+        self,
+        edges: Mapping[Pair, str],
+        max_hops: int = 2,
+        default_cost_ms: float = 100.0,
+        hop_penalty_ms: float = 50.0,
+        alpha: float = 0.2,
+        rebuild_interval_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._edges: Dict[Pair, str] = dict(edges)
+        self.max_hops = max(1, max_hops)
+        self.default_cost_ms = default_cost_ms
+        self.hop_penalty_ms = max(0.0, hop_penalty_ms)
+        self.alpha = min(1.0, max(0.0, alpha))
+        self.rebuild_interval_s = max(0.0, rebuild_interval_s)
+        self._clock = clock
+        self._lock = Lock()
+        self._cost_ms: Dict[str, float] = {}
+        self._disabled: Set[str] = set()
+        self._table: Dict[Pair, Route] = {}
+        self._built_at = 0.0
+        self.rebuilds = 0
+        self.version = 0
+        self._rebuild()
+
+    def route(self, source: str, target: str) -> Route:
+        route = self._table.get((source, target))
+        if route is None:
+            raise ValueError("pair_not_supported")
+        return route
+
+    def table(self) -> Dict[Pair, Route]:
+        return self._table
+
+    def languages(self) -> List[str]:
+        return sorted({lang for pair in self._edges for lang in pair})
+
+    def observe(self, model_id: str, ms_per_item: float) -> None:
+        with self._lock:
+            previous = self._cost_ms.get(model_id)
+            if previous is None:
+                self._cost_ms[model_id] = ms_per_item
+            else:
+                self._cost_ms[model_id] = (1 - self.alpha) * previous + self.alpha * ms_per_item
+            due = self._clock() - self._built_at >= self.rebuild_interval_s
+        if due:
+            self._rebuild()
+
+    def disable_model(self, model_id: str) -> None:
+        with self._lock:
+            if model_id in self._disabled or model_id not in self._edges.values():
+                return
+            self._disabled.add(model_id)
+        self._rebuild()
+
+    def is_disabled(self, model_id: str) -> bool:
+        with self._lock:
+            return model_id in self._disabled
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pairs": len(self._table),
+                "rebuilds": self.rebuilds,
+                "version": self.version,
+                "max_hops": self.max_hops,
+                "disabled_models": sorted(self._disabled),
+                "edge_cost_ms": {k: round(v, 3) for k, v in sorted(self._cost_ms.items())},
+            }
+
+    def _edge_costs(self, models: Iterable[str]) -> Dict[str, float]:
+        unique = set(models)
+        measured = [self._cost_ms[m] for m in unique if m in self._cost_ms]
+        prior = sum(measured) / len(measured) if measured else self.default_cost_ms
+        return {m: self._cost_ms.get(m, prior) for m in unique}
+
+    def _rebuild(self) -> None:
+        with self._lock:
+            edges = {pair: m for pair, m in self._edges.items() if m not in self._disabled}
+            costs = self._edge_costs(edges.values())
+            measured = set(self._cost_ms)
+            previous = self._table
+            self._built_at = self._clock()
+
+        outgoing: Dict[str, List[Pair]] = {}
+        for pair in sorted(edges):
+            outgoing.setdefault(pair[0], []).append(pair)
+
+        best: Dict[Pair, Tuple[Tuple[float, int, int], Route]] = {}
+        for source in outgoing:
+            for route in _paths(source, outgoing, self.max_hops):
+                target = route[-1][1]
+                cost = sum(costs[edges[hop]] for hop in route) + self.hop_penalty_ms * (len(route) - 1)
+                # Ties go to fewer hops, then to pivots through English (the best-covered models).
+                via_other = sum(1 for hop in route[:-1] if hop[1] != "en")
+                key = (round(cost, 6), len(route), via_other)
+                current = best.get((source, target))
+                if current is None or key < current[0]:
+                    best[(source, target)] = (key, route)
+
+        table: Dict[Pair, Route] = {}
+        for pair, (_, route) in best.items():
+            kept = previous.get(pair)
+            if (
+                kept is not None
+                and all(hop in edges for hop in kept)
+                and any(edges[hop] not in measured for hop in route)
+            ):
+                # The current route still works and the new one rests on a guessed cost.
+                route = kept
+            table[pair] = route
+        with self._lock:
+            self.rebuilds += 1
+            if table != self._table:
+                self._table = table
+                self.version += 1
+
+
+def _paths(source: str, outgoing: Mapping[str, List[Pair]], max_hops: int) -> Iterable[Route]:
+    stack: List[Tuple[str, Route]] = [(source, [])]
+    while stack:
+        node, route = stack.pop()
+        if len(route) >= max_hops:
+            continue
+        visited = {source} | {hop[1] for hop in route}
+        for hop in outgoing.get(node, []):
+            if hop[1] in visited:
+                continue
+            extended = route + [hop]
+            yield extended
+            stack.append((hop[1], extended))
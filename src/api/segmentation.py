@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import re
+from typing import List, Tuple
+
+# (sentence, separator): joining ``sentence + separator`` over all segments gives back the input.
+Segment = Tuple[str, str]
+
+_CLOSERS = "\"'”’»)]」』"
+_CLOSER_CLASS = "[" + re.escape(_CLOSERS) + "]*"
+_BOUNDARY = re.compile(
+    rf"[.!?…]+{_CLOSER_CLASS}(\s+)"  # Latin/Cyrillic terminators need whitespace after them
+    rf"|[。！？]+{_CLOSER_CLASS}(\s*)"  # CJK terminators end a sentence even without spaces
+    r"|(\s*\n\s*)"  # line and paragraph breaks always end a segment
+)
+_ABBREVIATIONS = frozenset(
+    "sr sra srta dr dra prof profa mr mrs ms st etc vs eg ie ex pág p fig no nº av jr".split()
+)
+
+
+def _is_abbreviation(text: str, dot: int) -> bool:
+    head = text[:dot]
+    word = head[max(head.rfind(" "), head.rfind("\n")) + 1 :].lower().replace(".", "")
+    return word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+
+def _split_long(sentence: str, max_chars: int) -> List[Segment]:
+    parts: List[Segment] = []
+    rest = sentence
+    while len(rest) > max_chars:
+        cut = rest.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        tail = rest[cut:].lstrip(" ")
+        parts.append((rest[:cut], rest[cut : len(rest) - len(tail)]))
+        rest = tail
+    parts.append((rest, ""))
+    return parts
+
+
+def split_sentences(text: str, max_chars: int = 0) -> List[Segment]:
+    """Splits ``text`` into sentences, keeping the whitespace between them.
+
+    Leading whitespace becomes a segment with an empty sentence, so that
+    ``"".join(s + sep for s, sep in split_sentences(text)) == text``. Sentences longer than
+    ``max_chars`` (when > 0) are further split at the last space before the limit.
+    """
+    segments: List[Segment] = []
+    stripped = text.lstrip()
+    if len(stripped) < len(text):
+        segments.append(("", text[: len(text) - len(stripped)]))
+
+    start = len(text) - len(stripped)
+    for match in _BOUNDARY.finditer(text, start):
+        group = next(i for i in (1, 2, 3) if match.group(i) is not None)
+        sep_start = match.start(group)
+        if group == 1 and "\n" not in match.group(group):
+            terminator = text[match.start() : sep_start].rstrip(_CLOSERS)
+            if terminator == "." and _is_abbreviation(text, match.start()):
+                continue
+        if sep_start > start:
+            segments.append((text[start:sep_start], match.group(group)))
+        elif segments:
+            segments[-1] = (segments[-1][0], segments[-1][1] + match.group(group))
+        start = match.end()
+    if start < len(text):
+        segments.append((text[start:], ""))
+
+    if max_chars <= 0:
+        return segments
+    result: List[Segment] = []
+    for sentence, sep in segments:
+        if len(sentence) <= max_chars:
+            result.append((sentence, sep))
+            continue
+        parts = _split_long(sentence, max_chars)
+        parts[-1] = (parts[-1][0], sep)
+        result.extend(parts)
+    return result
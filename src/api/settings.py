@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Tuple
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.environ.get(name)
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_choice(name: str, default: str, choices: Tuple[str, ...]) -> str:
+    raw = os.environ.get(name, "").strip().lower()
+    return raw if raw in choices else default
+
+
+@dataclass(frozen=True)
+class Settings:
+    batch_window_ms: float = 10.0
+    batch_max_size: int = 8
+    batch_max_queue: int = 256
+    batch_max_tokens: int = 4096
+    batch_buckets: str = "16,32,64,128,256"
+    bulk_max_items: int = 1000
+    bulk_chunk_size: int = 32
+    cache_max_entries: int = 10_000
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_ttl_s: float = 0.0
+    cache_warm_file: str = ""
+    cache_placeholders: bool = True
+    cache_fuzzy_threshold: float = 0.0
+    model_pool_max_bytes: int = 4 * 1024 * 1024 * 1024
+    model_pool_max_rss_mb: int = 0
+    preload_pairs: str = ""
+    executor_workers: int = 2
+    executor_torch_threads: int = 0
+    max_pending_requests: int = 64
+    inference_processes: int = 0
+    quantize_int8: bool = False
+    inference_backend: str = "torch"
+    onnx_cache_dir: str = "onnx-cache"
+    segment_max_chars: int = 400
+    route_max_hops: int = 2
+    route_hop_penalty_ms: float = 50.0
+    route_rebuild_s: float = 30.0
+    models_max_age_s: int = 60
+    trace_log: bool = False
+    encoding_cache_entries: int = 4096
+    tm_path: str = ""
+    tm_max_entries: int = 1_000_000
+    tm_max_bytes: int = 1024 * 1024 * 1024
+    tm_flush_ms: float = 200.0
+
+    @classmethod
+    def from_env(cls) -> Settings:
+        return cls(
+            batch_window_ms=max(0.0, _env_float("NT_BATCH_WINDOW_MS", cls.batch_window_ms)),
+            batch_max_size=max(1, _env_int("NT_BATCH_MAX_SIZE", cls.batch_max_size)),
+            batch_max_queue=max(1, _env_int("NT_BATCH_MAX_QUEUE", cls.batch_max_queue)),
+            batch_max_tokens=max(0, _env_int("NT_BATCH_MAX_TOKENS", cls.batch_max_tokens)),
+            batch_buckets=os.environ.get("NT_BATCH_BUCKETS", cls.batch_buckets).strip(),
+            bulk_max_items=max(1, _env_int("NT_BULK_MAX_ITEMS", cls.bulk_max_items)),
+            bulk_chunk_size=max(1, _env_int("NT_BULK_CHUNK_SIZE", cls.bulk_chunk_size)),
+            cache_max_entries=max(1, _env_int("NT_CACHE_MAX_ENTRIES", cls.cache_max_entries)),
+            cache_max_bytes=max(1, _env_int("NT_CACHE_MAX_BYTES", cls.cache_max_bytes)),
+            cache_ttl_s=max(0.0, _env_float("NT_CACHE_TTL_S", cls.cache_ttl_s)),
+            cache_warm_file=os.environ.get("NT_CACHE_WARM_FILE", cls.cache_warm_file).strip(),
+            cache_placeholders=_env_bool("NT_CACHE_PLACEHOLDERS", cls.cache_placeholders),
+            cache_fuzzy_threshold=min(1.0, max(0.0, _env_float("NT_CACHE_FUZZY_THRESHOLD", cls.cache_fuzzy_threshold))),
+            model_pool_max_bytes=max(0, _env_int("NT_MODEL_POOL_MAX_BYTES", cls.model_pool_max_bytes)),
+            model_pool_max_rss_mb=max(0, _env_int("NT_MODEL_POOL_MAX_RSS_MB", cls.model_pool_max_rss_mb)),
+            preload_pairs=os.environ.get("NT_PRELOAD_PAIRS", cls.preload_pairs).strip(),
+            executor_workers=max(1, _env_int("NT_EXECUTOR_WORKERS", cls.executor_workers)),
+            executor_torch_threads=max(0, _env_int("NT_EXECUTOR_TORCH_THREADS", cls.executor_torch_threads)),
+            max_pending_requests=max(1, _env_int("NT_MAX_PENDING_REQUESTS", cls.max_pending_requests)),
+            inference_processes=max(0, _env_int("NT_INFERENCE_PROCESSES", cls.inference_processes)),
+            quantize_int8=_env_bool("NT_QUANTIZE_INT8", cls.quantize_int8),
+            inference_backend=_env_choice("NT_INFERENCE_BACKEND", cls.inference_backend, ("torch", "onnx")),
+            onnx_cache_dir=os.environ.get("NT_ONNX_CACHE_DIR", cls.onnx_cache_dir).strip() or cls.onnx_cache_dir,
+            segment_max_chars=max(0, _env_int("NT_SEGMENT_MAX_CHARS", cls.segment_max_chars)),
+            route_max_hops=max(1, _env_int("NT_ROUTE_MAX_HOPS", cls.route_max_hops)),
+            route_hop_penalty_ms=max(0.0, _env_float("NT_ROUTE_HOP_PENALTY_MS", cls.route_hop_penalty_ms)),
+            route_rebuild_s=max(0.0, _env_float("NT_ROUTE_REBUILD_S", cls.route_rebuild_s)),
+            models_max_age_s=max(0, _env_int("NT_MODELS_MAX_AGE_S", cls.models_max_age_s)),
+            trace_log=_env_bool("NT_TRACE_LOG", cls.trace_log),
+            encoding_cache_entries=max(0, _env_int("NT_ENCODING_CACHE_ENTRIES", cls.encoding_cache_entries)),
+            tm_path=os.environ.get("NT_TM_PATH", cls.tm_path).strip(),
+            tm_max_entries=max(1, _env_int("NT_TM_MAX_ENTRIES", cls.tm_max_entries)),
+            tm_max_bytes=max(1, _env_int("NT_TM_MAX_BYTES", cls.tm_max_bytes)),
+            tm_flush_ms=max(0.0, _env_float("NT_TM_FLUSH_MS", cls.tm_flush_ms)),
+        )
+
+
+SETTINGS = Settings.from_env()
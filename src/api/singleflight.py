@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers with the same key share its outcome."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if fut is None:
+                fut = Future()
+                self._calls[key] = fut
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return fut.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def share(self, key: Hashable, start: Callable[[], Future]) -> Future:
+        """Non-blocking :meth:`do` for calls that return a future.
+
+        The first caller runs ``start``; it and every concurrent caller with the same key get a
+        future for its outcome, so async callers can await it instead of holding a thread. The
+        key is released once that outcome is set.
+        """
+        with self._lock:
+            fut = self._calls.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                return fut
+            fut = Future()
+            self._calls[key] = fut
+            self.leaders += 1
+
+        def settle(done: Future) -> None:
+            with self._lock:
+                self._calls.pop(key, None)
+            if done.cancelled():
+                fut.cancel()
+            elif done.exception() is not None:
+                fut.set_exception(done.exception())
+            else:
+                fut.set_result(done.result())
+
+        try:
+            started = start()
+        except BaseException as exc:
+            with self._lock:
+                self._calls.pop(key, None)
+            fut.set_exception(exc)
+            raise
+        started.add_done_callback(settle)
+        return fut
+
+    def in_flight(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._calls.keys())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self.leaders, "coalesced": self.coalesced}
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+STAGES = ("tokenize", "generate", "decode", "queue_wait")
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class _StatsCollector(Collector):
+    """Exposes counters that other components already keep, read at scrape time."""
+
+    def __init__(
+        self,
+        cache_stats: Optional[Callable[[], Mapping[str, Any]]],
+        pool_stats: Optional[Callable[[], Mapping[str, Any]]],
+        rss_bytes: Optional[Callable[[], Optional[int]]],
+        fuzzy_stats: Optional[Callable[[], Mapping[str, Any]]] = None,
+    ) -> None:
+        self._cache_stats = cache_stats
+        self._fuzzy_stats = fuzzy_stats
+        self._pool_stats = pool_stats
+        self._rss_bytes = rss_bytes
+
+    def describe(self) -> Iterator[Any]:
+        # Nothing to describe up front: registering must not call the stats callbacks,
+        # whose owners may not exist yet.
+        return iter(())
+
+    def collect(self) -> Iterator[Any]:
+        if self._cache_stats is not None:
+            cache = self._cache_stats()
+            lookups = CounterMetricFamily("nt_cache_lookups", "Translation cache lookups.", labels=["result"])
+            lookups.add_metric(["hit"], cache.get("hits", 0))
+            lookups.add_metric(["miss"], cache.get("misses", 0))
+            yield lookups
+            yield GaugeMetricFamily("nt_cache_entries", "Entries in the translation cache.", value=cache.get("entries", 0))
+            yield GaugeMetricFamily("nt_cache_bytes", "Approximate bytes held by the translation cache.", value=cache.get("bytes", 0))
+
+        if self._fuzzy_stats is not None:
+            fuzzy = self._fuzzy_stats()
+            lookups = CounterMetricFamily(
+                "nt_cache_template_lookups",
+                "Placeholder-template and near-duplicate lookups after an exact cache miss.",
+                labels=["result"],
+            )
+            lookups.add_metric(["template_hit"], fuzzy.get("template_hits", 0))
+            lookups.add_metric(["fuzzy_hit"], fuzzy.get("fuzzy_hits", 0))
+            lookups.add_metric(["miss"], fuzzy.get("misses", 0))
+            yield lookups
+
+        if self._pool_stats is not None:
+            pool = self._pool_stats()
+            resident = GaugeMetricFamily("nt_model_resident_bytes", "Bytes of each resident model.", labels=["model"])
+            for entry in pool.get("resident", []):
+                resident.add_metric([entry["model_id"]], entry["bytes"])
+            yield resident
+            loads = CounterMetricFamily("nt_model_loads", "Model loads.", labels=["model"])
+            for model_id, count in pool.get("load_counts", {}).items():
+                loads.add_metric([model_id], count)
+            yield loads
+            evictions = CounterMetricFamily("nt_model_evictions", "Model evictions from the pool.", labels=["model"])
+            for model_id, count in pool.get("eviction_counts", {}).items():
+                evictions.add_metric([model_id], count)
+            yield evictions
+
+        rss = self._rss_bytes() if self._rss_bytes is not None else None
+        if rss is not None:
+            yield GaugeMetricFamily("nt_process_resident_bytes", "Current resident set size of the API process.", value=rss)
+
+
+class Telemetry:
+    """Prometheus metrics of the API, kept in a registry of their own.
+
+    Request counters and latencies are labelled by endpoint and language pair; the
+    per-model stage histograms (``tokenize``, ``generate``, ``decode``, ``queue_wait``)
+    and batch sizes come from the batcher and the inference path. Cache, template-lookup
+    and model-pool figures are read from their ``stats()`` when scraped. Languages outside ``languages``
+    are labelled ``other`` so that arbitrary client input cannot grow the label set.
+    """
+
+    def __init__(
+        self,
+        languages: Iterable[str] = (),
+        cache_stats: Optional[Callable[[], Mapping[str, Any]]] = None,
+        pool_stats: Optional[Callable[[], Mapping[str, Any]]] = None,
+        rss_bytes: Optional[Callable[[], Optional[int]]] = None,
+        fuzzy_stats: Optional[Callable[[], Mapping[str, Any]]] = None,
+    ) -> None:
+        self._languages = frozenset(languages)
+        self.registry = CollectorRegistry(auto_describe=True)
+        self._requests = Counter(
+            "nt_translation_requests",
+            "Translations requested, per endpoint, language pair and outcome.",
+            ["endpoint", "source", "target", "status"],
+            registry=self.registry,
+        )
+        self._request_seconds = Histogram(
+            "nt_translation_request_seconds",
+            "End-to-end latency of successful translations per language pair.",
+            ["source", "target"],
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self._model_inputs = Counter(
+            "nt_model_inputs",
+            "Inputs translated by each model (cache misses that reached generate).",
+            ["model"],
+            registry=self.registry,
+        )
+        self._stage_seconds = Histogram(
+            "nt_stage_seconds",
+            "Per-batch time of each inference stage (queue_wait is per input).",
+            ["stage", "model"],
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self._batch_size = Histogram(
+            "nt_batch_size",
+            "Inputs per dispatched micro-batch.",
+            ["model"],
+            buckets=BATCH_SIZE_BUCKETS,
+            registry=self.registry,
+        )
+        self._model_load_seconds = Histogram(
+            "nt_model_load_seconds",
+            "Model load time.",
+            ["model"],
+            buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+            registry=self.registry,
+        )
+        self.registry.register(_StatsCollector(cache_stats, pool_stats, rss_bytes, fuzzy_stats))
+
+    def observe_request(self, endpoint: str, source: str, target: str, seconds: float, status: str = "ok") -> None:
+        source = source if source in self._languages else "other"
+        target = target if target in self._languages else "other"
+        self._requests.labels(endpoint, source, target, status).inc()
+        if status == "ok":
+            self._request_seconds.labels(source, target).observe(seconds)
+
+    def observe_generate(self, model_id: str, inputs: int, timings: Mapping[str, float]) -> None:
+        self._model_inputs.labels(model_id).inc(inputs)
+        for stage, seconds in timings.items():
+            if stage in STAGES:
+                self._stage_seconds.labels(stage, model_id).observe(seconds)
+
+    def observe_batch(self, model_id: str, size: int, waits_ms: List[float]) -> None:
+        self._batch_size.labels(model_id).observe(size)
+        queue_wait = self._stage_seconds.labels("queue_wait", model_id)
+        for wait_ms in waits_ms:
+            queue_wait.observe(wait_ms / 1000.0)
+
+    def observe_model_load(self, model_id: str, seconds: float) -> None:
+        self._model_load_seconds.labels(model_id).observe(seconds)
+
+    def render(self) -> Tuple[bytes, str]:
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
+
+    def sample(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[float]:
+        return self.registry.get_sample_value(name, labels or {})
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import threading
+from typing import List
+
+import pytest
 from fastapi.testclient import TestClient
 
 try:
     import src.api.main as main
+    from src.api.tests.test_workers import CharTokenizer, _tiny_model
 except Exception:
     import main as main  # type: ignore
+    from tests.test_workers import CharTokenizer, _tiny_model  # type: ignore
 
 
 def test_health() -> None:
@@ -25,7 +33,7 @@ def test_models_has_pairs() -> None:
 
 
 def test_translate_mock(monkeypatch) -> None:
-    def fake_translate_with_pivot(text: str, source: str, target: str):
+    async def fake_translate_with_pivot(text: str, source: str, target: str, with_confidence: bool = True):
         return "hello", "mock-model", 0.9, 12
 
     monkeypatch.setattr(main, "_translate_with_pivot", fake_translate_with_pivot)
@@ -35,3 +43,619 @@ def test_translate_mock(monkeypatch) -> None:
     assert r.json()["translated_text"] == "hello"
     assert r.json()["model_used"] == "mock-model"
 
+
+
+def test_health_reports_batching_stats() -> None:
+    c = TestClient(main.app)
+    data = c.get("/health").json()
+    assert "batching" in data
+    assert data["batching"]["max_batch_size"] >= 1
+    assert "queue_wait_ms" in data["batching"]
+
+
+def test_translate_batch_groups_hops(monkeypatch) -> None:
+    calls = []
+
+    def fake_generate_batch(model_id: str, prepared, with_confidence: bool = True, timings=None):
+        calls.append((model_id, list(prepared)))
+        return [(f"{p}@{model_id.rsplit('-', 2)[-1]}", 0.5) for p in prepared]
+
+    monkeypatch.setattr(main, "_generate_batch", fake_generate_batch)
+    main.CACHE.clear()
+    c = TestClient(main.app)
+    r = c.post(
+        "/translate/batch",
+        json={
+            "items": [
+                {"text": "a", "source": "es", "target": "fr"},
+                {"text": "b", "source": "es", "target": "en"},
+                {"text": "c", "source": "es", "target": "de"},
+                {"text": "d", "source": "xx", "target": "en"},
+                {"text": "e", "source": "en", "target": "en"},
+            ]
+        },
+    )
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert [x["translated_text"] for x in results] == ["a@en@fr", "b@en", "c@en@de", None, "e"]
+    assert results[3]["error"] == "Unsupported language pair"
+    assert results[0]["model_used"] == "Helsinki-NLP/opus-mt-es-en | Helsinki-NLP/opus-mt-en-fr"
+    # Every item shares the es->en hop, so it runs as a single generate call.
+    assert calls[0] == ("Helsinki-NLP/opus-mt-es-en", ["a", "b", "c"])
+    assert len(calls) == 3
+
+
+def test_warm_cache_from_file(tmp_path) -> None:
+    p = tmp_path / "warm.json"
+    p.write_text('[{"source": "pt", "target": "en", "text": "bom dia", "translation": "good morning"}]', encoding="utf-8")
+    main.CACHE.clear()
+    assert main._warm_cache_from_file(str(p)) == 1
+    translated, model_used, _, _ = asyncio.run(main._translate_once("bom dia", "pt", "en"))
+    assert translated == "good morning"
+    assert model_used == "Helsinki-NLP/opus-mt-pt-en"
+    assert main.CACHE.stats()["hits"] == 1
+
+
+def test_ready_after_startup_without_preload() -> None:
+    with TestClient(main.app) as c:
+        r = c.get("/ready")
+        assert r.status_code == 200
+        assert r.json()["ready"] is True
+
+
+def test_translate_overloaded_returns_429(monkeypatch) -> None:
+    monkeypatch.setattr(main.EXECUTOR, "max_pending", 0)
+    c = TestClient(main.app)
+    r = c.post("/translate", json={"text": "olá", "source": "pt", "target": "en"})
+    assert r.status_code == 429
+    assert int(r.headers["retry-after"]) >= 1
+
+
+def test_translate_batch_can_skip_confidence(monkeypatch) -> None:
+    flags = []
+
+    def fake_generate_batch(model_id: str, prepared, with_confidence: bool = True, timings=None):
+        flags.append(with_confidence)
+        return [(f"{p}!", 0.0) for p in prepared]
+
+    monkeypatch.setattr(main, "_generate_batch", fake_generate_batch)
+    main.CACHE.clear()
+    c = TestClient(main.app)
+    r = c.post(
+        "/translate/batch",
+        json={"items": [{"text": "x", "source": "pt", "target": "en"}], "with_confidence": False},
+    )
+    assert r.status_code == 200
+    assert r.json()["results"][0]["confidence"] == 0.0
+    assert flags == [False]
+
+
+def _sse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_translate_stream_emits_segments_in_order(monkeypatch) -> None:
+    async def fake_translate_with_pivot(text: str, source: str, target: str, with_confidence: bool = True):
+        return text.upper(), "fake-model", 0.5, 1
+
+    monkeypatch.setattr(main, "_translate_with_pivot", fake_translate_with_pivot)
+    c = TestClient(main.app)
+    r = c.post("/translate/stream", json={"text": "Olá mundo. Tudo bem?\n\nSim!", "source": "pt", "target": "en"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(r.text)
+    assert [e for e, _ in events] == ["segment", "segment", "segment", "done"]
+    assert [d["text"] for _, d in events[:3]] == ["OLÁ MUNDO.", "TUDO BEM?", "SIM!"]
+    assert "time_to_first_segment_ms" in events[0][1]
+    done = events[-1][1]
+    assert done["translated_text"] == "OLÁ MUNDO. TUDO BEM?\n\nSIM!"
+    assert done["time_to_first_segment_ms"] is not None
+
+
+def test_translate_stream_tokens(monkeypatch) -> None:
+    def fake_generate_streaming(spec, prepared, on_text, with_confidence, timings):
+        for chunk in ("good ", "morning"):
+            on_text(chunk)
+        return "good morning", 0.9
+
+    monkeypatch.setattr(main, "_generate_streaming", fake_generate_streaming)
+    main.CACHE.clear()
+    c = TestClient(main.app)
+    r = c.post("/translate/stream", json={"text": "bom dia", "source": "pt", "target": "en", "tokens": True})
+    events = _sse_events(r.text)
+    assert [e for e, _ in events] == ["token", "token", "segment", "done"]
+    assert events[2][1]["text"] == "good morning"
+    assert events[2][1]["model_used"] == "Helsinki-NLP/opus-mt-pt-en"
+
+
+def test_translate_stream_tokens_with_a_beam_search_model(monkeypatch) -> None:
+    from contextlib import contextmanager
+
+    class StreamingTokenizer(CharTokenizer):
+        def decode(self, ids, skip_special_tokens: bool = True, **_) -> str:
+            return self.batch_decode([ids], skip_special_tokens)[0]
+
+    model = _tiny_model()
+    # Opus-MT checkpoints ship beam search in their generation config.
+    model.generation_config.num_beams = 4
+
+    class FakePool:
+        def __contains__(self, model_id: str) -> bool:
+            return True
+
+        @contextmanager
+        def acquire(self, model_id: str):
+            yield StreamingTokenizer(), model
+
+    monkeypatch.setattr(main, "MODEL_POOL", FakePool())
+    monkeypatch.setattr(main, "ENCODINGS", None)
+    monkeypatch.setattr(main, "GENERATION_KWARGS", {"max_new_tokens": 8})
+    monkeypatch.setattr(main, "STREAM_GENERATION_KWARGS", {**main.STREAM_GENERATION_KWARGS, "max_new_tokens": 8})
+    main.CACHE.clear()
+    c = TestClient(main.app)
+    r = c.post("/translate/stream", json={"text": "bom dia", "source": "pt", "target": "en", "tokens": True})
+    events = _sse_events(r.text)
+    assert "error" not in [e for e, _ in events]
+    assert events[-1][0] == "done"
+    tokens = "".join(d["text"] for e, d in events if e == "token")
+    assert tokens.strip() == events[-1][1]["translated_text"].strip() != ""
+
+    # The greedy result is cached apart from beam-search translations of the same input.
+    spec = main.MODELS_MAP[("pt", "en")]
+    prepared = main._build_input("bom dia", spec)
+    assert main.CACHE.get(main._cache_key(spec, prepared)) is None
+    assert main.CACHE.get(main._cache_key(spec, prepared, streamed=True)) is not None
+
+
+def test_translate_stream_rejects_unsupported_pair() -> None:
+    c = TestClient(main.app)
+    assert c.post("/translate/stream", json={"text": "x", "source": "xx", "target": "en"}).status_code == 400
+
+
+def test_translate_live_pushes_diffs(monkeypatch) -> None:
+    translated: List[str] = []
+
+    async def fake_translate_with_pivot(text: str, source: str, target: str, with_confidence: bool = True):
+        translated.append(text)
+        return text.upper(), "fake-model", 0.0, 1
+
+    monkeypatch.setattr(main, "_translate_with_pivot", fake_translate_with_pivot)
+    c = TestClient(main.app)
+    with c.websocket_connect("/translate/live?source=pt&target=en") as ws:
+        ws.send_json({"text": "Olá mundo. "})
+        first = ws.receive_json()
+        ws.send_json({"text": "Olá mundo. Tudo bem?", "final": True})
+        second = ws.receive_json()
+        ws.send_json({"bogus": 1})
+        error = ws.receive_json()
+
+    assert first["type"] == "update" and first["translated_text"] == "OLÁ MUNDO. "
+    assert second["start"] == 1 and second["final"] is True
+    assert second["translated_text"] == "OLÁ MUNDO. TUDO BEM?"
+    assert translated[-1] == "Tudo bem?"
+    assert error["type"] == "error"
+
+
+def test_translate_segments_long_text(monkeypatch) -> None:
+    calls = []
+
+    def fake_generate_batch(model_id: str, prepared, with_confidence: bool = True, timings=None):
+        calls.append(list(prepared))
+        return [(p.upper(), 0.5) for p in prepared]
+
+    monkeypatch.setattr(main, "_generate_batch", fake_generate_batch)
+    main.CACHE.clear()
+    main.CACHE.put(main._cache_key(main.MODELS_MAP[("pt", "en")], "Sim!"), ("YES!", 1.0))
+    c = TestClient(main.app)
+    text = "Olá mundo. Tudo bem?\n\nOlá mundo.  Sim!"
+    r = c.post("/translate", json={"text": text, "source": "pt", "target": "en"})
+    assert r.status_code == 200
+    assert r.json()["translated_text"] == "OLÁ MUNDO. TUDO BEM?\n\nOLÁ MUNDO.  YES!"
+    assert r.json()["model_used"] == "Helsinki-NLP/opus-mt-pt-en"
+    # The repeated sentence is translated once and the cached one not at all, in a single batch
+    # ordered by length.
+    assert calls == [["Tudo bem?", "Olá mundo."]]
+
+
+def test_translate_fanout_runs_the_pivot_hop_once(monkeypatch) -> None:
+    calls = []
+
+    def fake_generate_batch(model_id: str, prepared, with_confidence: bool = True, timings=None):
+        calls.append((model_id, list(prepared)))
+        return [(f"{p}@{model_id.rsplit('-', 2)[-1]}", 0.5) for p in prepared]
+
+    monkeypatch.setattr(main, "_generate_batch", fake_generate_batch)
+    main.CACHE.clear()
+    c = TestClient(main.app)
+    r = c.post(
+        "/translate/fanout",
+        json={"text": "Hola. Adiós.", "source": "es", "targets": ["de", "fr", "en", "xx"]},
+    )
+    assert r.status_code == 200
+    results = {x["target"]: x for x in r.json()["results"]}
+    assert results["de"]["translated_text"] == "Hola.@en@de Adiós.@en@de"
+    assert results["en"]["translated_text"] == "Hola.@en Adiós.@en"
+    assert results["xx"]["error"] == "Unsupported language pair"
+    assert sorted(m for m, _ in calls) == [
+        "Helsinki-NLP/opus-mt-en-de",
+        "Helsinki-NLP/opus-mt-en-fr",
+        "Helsinki-NLP/opus-mt-es-en",
+    ]
+    assert ("Helsinki-NLP/opus-mt-es-en", ["Hola.", "Adiós."]) in calls
+
+
+def test_direct_model_preferred_over_pivot(monkeypatch) -> None:
+    calls = []
+
+    def fake_generate_batch(model_id: str, prepared, with_confidence: bool = True, timings=None):
+        calls.append(model_id)
+        return [(f"{p}!", 0.5) for p in prepared]
+
+    monkeypatch.setattr(main, "_generate_batch", fake_generate_batch)
+    main.CACHE.clear()
+    c = TestClient(main.app)
+    r = c.post("/translate", json={"text": "olá", "source": "pt", "target": "es"})
+    assert r.status_code == 200
+    assert r.json()["model_used"] == "Helsinki-NLP/opus-mt-pt-es"
+    assert calls == ["Helsinki-NLP/opus-mt-pt-es"]
+    pairs = {(p["source"], p["target"]): p for p in c.get("/models").json()["pairs"]}
+    assert pairs[("pt", "es")]["pivot"] is False
+    assert pairs[("es", "fr")]["models"] == ["Helsinki-NLP/opus-mt-es-en", "Helsinki-NLP/opus-mt-en-fr"]
+
+
+def test_numbers_are_masked_in_the_cache(monkeypatch) -> None:
+    calls = []
+
+    def fake_generate_batch(model_id: str, prepared, with_confidence: bool = True, timings=None):
+        calls.append(list(prepared))
+        return [(f"Order {p.split()[1]} sent", 0.8) for p in prepared]
+
+    monkeypatch.setattr(main, "_generate_batch", fake_generate_batch)
+    main.CACHE.clear()
+    c = TestClient(main.app)
+    before = c.get("/health").json()
+    first = c.post("/translate", json={"text": "Pedido 1234 enviado", "source": "pt", "target": "en"}).json()
+    second = c.post("/translate", json={"text": "Pedido 5678 enviado", "source": "pt", "target": "en"}).json()
+    assert first["translated_text"] == "Order 1234 sent"
+    assert second["translated_text"] == "Order 5678 sent"
+    assert second["confidence"] == 0.8
+    assert calls == [["Pedido 1234 enviado"]]
+    after = c.get("/health").json()
+    assert after["fuzzy"]["template_hits"] - before["fuzzy"]["template_hits"] == 1
+    assert after["fuzzy"]["misses"] - before["fuzzy"]["misses"] == 1
+    # One exact-key lookup per request; template lookups do not add cache misses.
+    assert after["cache"]["misses"] - before["cache"]["misses"] == 2
+    assert after["cache"]["hits"] == before["cache"]["hits"]
+
+
+def test_models_etag_and_pair_lookup() -> None:
+    c = TestClient(main.app)
+    r = c.get("/models")
+    etag = r.headers["etag"]
+    assert "max-age" in r.headers["cache-control"]
+
+    r = c.get("/models", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+    assert c.get("/models", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    r = c.get("/models/PT/en")
+    assert r.status_code == 200
+    assert r.json() == {"source": "pt", "target": "en", "pivot": False, "models": ["Helsinki-NLP/opus-mt-pt-en"]}
+    assert c.get("/models/pt/xx").status_code == 404
+
+
+def test_models_catalog_follows_route_changes(monkeypatch) -> None:
+    router = main.Router({("pt", "en"): "Helsinki-NLP/opus-mt-pt-en", ("en", "es"): "Helsinki-NLP/opus-mt-en-es"})
+    monkeypatch.setattr(main, "ROUTER", router)
+    c = TestClient(main.app)
+    etag = c.get("/models").headers["etag"]
+    assert c.get("/models/pt/es").json()["pivot"] is True
+
+    router.disable_model("Helsinki-NLP/opus-mt-en-es")
+    r = c.get("/models", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert c.get("/models/pt/es").status_code == 404
+
+
+def test_prometheus_metrics(monkeypatch) -> None:
+    def fake_generate_batch(model_id: str, prepared, with_confidence: bool = True, timings=None):
+        main.TELEMETRY.observe_generate(model_id, len(prepared), {"tokenize": 0.001, "generate": 0.01, "decode": 0.001})
+        return [(f"{p}!", 0.5) for p in prepared]
+
+    monkeypatch.setattr(main, "_generate_batch", fake_generate_batch)
+    main.CACHE.clear()
+    c = TestClient(main.app)
+    before = main.TELEMETRY.sample(
+        "nt_translation_requests_total", {"endpoint": "translate", "source": "pt", "target": "en", "status": "ok"}
+    ) or 0.0
+    assert c.post("/translate", json={"text": "prometheus", "source": "pt", "target": "en"}).status_code == 200
+    assert c.post("/translate", json={"text": "x", "source": "pt", "target": "qq"}).status_code == 400
+
+    r = c.get("/metrics/prometheus")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    assert 'nt_translation_requests_total{endpoint="translate",source="pt",status="unsupported",target="other"}' in body
+    assert 'nt_stage_seconds_count{model="Helsinki-NLP/opus-mt-pt-en",stage="generate"}' in body
+    assert 'nt_batch_size_bucket{le="1.0",model="Helsinki-NLP/opus-mt-pt-en"}' in body
+    assert 'nt_cache_lookups_total{result="miss"}' in body
+    after = main.TELEMETRY.sample(
+        "nt_translation_requests_total", {"endpoint": "translate", "source": "pt", "target": "en", "status": "ok"}
+    )
+    assert after == before + 1
+
+
+def test_server_timing_covers_route_hops_and_stages(monkeypatch) -> None:
+    def fake_generate_batch(model_id: str, prepared, with_confidence: bool = True, timings=None):
+        if timings is not None:
+            timings.update({"tokenize": 0.001, "generate": 0.002, "decode": 0.001})
+        return [(f"{p}@{model_id.rsplit('-', 2)[-1]}", 0.5) for p in prepared]
+
+    exported: List[dict] = []
+
+    class Collect:
+        def export(self, trace) -> None:
+            exported.append(trace.to_dict())
+
+    exporter = Collect()
+    monkeypatch.setattr(main, "_generate_batch", fake_generate_batch)
+    main.CACHE.clear()
+    main.TRACER.add_exporter(exporter)
+    try:
+        c = TestClient(main.app)
+        r = c.post(
+            "/translate",
+            json={"text": "traced", "source": "es", "target": "fr"},
+            headers={"X-Request-ID": "req-42"},
+        )
+    finally:
+        main.TRACER.remove_exporter(exporter)
+    assert r.status_code == 200
+    assert r.headers["x-request-id"] == "req-42"
+    timing = r.headers["server-timing"]
+    for name in ("validation", "route", "hop1", "hop2", "queue", "tokenize", "generate", "decode", "total"):
+        assert f"{name};dur=" in timing
+    assert 'hop1;dur=' in timing and 'desc="es-en"' in timing
+
+    assert exported[0]["trace_id"] == "req-42"
+    assert exported[0]["status"] == 200
+    assert [s["name"] for s in exported[0]["spans"] if s["name"].startswith("hop")] == ["hop1", "hop2"]
+
+
+def test_transient_load_error_does_not_disable_the_model(monkeypatch) -> None:
+    router = main.Router({("pt", "en"): "Helsinki-NLP/opus-mt-pt-en"})
+    monkeypatch.setattr(main, "ROUTER", router)
+    failures = [ConnectionResetError("connection reset by peer")]
+
+    class FakeModel:
+        def eval(self) -> None:
+            pass
+
+    def fake_tokenizer(model_id: str, **kwargs):
+        if failures:
+            raise failures.pop()
+        return object()
+
+    monkeypatch.setattr(main.AutoTokenizer, "from_pretrained", fake_tokenizer)
+    monkeypatch.setattr(main.AutoModelForSeq2SeqLM, "from_pretrained", lambda model_id, **kwargs: FakeModel())
+
+    with pytest.raises(OSError):
+        main._load_model("Helsinki-NLP/opus-mt-pt-en")
+    assert router.route("pt", "en") == [("pt", "en")]
+    _, model = main._load_model("Helsinki-NLP/opus-mt-pt-en")
+    assert isinstance(model, FakeModel)
+
+    # A checkpoint the Hub does not have is routed around.
+    def missing(model_id: str, **kwargs):
+        raise OSError(f"{model_id} does not appear to have a file named config.json") from main.EntryNotFoundError(
+            "config.json"
+        )
+
+    monkeypatch.setattr(main.AutoTokenizer, "from_pretrained", missing)
+    with pytest.raises(OSError):
+        main._load_model("Helsinki-NLP/opus-mt-pt-en")
+    assert router.stats()["disabled_models"] == ["Helsinki-NLP/opus-mt-pt-en"]
+
+
+def test_health_answers_while_inference_is_saturated(monkeypatch) -> None:
+    import anyio
+    import httpx
+
+    entered = threading.Event()
+    release = threading.Event()
+
+    def blocked_generate_batch(model_id: str, prepared, with_confidence: bool = True, timings=None):
+        entered.set()
+        release.wait(10)
+        return [(f"{p}!", 0.5) for p in prepared]
+
+    monkeypatch.setattr(main, "_generate_batch", blocked_generate_batch)
+    main.CACHE.clear()
+
+    async def scenario() -> None:
+        # Fewer threadpool threads than waiting requests: waiting must not hold one.
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 2
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            requests = [
+                asyncio.ensure_future(
+                    client.post("/translate", json={"text": f"saturado {i}", "source": "pt", "target": "en"})
+                )
+                for i in range(6)
+            ]
+            while not entered.is_set():
+                await asyncio.sleep(0.01)
+            try:
+                health = await asyncio.wait_for(client.get("/health"), timeout=5)
+                assert health.status_code == 200
+                assert health.json()["executor"]["pending_requests"] == 6
+            finally:
+                release.set()
+            responses = await asyncio.gather(*requests)
+        assert [r.status_code for r in responses] == [200] * 6
+
+    asyncio.run(scenario())
+
+
+def test_warmup_generations_do_not_feed_router_costs(monkeypatch) -> None:
+    from contextlib import contextmanager
+
+    class FakePool:
+        def __contains__(self, model_id: str) -> bool:
+            return True
+
+        @contextmanager
+        def acquire(self, model_id: str):
+            yield None, None
+
+        def get(self, model_id: str):
+            return None, None
+
+    router = main.Router({("pt", "en"): "Helsinki-NLP/opus-mt-pt-en"})
+    monkeypatch.setattr(main, "ROUTER", router)
+    monkeypatch.setattr(main, "MODEL_POOL", FakePool())
+    monkeypatch.setattr(main, "PROCESS_POOL", None)
+    monkeypatch.setattr(main, "generate_bucketed", lambda tokenizer, model, prepared, *a, **kw: [("x", 0.5)] * len(prepared))
+
+    warmup = main.Warmup(lambda src, tgt: ["Helsinki-NLP/opus-mt-pt-en"], FakePool().get, main.WARMUP._generate)
+    warmup.run([("pt", "en")])
+    assert warmup.ready
+    assert router.stats()["edge_cost_ms"] == {}
+
+    main._generate_batch("Helsinki-NLP/opus-mt-pt-en", ["olá"])
+    assert list(router.stats()["edge_cost_ms"]) == ["Helsinki-NLP/opus-mt-pt-en"]
+
+
+def test_warmup_reaches_every_worker_process(monkeypatch) -> None:
+    from contextlib import contextmanager
+
+    class FakePool:
+        @contextmanager
+        def acquire(self, model_id: str):
+            yield "tokenizer", "model"
+
+    class FakeProcessPool:
+        def __init__(self) -> None:
+            self.warmed: List[tuple] = []
+
+        def warm(self, model_id, tokenizer, model, prepared, generation_kwargs, with_confidence=True) -> None:
+            self.warmed.append((model_id, len(prepared)))
+
+        def generate(self, *args, **kwargs):
+            raise AssertionError("warm-up must not go through the least-busy worker")
+
+    processes = FakeProcessPool()
+    monkeypatch.setattr(main, "MODEL_POOL", FakePool())
+    monkeypatch.setattr(main, "PROCESS_POOL", processes)
+
+    warmup = main.Warmup(lambda src, tgt: ["Helsinki-NLP/opus-mt-pt-en"], lambda model_id: None, main.WARMUP._generate, 4)
+    warmup.run([("pt", "en")])
+    assert warmup.report()["models"]["Helsinki-NLP/opus-mt-pt-en"]["status"] == "ok"
+    assert processes.warmed == [("Helsinki-NLP/opus-mt-pt-en", 1), ("Helsinki-NLP/opus-mt-pt-en", 4)]
+
+
+def test_missing_direct_checkpoint_falls_back_to_the_english_pivot(monkeypatch) -> None:
+    router = main.Router({pair: spec.model_id for pair, spec in main.MODELS_MAP.items()})
+    monkeypatch.setattr(main, "ROUTER", router)
+    missing = {"Helsinki-NLP/opus-mt-pt-es", "Helsinki-NLP/opus-mt-pt-fr", "Helsinki-NLP/opus-mt-pt-de"}
+
+    def not_on_the_hub(model_id: str, **kwargs):
+        raise OSError(f"{model_id} is not a valid model identifier") from main.EntryNotFoundError("config.json")
+
+    monkeypatch.setattr(main.AutoTokenizer, "from_pretrained", not_on_the_hub)
+
+    def fake_generate_batch(model_id: str, prepared, with_confidence: bool = True, timings=None):
+        if model_id in missing:
+            main._load_model(model_id)
+        return [(f"{p}@{model_id.rsplit('-', 2)[-1]}", 0.5) for p in prepared]
+
+    def fake_generate_streaming(spec, prepared, on_text, with_confidence, timings):
+        if spec.model_id in missing:
+            main._load_model(spec.model_id)
+        on_text("streamed")
+        return "streamed", 0.5
+
+    monkeypatch.setattr(main, "_generate_batch", fake_generate_batch)
+    monkeypatch.setattr(main, "_generate_streaming", fake_generate_streaming)
+    main.CACHE.clear()
+    c = TestClient(main.app)
+
+    r = c.post("/translate", json={"text": "olá", "source": "pt", "target": "es"})
+    assert r.status_code == 200
+    assert r.json()["model_used"] == "Helsinki-NLP/opus-mt-pt-en | Helsinki-NLP/opus-mt-en-es"
+
+    # The failing group is rerouted; the unrelated item in the same batch is unaffected.
+    r = c.post(
+        "/translate/batch",
+        json={"items": [{"text": "bom dia", "source": "pt", "target": "fr"}, {"text": "oi", "source": "pt", "target": "en"}]},
+    )
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert results[0]["model_used"] == "Helsinki-NLP/opus-mt-pt-en | Helsinki-NLP/opus-mt-en-fr"
+    assert results[1]["model_used"] == "Helsinki-NLP/opus-mt-pt-en"
+
+    r = c.post("/translate/stream", json={"text": "olá", "source": "pt", "target": "de", "tokens": True})
+    events = _sse_events(r.text)
+    assert [e for e, _ in events] == ["token", "segment", "done"]
+    assert events[1][1]["model_used"] == "Helsinki-NLP/opus-mt-pt-en | Helsinki-NLP/opus-mt-en-de"
+
+    assert router.stats()["disabled_models"] == sorted(missing)
+    pairs = {(p["source"], p["target"]): p for p in c.get("/models").json()["pairs"]}
+    assert pairs[("pt", "es")]["pivot"] is True
+
+
+def test_translation_memory_is_read_off_the_event_loop(monkeypatch) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    spec = main.MODELS_MAP[("pt", "en")]
+
+    class RecordingStore:
+        def __init__(self) -> None:
+            self.reads: List[bool] = []
+
+        def get(self, key):
+            try:
+                asyncio.get_running_loop()
+                self.reads.append(True)
+            except RuntimeError:
+                self.reads.append(False)
+            if key == main._cache_key(spec, main._build_input("guardado", spec)):
+                return ("stored", 0.7)
+            return None
+
+        def put(self, key, value) -> None:
+            pass
+
+        def stats(self):
+            return {}
+
+    def fake_generate_batch(model_id: str, prepared, with_confidence: bool = True, timings=None):
+        return [(f"{p}!", 0.5) for p in prepared]
+
+    store = RecordingStore()
+    reader = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(main, "CACHE", main.TranslationCache(store=store))
+    monkeypatch.setattr(main, "FUZZY", main.FuzzyMatcher(main.CACHE))
+    monkeypatch.setattr(main, "STORE_READER", reader)
+    monkeypatch.setattr(main, "_generate_batch", fake_generate_batch)
+    try:
+        c = TestClient(main.app)
+        r = c.post("/translate", json={"text": "guardado", "source": "pt", "target": "en"})
+        assert r.json()["translated_text"] == "stored"
+        r = c.post(
+            "/translate/batch",
+            json={"items": [{"text": "guardado", "source": "pt", "target": "en"}, {"text": "novo 12", "source": "pt", "target": "en"}]},
+        )
+        assert [item["translated_text"] for item in r.json()["results"]] == ["stored", "novo 12!"]
+    finally:
+        reader.shutdown()
+    assert store.reads and not any(store.reads)
+    # The second "guardado" is answered from memory; "novo 12" missed exact key and template once each.
+    stats = main.CACHE.stats()
+    assert (stats["hits"], stats["misses"], stats["store_hits"]) == (2, 1, 1)
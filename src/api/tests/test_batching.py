@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import time
+from threading import Event
+from typing import Any, List
+
+import pytest
+
+try:
+    from src.api.batching import MicroBatcher, QueueFullError
+except Exception:
+    from batching import MicroBatcher, QueueFullError  # type: ignore
+
+
+def test_concurrent_submissions_share_one_batch() -> None:
+    calls: List[List[Any]] = []
+
+    def run_batch(key: str, items: List[Any]) -> List[Any]:
+        calls.append(list(items))
+        return [f"{key}:{x}" for x in items]
+
+    dispatched: List[Any] = []
+    batcher = MicroBatcher(
+        run_batch, window_ms=200, max_batch=4, on_dispatch=lambda key, size, waits: dispatched.append((key, size, waits))
+    )
+    futures = [batcher.submit("m", i) for i in range(4)]
+    assert [f.result(timeout=5) for f in futures] == ["m:0", "m:1", "m:2", "m:3"]
+    assert calls == [[0, 1, 2, 3]]
+    assert [(key, size, len(waits)) for key, size, waits in dispatched] == [("m", 4, 4)]
+
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["requests"] == 4
+    assert stats["last_batch_size"] == 4
+
+
+def test_keys_are_batched_separately() -> None:
+    seen: List[str] = []
+
+    def run_batch(key: str, items: List[Any]) -> List[Any]:
+        seen.append(key)
+        return items
+
+    batcher = MicroBatcher(run_batch, window_ms=1, max_batch=8)
+    assert batcher.submit("a", 1).result(timeout=5) == 1
+    assert batcher.submit("b", 2).result(timeout=5) == 2
+    assert sorted(seen) == ["a", "b"]
+
+
+def test_errors_fan_out_to_every_caller() -> None:
+    def run_batch(key: str, items: List[Any]) -> List[Any]:
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(run_batch, window_ms=50, max_batch=2)
+    futures = [batcher.submit("m", i) for i in range(2)]
+    for f in futures:
+        with pytest.raises(RuntimeError):
+            f.result(timeout=5)
+
+
+def test_queue_depth_limit() -> None:
+    release = Event()
+
+    def run_batch(key: str, items: List[Any]) -> List[Any]:
+        release.wait(5)
+        return items
+
+    batcher = MicroBatcher(run_batch, window_ms=0, max_batch=1, max_queue=1)
+    first = batcher.submit("m", 0)
+    # Wait until the dispatcher picked up the first item and is blocked on it.
+    while batcher.queue_depth("m"):
+        time.sleep(0.001)
+    batcher.submit("m", 1)
+    with pytest.raises(QueueFullError):
+        batcher.submit("m", 2)
+    release.set()
+    assert first.result(timeout=5) == 0
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+try:
+    from src.api.bucketing import bucket_batches, padding_ratio, parse_buckets
+    from src.api.inference import generate_batch, generate_bucketed
+    from src.api.tests.test_workers import CharTokenizer, _tiny_model
+except Exception:
+    from bucketing import bucket_batches, padding_ratio, parse_buckets  # type: ignore
+    from inference import generate_batch, generate_bucketed  # type: ignore
+    from tests.test_workers import CharTokenizer, _tiny_model  # type: ignore
+
+
+def test_parse_buckets() -> None:
+    assert parse_buckets("64, 16,x,0,16,32") == (16, 32, 64)
+    assert parse_buckets("") == ()
+
+
+def test_inputs_share_a_batch_only_within_a_bucket() -> None:
+    lengths = [40, 3, 12, 5, 300, 20]
+    batches = bucket_batches(lengths, boundaries=(8, 16, 64))
+    assert batches == [[1, 3], [2], [5, 0], [4]]
+    assert padding_ratio(lengths, batches) < padding_ratio(lengths, [list(range(len(lengths)))])
+    assert bucket_batches(lengths, boundaries=()) == [[1, 3, 2, 5, 0, 4]]
+
+
+def test_token_and_item_limits_close_batches() -> None:
+    lengths = [10, 10, 10, 10, 12, 50]
+    assert bucket_batches(lengths, boundaries=(), max_tokens=36) == [[0, 1, 2], [3, 4], [5]]
+    assert bucket_batches(lengths, boundaries=(), max_items=4) == [[0, 1, 2, 3], [4, 5]]
+    # An input over the token budget is still translated, alone.
+    assert bucket_batches([100], max_tokens=10) == [[0]]
+
+
+def test_bucketed_generate_keeps_order_and_outputs() -> None:
+    model, tokenizer = _tiny_model(), CharTokenizer()
+    texts = ["a much longer input sentence", "ab", "abc", "another long input text"]
+    kwargs = {"max_new_tokens": 6}
+    timings: dict = {}
+    bucketed = generate_bucketed(tokenizer, model, texts, kwargs, timings=timings, boundaries=(4,))
+    expected = [generate_batch(tokenizer, model, [text], kwargs)[0] for text in texts]
+    assert [text for text, _ in bucketed] == [text for text, _ in expected]
+    assert set(timings) == {"tokenize", "generate", "decode"}
+    assert generate_bucketed(tokenizer, model, [], kwargs) == []
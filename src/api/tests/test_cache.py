@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+try:
+    from src.api.cache import TranslationCache, read_warm_file
+except Exception:
+    from cache import TranslationCache, read_warm_file  # type: ignore
+
+
+def test_key_normalizes_whitespace_and_params_order() -> None:
+    a = TranslationCache.make_key("m", "  olá   mundo ", {"b": 2, "a": 1})
+    b = TranslationCache.make_key("m", "olá mundo", {"a": 1, "b": 2})
+    assert a == b
+    assert a != TranslationCache.make_key("other", "olá mundo", {"a": 1, "b": 2})
+
+
+def test_lru_eviction_by_entries() -> None:
+    cache = TranslationCache(max_entries=2)
+    k1, k2, k3 = (TranslationCache.make_key("m", t) for t in ("1", "2", "3"))
+    cache.put(k1, "one")
+    cache.put(k2, "two")
+    assert cache.get(k1) == "one"  # k2 becomes least recently used
+    cache.put(k3, "three")
+    assert cache.get(k2) is None
+    assert cache.get(k1) == "one"
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_peek_is_not_counted() -> None:
+    cache = TranslationCache()
+    key = TranslationCache.make_key("m", "olá")
+    assert cache.peek(key) is None
+    cache.put(key, "hello")
+    assert cache.peek(key) == "hello"
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 0)
+    cache.count_lookup(False)
+    assert cache.stats()["misses"] == 1
+
+
+def test_local_peek_skips_the_store() -> None:
+    class Store:
+        def get(self, key):
+            return "from store"
+
+        def put(self, key, value) -> None:
+            pass
+
+        def stats(self):
+            return {}
+
+    cache = TranslationCache(store=Store())
+    key = TranslationCache.make_key("m", "olá")
+    assert cache.peek(key, local=True) is None
+    assert cache.peek(key) == "from store"
+    assert cache.peek(key, local=True) == "from store"
+
+
+def test_byte_budget_evicts() -> None:
+    cache = TranslationCache(max_entries=100, max_bytes=40)
+    for i in range(5):
+        cache.put(TranslationCache.make_key("m", f"text {i}"), "x" * 10)
+    assert cache.stats()["bytes"] <= 40
+    assert len(cache) < 5
+
+
+def test_ttl_expires_entries() -> None:
+    now = [0.0]
+    cache = TranslationCache(ttl_s=10, clock=lambda: now[0])
+    key = TranslationCache.make_key("m", "olá")
+    cache.put(key, "hello")
+    now[0] = 5
+    assert cache.get(key) == "hello"
+    now[0] = 16
+    assert cache.get(key) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_read_warm_file_jsonl(tmp_path: Path) -> None:
+    p = tmp_path / "warm.jsonl"
+    lines = [{"source": "pt", "target": "en", "text": "olá", "translation": "hello"}, {"text": "x"}]
+    p.write_text("\n".join(json.dumps(x) for x in lines) + "\n\n", encoding="utf-8")
+    records = list(read_warm_file(p))
+    assert len(records) == 2
+    assert records[0]["translation"] == "hello"
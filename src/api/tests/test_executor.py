@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+try:
+    from src.api.executor import InferenceExecutor, OverloadedError
+except Exception:
+    from executor import InferenceExecutor, OverloadedError  # type: ignore
+
+
+def test_run_executes_on_inference_workers() -> None:
+    ex = InferenceExecutor(workers=1)
+    name = asyncio.run(ex.run(lambda: threading.current_thread().name))
+    assert name.startswith("inference")
+    assert ex.stats()["completed_tasks"] == 1
+    ex.shutdown()
+
+
+def test_admission_rejects_over_max_pending() -> None:
+    ex = InferenceExecutor(workers=1, max_pending=2)
+    with ex.admit(), ex.admit():
+        with pytest.raises(OverloadedError) as info:
+            with ex.admit():
+                pass
+        assert info.value.retry_after_s >= 1
+    with ex.admit():
+        pass
+    assert ex.stats()["rejected"] == 1
+    assert ex.stats()["pending_requests"] == 0
+    ex.shutdown()
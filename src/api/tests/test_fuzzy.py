@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+try:
+    from src.api.cache import TranslationCache
+    from src.api.fuzzy import FuzzyMatcher, NearDuplicateIndex, fill, mask, template_translation
+except Exception:
+    from cache import TranslationCache  # type: ignore
+    from fuzzy import FuzzyMatcher, NearDuplicateIndex, fill, mask, template_translation  # type: ignore
+
+
+def test_mask_numbers_urls_and_emails() -> None:
+    masked = mask("Pedido 1.234,50 para ana@example.com, ver https://exemplo.com/p/42.")
+    assert masked.template == "Pedido ⟦0⟧ para ⟦1⟧, ver ⟦2⟧."
+    assert masked.values == ("1.234,50", "ana@example.com", "https://exemplo.com/p/42")
+    assert fill(masked.template, masked.values) == "Pedido 1.234,50 para ana@example.com, ver https://exemplo.com/p/42."
+    # Digits inside words are left alone.
+    assert mask("modelo A4 e mp3").values == ()
+
+
+def test_template_translation_needs_every_value_once() -> None:
+    assert template_translation("Order 12 shipped on 3/4", ("3/4", "12")) == "Order ⟦1⟧ shipped on ⟦0⟧"
+    assert template_translation("Order twelve shipped", ("12",)) is None
+    assert template_translation("12 of 12", ("12",)) is None
+    assert template_translation("Total 1,234", ("1",)) is None
+    assert template_translation("a 1 b 1", ("1", "1")) is None
+
+
+def test_placeholder_hits_fill_in_new_values() -> None:
+    cache = TranslationCache()
+    matcher = FuzzyMatcher(cache)
+    params = {"max_new_tokens": 256}
+    matcher.put("m", "Pedido 1234 enviado em 10/05", params, ("Order 1234 shipped on 10/05", 0.9))
+    assert matcher.get("m", "Pedido 5678 enviado em 11/06", params) == (("Order 5678 shipped on 11/06", 0.9), 1.0)
+    assert matcher.get("m", "Pedido 5678 enviado em 11/06", {"max_new_tokens": 8}) is None
+    assert matcher.get("other", "Pedido 5678 enviado em 11/06", params) is None
+    assert matcher.get("m", "Pedido enviado", params) is None
+    stats = matcher.stats()
+    assert stats["template_hits"] == 1
+    assert stats["misses"] == 3
+    # Template lookups are counted by the matcher, not as cache hits or misses.
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 0)
+
+
+def test_fallback_params_are_one_lookup() -> None:
+    cache = TranslationCache()
+    matcher = FuzzyMatcher(cache)
+    scored, unscored = {"max_new_tokens": 256}, {"max_new_tokens": 256, "confidence": False}
+    matcher.put("m", "Pedido 1234 enviado", unscored, ("Order 1234 shipped", 0.0))
+    assert matcher.get("m", "Pedido 99 enviado", scored, unscored) == (("Order 99 shipped", 0.0), 1.0)
+    assert matcher.get("m", "Fatura 99 paga", scored, unscored) is None
+    stats = matcher.stats()
+    assert (stats["template_hits"], stats["misses"]) == (1, 1)
+
+
+def test_near_duplicates_above_threshold() -> None:
+    cache = TranslationCache()
+    matcher = FuzzyMatcher(cache, NearDuplicateIndex(threshold=0.6))
+    key = TranslationCache.make_key("m", "O pedido foi enviado hoje.")
+    cache.put(key, "The order was shipped today.")
+    matcher.put("m", "O pedido foi enviado hoje.", None, "The order was shipped today.")
+
+    value, similarity = matcher.get("m", "o pedido foi enviado hoje") or (None, 0.0)
+    assert value == "The order was shipped today."
+    assert similarity == 1.0
+    value, similarity = matcher.get("m", "O pedido foi enviado ontem.") or (None, 0.0)
+    assert value == "The order was shipped today."
+    assert 0.6 <= similarity < 1.0
+    assert matcher.get("m", "Bom dia a todos.") is None
+    assert matcher.stats()["fuzzy_hits"] == 2
+
+
+def test_index_forgets_entries_gone_from_the_cache() -> None:
+    cache = TranslationCache(max_entries=1)
+    index = NearDuplicateIndex(threshold=0.5)
+    matcher = FuzzyMatcher(cache, index)
+    cache.put(TranslationCache.make_key("m", "bom dia"), "good morning")
+    matcher.put("m", "bom dia", None, "good morning")
+    cache.put(TranslationCache.make_key("m", "boa noite"), "good night")
+    assert matcher.get("m", "Bom dia!") is None
+    assert len(index) == 0
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+import torch
+
+try:
+    from src.api.inference import generate_batch
+    from src.api.tests.test_workers import CharTokenizer, _tiny_model
+except Exception:
+    from inference import generate_batch  # type: ignore
+    from tests.test_workers import CharTokenizer, _tiny_model  # type: ignore
+
+
+def _reference_confidences(model, texts: List[str]) -> List[float]:
+    # Greedy decoding scored token by token with a full-vocabulary softmax.
+    inputs = CharTokenizer()(texts, return_tensors="pt")
+    out = model.generate(**inputs, max_new_tokens=8, num_beams=1, return_dict_in_generate=True, output_scores=True)
+    gen_tokens = out.sequences[:, -len(out.scores) :]
+    confidences = []
+    for row in range(len(texts)):
+        probs = []
+        for i, step in enumerate(out.scores):
+            token_id = int(gen_tokens[row, i])
+            probs.append(float(torch.softmax(step[row], dim=-1)[token_id]))
+            if token_id == 1:
+                break
+        confidences.append(sum(probs) / len(probs))
+    return confidences
+
+
+def test_vectorized_confidence_matches_per_token_softmax() -> None:
+    model = _tiny_model()
+    texts = ["abc", "hello world"]
+    out = generate_batch(CharTokenizer(), model, texts, {"max_new_tokens": 8, "num_beams": 1})
+    assert [conf for _, conf in out] == pytest.approx(_reference_confidences(model, texts), abs=1e-5)
+
+
+def test_confidence_with_beam_search_is_a_probability() -> None:
+    out = generate_batch(CharTokenizer(), _tiny_model(), ["abc", "hello"], {"max_new_tokens": 8, "num_beams": 3})
+    assert all(0.0 < conf <= 1.0 for _, conf in out)
+
+
+def test_skipping_confidence_keeps_the_translation() -> None:
+    model, texts = _tiny_model(), ["abc", "hello"]
+    kwargs = {"max_new_tokens": 8}
+    full = generate_batch(CharTokenizer(), model, texts, kwargs)
+    light = generate_batch(CharTokenizer(), model, texts, kwargs, with_confidence=False)
+    assert [t for t, _ in light] == [t for t, _ in full]
+    assert [c for _, c in light] == [0.0, 0.0]
+
+
+def test_stage_timings_are_reported() -> None:
+    timings: dict = {}
+    generate_batch(CharTokenizer(), _tiny_model(), ["abc"], {"max_new_tokens": 4}, timings=timings)
+    assert set(timings) == {"tokenize", "generate", "decode"}
+    assert all(v >= 0.0 for v in timings.values())
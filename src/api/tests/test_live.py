@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import List
+
+try:
+    from src.api.live import LiveSession
+except Exception:
+    from live import LiveSession  # type: ignore
+
+
+def test_only_changed_trailing_sentence_is_translated() -> None:
+    calls: List[List[str]] = []
+
+    def translate(texts: List[str]) -> List[str]:
+        calls.append(list(texts))
+        return [t.upper() for t in texts]
+
+    session = LiveSession(translate)
+    first = session.update("Olá mundo. Tudo")
+    assert first["start"] == 0
+    assert first["translated_text"] == "OLÁ MUNDO. TUDO"
+
+    second = session.update("Olá mundo. Tudo bem?")
+    assert calls[-1] == ["Tudo bem?"]
+    assert second["start"] == 1
+    assert second["segments"] == [{"text": "TUDO BEM?", "separator": ""}]
+    assert second["translated_text"] == "OLÁ MUNDO. TUDO BEM?"
+
+    unchanged = session.update("Olá mundo. Tudo bem?")
+    assert unchanged["segments"] == [] and unchanged["translated"] == 0
+    assert len(calls) == 2
+    assert session.stats()["reused_sentences"] == 3
+
+
+def test_reset_starts_a_new_utterance() -> None:
+    session = LiveSession(lambda texts: [t[::-1] for t in texts])
+    session.update("abc")
+    session.reset()
+    assert session.update("abc")["start"] == 0
+
+
+def test_aupdate_awaits_an_async_translator() -> None:
+    import asyncio
+
+    async def translate(texts: List[str]) -> List[str]:
+        return [t.upper() for t in texts]
+
+    session = LiveSession(translate)
+    asyncio.run(session.aupdate("Olá. Tudo"))
+    diff = asyncio.run(session.aupdate("Olá. Tudo bem?"))
+    assert diff["start"] == 1 and diff["translated"] == 1
+    assert diff["translated_text"] == "OLÁ. TUDO BEM?"
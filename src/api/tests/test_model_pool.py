@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Any, List, Tuple
+
+try:
+    from src.api.model_pool import ModelPool
+except Exception:
+    from model_pool import ModelPool  # type: ignore
+
+
+def _pool(max_bytes: int = 0) -> Tuple[ModelPool, List[str]]:
+    loads: List[str] = []
+
+    def loader(model_id: str) -> Tuple[Any, Any]:
+        loads.append(model_id)
+        return f"tok:{model_id}", f"model:{model_id}"
+
+    pool = ModelPool(
+        loader,
+        max_bytes=max_bytes,
+        sizer=lambda model: 100,
+    )
+    return pool, loads
+
+
+def test_loads_once_and_reuses() -> None:
+    pool, loads = _pool()
+    assert pool.get("a") == ("tok:a", "model:a")
+    assert pool.get("a") == ("tok:a", "model:a")
+    assert loads == ["a"]
+    assert pool.stats()["load_counts"] == {"a": 1}
+
+
+def test_evicts_least_recently_used_over_budget() -> None:
+    pool, loads = _pool(max_bytes=200)
+    pool.get("a")
+    pool.get("b")
+    pool.get("a")
+    pool.get("c")
+    assert pool.loaded() == ["a", "c"]
+    stats = pool.stats()
+    assert stats["evictions"] == 1
+    assert stats["eviction_counts"] == {"b": 1}
+    assert stats["resident_bytes"] == 200
+
+
+def test_never_evicts_in_flight_models() -> None:
+    pool, _ = _pool(max_bytes=100)
+    with pool.acquire("a"):
+        with pool.acquire("b"):
+            # Both are pinned, so the budget is exceeded until one is released.
+            assert pool.loaded() == ["a", "b"]
+        assert pool.loaded() == ["a"]
+    assert pool.loaded() == ["a"]
+
+
+def test_rss_budget_evicts() -> None:
+    holder: List[ModelPool] = []
+    pool = ModelPool(
+        lambda model_id: (None, model_id),
+        max_rss_bytes=1_000,
+        sizer=lambda model: 100,
+        rss_probe=lambda: 850 + holder[0]._resident_bytes if holder else 0,
+    )
+    holder.append(pool)
+    pool.get("a")
+    pool.get("b")
+    assert pool.loaded() == ["b"]
+    assert pool.stats()["eviction_counts"] == {"a": 1}
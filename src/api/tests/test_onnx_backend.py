@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+try:
+    from src.api.onnx_backend import has_onnx_export, load_onnx_model, onnx_export_dir, onnx_model_nbytes
+except Exception:
+    from onnx_backend import has_onnx_export, load_onnx_model, onnx_export_dir, onnx_model_nbytes  # type: ignore
+
+
+def test_export_dir_is_flat_per_model(tmp_path: Path) -> None:
+    path = onnx_export_dir(str(tmp_path), "Helsinki-NLP/opus-mt-pt-en")
+    assert path == tmp_path / "Helsinki-NLP--opus-mt-pt-en"
+
+
+def test_has_export_requires_config_and_encoder(tmp_path: Path) -> None:
+    model_id = "org/model"
+    path = onnx_export_dir(str(tmp_path), model_id)
+    path.mkdir(parents=True)
+    (path / "config.json").write_text("{}")
+    assert not has_onnx_export(str(tmp_path), model_id)
+
+    (path / "encoder_model.onnx").write_bytes(b"x" * 10)
+    (path / "decoder_model_merged.onnx").write_bytes(b"x" * 32)
+    assert has_onnx_export(str(tmp_path), model_id)
+
+    class _Exported:
+        model_save_dir = path
+
+    assert onnx_model_nbytes(_Exported()) == 42
+    assert onnx_model_nbytes(object()) == 0
+
+
+def test_load_without_export_points_to_the_export_script(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError, match="export_onnx"):
+        load_onnx_model("org/missing", str(tmp_path))
+
+
+def test_exported_model_generates_like_torch(tmp_path: Path) -> None:
+    pytest.importorskip("optimum.onnxruntime")
+    from tokenizers import Tokenizer, models, pre_tokenizers, processors
+    from transformers import PreTrainedTokenizerFast
+
+    try:
+        from src.api.inference import generate_batch
+        from src.api.onnx_backend import export_onnx_model
+        from src.api.tests.test_workers import _tiny_model
+    except Exception:
+        from inference import generate_batch  # type: ignore
+        from onnx_backend import export_onnx_model  # type: ignore
+        from tests.test_workers import _tiny_model  # type: ignore
+
+    vocab = {"<pad>": 0, "</s>": 1, "<unk>": 2, **{chr(ord("a") + i): 3 + i for i in range(26)}}
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    backend.post_processor = processors.TemplateProcessing(single="$A </s>", special_tokens=[("</s>", 1)])
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend,
+        pad_token="<pad>",
+        eos_token="</s>",
+        unk_token="<unk>",
+        model_input_names=["input_ids", "attention_mask"],
+    )
+    model = _tiny_model()
+    model_dir = tmp_path / "tiny"
+    model.save_pretrained(model_dir)
+    tokenizer.save_pretrained(model_dir)
+
+    cache_dir = str(tmp_path / "onnx")
+    model_id = str(model_dir)
+    export_onnx_model(model_id, cache_dir)
+    assert has_onnx_export(cache_dir, model_id)
+
+    ort_tokenizer, ort_model = load_onnx_model(model_id, cache_dir, threads=1)
+    texts, kwargs = ["a b c", "h e l l o"], {"max_new_tokens": 8}
+    assert generate_batch(ort_tokenizer, ort_model, texts, kwargs) == generate_batch(tokenizer, model, texts, kwargs)
+    assert onnx_model_nbytes(ort_model) > 0
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import torch
+
+try:
+    from src.api.inference import generate_batch
+    from src.api.model_pool import model_nbytes
+    from src.api.quantization import quantize_dynamic_int8
+    from src.api.tests.test_workers import CharTokenizer, _tiny_model
+except Exception:
+    from inference import generate_batch  # type: ignore
+    from model_pool import model_nbytes  # type: ignore
+    from quantization import quantize_dynamic_int8  # type: ignore
+    from tests.test_workers import CharTokenizer, _tiny_model  # type: ignore
+
+
+def test_int8_model_is_smaller_and_still_generates() -> None:
+    model = _tiny_model()
+    fp32_bytes = model_nbytes(model)
+    quantized = quantize_dynamic_int8(model)
+
+    assert not any(isinstance(m, torch.nn.Linear) and type(m) is torch.nn.Linear for m in quantized.modules())
+    assert 0 < model_nbytes(quantized) < fp32_bytes
+
+    out = generate_batch(CharTokenizer(), quantized, ["abc", "hello"], {"max_new_tokens": 4})
+    assert len(out) == 2
+    assert all(isinstance(text, str) and 0.0 <= conf <= 1.0 for text, conf in out)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import pytest
+
+try:
+    from src.api.routing import Router
+except Exception:
+    from routing import Router  # type: ignore
+
+EDGES = {
+    ("pt", "en"): "pt-en",
+    ("en", "pt"): "en-pt",
+    ("en", "es"): "en-es",
+    ("es", "en"): "es-en",
+    ("en", "fr"): "en-fr",
+    ("pt", "es"): "pt-es",
+    ("es", "fr"): "es-fr",
+}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_prefers_direct_model_and_pivots_otherwise() -> None:
+    router = Router(EDGES)
+    assert router.route("pt", "es") == [("pt", "es")]
+    assert router.route("es", "pt") == [("es", "en"), ("en", "pt")]
+    with pytest.raises(ValueError, match="pair_not_supported"):
+        router.route("fr", "pt")
+
+
+def test_ties_pivot_through_english() -> None:
+    # pt->fr is two hops either via en or via es; equal costs prefer English.
+    router = Router(EDGES)
+    assert router.route("pt", "fr") == [("pt", "en"), ("en", "fr")]
+
+
+def test_max_hops_limits_routes() -> None:
+    router = Router(EDGES, max_hops=1)
+    assert ("es", "pt") not in router.table()
+    assert len(router.table()) == len(EDGES)
+
+
+def test_measured_latency_reroutes_after_rebuild_interval() -> None:
+    clock = FakeClock()
+    router = Router(EDGES, hop_penalty_ms=10.0, alpha=1.0, rebuild_interval_s=30.0, clock=clock)
+    router.observe("pt-en", 100.0)
+    router.observe("en-es", 100.0)
+    router.observe("pt-es", 500.0)
+    # Observed, but the table is only rebuilt once the interval has passed.
+    assert router.route("pt", "es") == [("pt", "es")]
+
+    clock.now = 31.0
+    router.observe("pt-es", 500.0)
+    assert router.route("pt", "es") == [("pt", "en"), ("en", "es")]
+    assert router.stats()["edge_cost_ms"]["pt-es"] == 500.0
+
+
+def test_observations_are_smoothed() -> None:
+    router = Router(EDGES, alpha=0.5, rebuild_interval_s=0.0)
+    for ms in (100.0, 300.0):
+        router.observe("pt-en", ms)
+    assert router.stats()["edge_cost_ms"]["pt-en"] == 200.0
+
+
+def test_disabled_model_is_routed_around() -> None:
+    router = Router(EDGES)
+    router.disable_model("pt-es")
+    assert router.route("pt", "es") == [("pt", "en"), ("en", "es")]
+    assert router.stats()["disabled_models"] == ["pt-es"]
+
+    router.disable_model("pt-en")
+    with pytest.raises(ValueError):
+        router.route("pt", "fr")
+
+    router = Router(EDGES)
+    router.disable_model("en-fr")
+    assert router.route("pt", "fr") == [("pt", "es"), ("es", "fr")]
+
+
+def test_unmeasured_edges_do_not_displace_the_english_pivot() -> None:
+    edges = {
+        ("es", "en"): "es-en",
+        ("en", "fr"): "en-fr",
+        ("de", "en"): "de-en",
+        ("en", "it"): "en-it",
+        ("es", "pt"): "es-pt",
+        ("pt", "fr"): "pt-fr",
+        ("de", "pt"): "de-pt",
+        ("pt", "it"): "pt-it",
+    }
+    router = Router(edges, alpha=1.0, rebuild_interval_s=0.0)
+    for model_id in ("es-en", "en-fr", "de-en", "en-it"):
+        router.observe(model_id, 180.0)
+    assert router.route("es", "fr") == [("es", "en"), ("en", "fr")]
+    assert router.route("de", "it") == [("de", "en"), ("en", "it")]
+
+    # A cheaper-looking Portuguese pivot is only taken once all of its edges are measured.
+    router.observe("es-pt", 40.0)
+    assert router.route("es", "fr") == [("es", "en"), ("en", "fr")]
+    router.observe("pt-fr", 40.0)
+    assert router.route("es", "fr") == [("es", "pt"), ("pt", "fr")]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+
+try:
+    from src.api.segmentation import split_sentences
+except Exception:
+    from segmentation import split_sentences  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "  Olá, Sr. Silva. Tudo bem?  Sim!\n\nNovo parágrafo... fim",
+        "你好。我很好！谢谢",
+        '"Quoted." Next one.',
+        "Version 3.5 is out.\n",
+        "",
+    ],
+)
+def test_segments_round_trip(text: str) -> None:
+    assert "".join(s + sep for s, sep in split_sentences(text)) == text
+
+
+def test_splits_on_terminators_and_line_breaks() -> None:
+    segments = split_sentences("Olá, Sr. Silva. Tudo bem?  Sim!\n\nNovo parágrafo")
+    assert segments == [
+        ("Olá, Sr. Silva.", " "),
+        ("Tudo bem?", "  "),
+        ("Sim!", "\n\n"),
+        ("Novo parágrafo", ""),
+    ]
+    assert [s for s, _ in split_sentences("你好。我很好！谢谢")] == ["你好。", "我很好！", "谢谢"]
+
+
+def test_long_sentences_are_split_at_spaces() -> None:
+    segments = split_sentences("um dois três quatro cinco seis", max_chars=10)
+    assert all(len(s) <= 10 for s, _ in segments)
+    assert "".join(s + sep for s, sep in segments) == "um dois três quatro cinco seis"
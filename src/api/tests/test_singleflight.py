@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Event
+from typing import Any, List, Tuple
+
+import pytest
+
+try:
+    from src.api.model_pool import ModelPool
+    from src.api.singleflight import SingleFlight
+except Exception:
+    from model_pool import ModelPool  # type: ignore
+    from singleflight import SingleFlight  # type: ignore
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    sf = SingleFlight()
+    started = Event()
+    release = Event()
+    calls: List[int] = []
+
+    def work() -> str:
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "done"
+
+    with ThreadPoolExecutor(4) as ex:
+        leader = ex.submit(sf.do, "k", work)
+        started.wait(5)
+        followers = [ex.submit(sf.do, "k", work) for _ in range(3)]
+        while sf.stats()["coalesced"] < 3:
+            time.sleep(0.001)
+        release.set()
+        assert leader.result(timeout=5) == "done"
+        assert [f.result(timeout=5) for f in followers] == ["done"] * 3
+    assert calls == [1]
+    assert sf.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 3}
+
+
+def test_model_loads_are_single_flight_per_model() -> None:
+    release = Event()
+    loads: List[str] = []
+
+    def loader(model_id: str) -> Tuple[Any, Any]:
+        loads.append(model_id)
+        if model_id == "slow":
+            release.wait(5)
+        return None, model_id
+
+    pool = ModelPool(loader, sizer=lambda model: 1)
+    with ThreadPoolExecutor(4) as ex:
+        slow = [ex.submit(pool.get, "slow") for _ in range(3)]
+        # A different model is not blocked by the cold load of "slow".
+        assert ex.submit(pool.get, "fast").result(timeout=5) == (None, "fast")
+        release.set()
+        assert all(f.result(timeout=5) == (None, "slow") for f in slow)
+    assert sorted(loads) == ["fast", "slow"]
+
+
+def test_share_returns_one_future_per_key() -> None:
+    sf = SingleFlight()
+    calls: List[int] = []
+    inner: Future = Future()
+
+    def start() -> Future:
+        calls.append(1)
+        return inner
+
+    first = sf.share("k", start)
+    second = sf.share("k", start)
+    assert second is first and calls == [1]
+    assert sf.in_flight() == ["k"]
+
+    inner.set_result("done")
+    assert first.result(timeout=5) == "done"
+    assert sf.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 1}
+
+    def fail() -> Future:
+        raise RuntimeError("queue full")
+
+    with pytest.raises(RuntimeError):
+        sf.share("k", fail)
+    assert sf.in_flight() == []
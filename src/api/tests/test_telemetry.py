@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+try:
+    from src.api.telemetry import Telemetry
+except Exception:
+    from telemetry import Telemetry  # type: ignore
+
+
+def test_stage_and_batch_histograms() -> None:
+    t = Telemetry(["pt", "en"])
+    t.observe_generate("m", 3, {"tokenize": 0.002, "generate": 0.2, "decode": 0.004, "other": 1.0})
+    t.observe_batch("m", 3, [1.0, 2.0, 30.0])
+
+    assert t.sample("nt_model_inputs_total", {"model": "m"}) == 3
+    assert t.sample("nt_stage_seconds_count", {"stage": "generate", "model": "m"}) == 1
+    assert t.sample("nt_stage_seconds_count", {"stage": "queue_wait", "model": "m"}) == 3
+    assert t.sample("nt_stage_seconds_count", {"stage": "other", "model": "m"}) is None
+    assert t.sample("nt_batch_size_bucket", {"model": "m", "le": "2.0"}) == 0
+    assert t.sample("nt_batch_size_bucket", {"model": "m", "le": "4.0"}) == 1
+
+
+def test_unknown_languages_share_one_label() -> None:
+    t = Telemetry(["pt", "en"])
+    t.observe_request("translate", "pt", "en", 0.05)
+    t.observe_request("translate", "zz", "yy", 0.0, "unsupported")
+    t.observe_request("translate", "qq", "en", 0.0, "unsupported")
+
+    assert t.sample("nt_translation_request_seconds_count", {"source": "pt", "target": "en"}) == 1
+    labels = {"endpoint": "translate", "source": "other", "target": "other", "status": "unsupported"}
+    assert t.sample("nt_translation_requests_total", labels) == 1
+    # Failed requests are counted but stay out of the latency histogram.
+    assert t.sample("nt_translation_request_seconds_count", {"source": "other", "target": "en"}) is None
+
+
+def test_scrape_reads_component_stats() -> None:
+    t = Telemetry(
+        cache_stats=lambda: {"hits": 7, "misses": 2, "entries": 5, "bytes": 1024},
+        pool_stats=lambda: {
+            "resident": [{"model_id": "m", "bytes": 4096}],
+            "load_counts": {"m": 1},
+            "eviction_counts": {},
+        },
+        rss_bytes=lambda: 123456,
+        fuzzy_stats=lambda: {"template_hits": 3, "fuzzy_hits": 1, "misses": 4},
+    )
+    t.observe_model_load("m", 1.5)
+
+    assert t.sample("nt_cache_lookups_total", {"result": "hit"}) == 7
+    assert t.sample("nt_cache_template_lookups_total", {"result": "template_hit"}) == 3
+    assert t.sample("nt_cache_template_lookups_total", {"result": "miss"}) == 4
+    assert t.sample("nt_model_resident_bytes", {"model": "m"}) == 4096
+    assert t.sample("nt_model_loads_total", {"model": "m"}) == 1
+    assert t.sample("nt_model_load_seconds_sum", {"model": "m"}) == 1.5
+    assert t.sample("nt_process_resident_bytes") == 123456
+    body, content_type = t.render()
+    assert b"nt_cache_entries 5.0" in body
+    assert content_type.startswith("text/plain")
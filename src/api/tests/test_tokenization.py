@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Any, List
+
+import torch
+
+try:
+    from src.api.inference import generate_batch
+    from src.api.tests.test_workers import CharTokenizer, _tiny_model
+    from src.api.tokenization import EncodingCache, pad_batch
+except Exception:
+    from inference import generate_batch  # type: ignore
+    from tests.test_workers import CharTokenizer, _tiny_model  # type: ignore
+    from tokenization import EncodingCache, pad_batch  # type: ignore
+
+
+class CountingTokenizer(CharTokenizer):
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def __call__(self, texts: List[str], return_tensors: Any = None, **kwargs: Any) -> Any:
+        self.calls.append(list(texts))
+        return super().__call__(texts, return_tensors=return_tensors, **kwargs)
+
+
+def test_encodes_only_misses_in_one_call() -> None:
+    tokenizer, cache = CountingTokenizer(), EncodingCache(16)
+    cache.encode("m", tokenizer, ["ab", "abc"])
+    batch = cache.encode("m", tokenizer, ["abc", "xyz", "xyz", "ab"])
+
+    assert tokenizer.calls == [["ab", "abc"], ["xyz"]]
+    assert batch["input_ids"].shape == (4, 4)
+    assert batch["attention_mask"].tolist()[3] == [1, 1, 1, 0]
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 3
+
+
+def test_matches_tokenizer_padding_and_generation() -> None:
+    tokenizer, model = CharTokenizer(), _tiny_model()
+    texts = ["abc", "hello"]
+    direct = tokenizer(texts, return_tensors="pt", padding=True)
+    cached = EncodingCache().encode("m", tokenizer, texts)
+    assert torch.equal(direct["input_ids"], cached["input_ids"])
+    assert torch.equal(direct["attention_mask"], cached["attention_mask"])
+
+    kwargs = {"max_new_tokens": 8}
+    cache = EncodingCache()
+    assert generate_batch(tokenizer, model, texts, kwargs, encode=cache.encoder("m", tokenizer)) == generate_batch(
+        tokenizer, model, texts, kwargs
+    )
+
+
+def test_lru_bound_and_models_are_separate() -> None:
+    tokenizer, cache = CountingTokenizer(), EncodingCache(2)
+    cache.token_ids("a", tokenizer, ["x"])
+    cache.token_ids("b", tokenizer, ["x"])
+    cache.token_ids("a", tokenizer, ["y"])
+    assert len(cache) == 2
+    assert tokenizer.calls == [["x"], ["x"], ["y"]]
+    cache.token_ids("a", tokenizer, ["x"])
+    assert tokenizer.calls[-1] == ["x"]
+    assert cache.token_counts("a", tokenizer, ["y", "hello"]) == [2, 6]
+
+
+def test_left_padding() -> None:
+    tokenizer = CharTokenizer()
+    tokenizer.padding_side = "left"  # type: ignore[attr-defined]
+    batch = pad_batch(tokenizer, [[5, 1], [7]])
+    assert batch["input_ids"].tolist() == [[5, 1], [0, 7]]
+    assert batch["attention_mask"].tolist() == [[1, 1], [0, 1]]
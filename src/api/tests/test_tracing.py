@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import logging
+
+try:
+    from src.api.tracing import JsonLogExporter, Trace, Tracer, add_span, current_trace, span
+except Exception:
+    from tracing import JsonLogExporter, Trace, Tracer, add_span, current_trace, span  # type: ignore
+
+
+def test_spans_are_recorded_only_inside_a_trace() -> None:
+    with span("orphan"):
+        pass
+    add_span("orphan", 1.0)
+    assert current_trace() is None
+
+    tracer = Tracer()
+    with tracer.start("req") as trace:
+        with span("route"):
+            pass
+        add_span("generate", 0.25)
+        add_span("generate", 0.25)
+    assert current_trace() is None
+    assert [s.name for s in trace.spans] == ["route", "generate", "generate"]
+
+
+def test_server_timing_sums_spans_per_name() -> None:
+    trace = Trace("req")
+    trace.add("generate", 0.010)
+    trace.add("generate", 0.005)
+    trace.add("hop 1", 0.020, desc='pt-"en"')
+    header = trace.server_timing()
+    parts = header.split(", ")
+    assert parts[0] == "generate;dur=15.0"
+    assert parts[1] == "hop_1;dur=20.0;desc=\"pt-'en'\""
+    assert parts[-1].startswith("total;dur=")
+
+
+def test_failing_exporter_does_not_break_the_others(caplog) -> None:
+    class Broken:
+        def export(self, trace: Trace) -> None:
+            raise RuntimeError("down")
+
+    tracer = Tracer([Broken(), JsonLogExporter(logging.getLogger("test.trace"))])
+    with tracer.start("req", trace_id="abc") as trace:
+        add_span("tokenize", 0.001)
+    with caplog.at_level(logging.INFO, logger="test.trace"):
+        tracer.finish(trace)
+    record = json.loads([r.getMessage() for r in caplog.records if r.name == "test.trace"][0])
+    assert record["trace_id"] == "abc"
+    assert record["spans"][0]["name"] == "tokenize"
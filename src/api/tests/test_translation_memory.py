@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Thread
+
+try:
+    from src.api.cache import TranslationCache
+    from src.api.translation_memory import TranslationMemory
+except Exception:
+    from cache import TranslationCache  # type: ignore
+    from translation_memory import TranslationMemory  # type: ignore
+
+
+def test_entries_survive_reopen(tmp_path: Path) -> None:
+    path = tmp_path / "tm.sqlite3"
+    key = TranslationCache.make_key("m", "olá mundo", {"confidence": True})
+    tm = TranslationMemory(path)
+    tm.put(key, ("hello world", 0.9))
+    tm.close()
+
+    reopened = TranslationMemory(path)
+    try:
+        assert reopened.get(key) == ("hello world", 0.9)
+        assert reopened.get(TranslationCache.make_key("m", "olá mundo")) is None
+        assert len(reopened) == 1
+        stats = reopened.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+    finally:
+        reopened.close()
+
+
+def test_cache_reads_through_and_writes_behind(tmp_path: Path) -> None:
+    tm = TranslationMemory(tmp_path / "tm.sqlite3")
+    try:
+        first = TranslationCache(store=tm)
+        key = TranslationCache.make_key("m", "bom dia")
+        first.put(key, "good morning")
+        assert tm.flush(timeout=5)
+
+        # A fresh cache (another worker, or a restart) finds the entry on disk and keeps it in memory.
+        second = TranslationCache(store=tm)
+        assert second.get(key) == "good morning"
+        assert second.get(key) == "good morning"
+        stats = second.stats()
+        assert stats["hits"] == 2
+        assert stats["store_hits"] == 1
+        assert stats["store"]["hits"] == 1
+        assert second.get(TranslationCache.make_key("m", "boa noite")) is None
+        assert second.stats()["misses"] == 1
+    finally:
+        tm.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    now = [1000.0]
+    tm = TranslationMemory(tmp_path / "tm.sqlite3", max_entries=10, clock=lambda: now[0])
+    try:
+        keys = [TranslationCache.make_key("m", f"text {i}") for i in range(10)]
+        for i, key in enumerate(keys):
+            now[0] += 1
+            tm.put(key, f"t{i}")
+        assert tm.flush(timeout=5)
+        now[0] += 1
+        assert tm.get(keys[0]) == "t0"  # touched: no longer the oldest
+        assert tm.flush(timeout=5)
+
+        now[0] += 1
+        tm.put(TranslationCache.make_key("m", "text 10"), "t10")
+        assert tm.flush(timeout=5)
+        assert len(tm) == 9
+        assert tm.stats()["evictions"] == 2
+        assert tm.get(keys[0]) == "t0"
+        assert tm.get(keys[1]) is None
+        assert tm.get(keys[2]) is None
+        assert tm.get(keys[3]) == "t3"
+    finally:
+        tm.close()
+
+
+def test_ttl_expires_entries(tmp_path: Path) -> None:
+    now = [0.0]
+    tm = TranslationMemory(tmp_path / "tm.sqlite3", ttl_s=10, clock=lambda: now[0])
+    try:
+        key = TranslationCache.make_key("m", "x")
+        tm.put(key, "y")
+        assert tm.flush(timeout=5)
+        now[0] = 5
+        assert tm.get(key) == "y"
+        now[0] = 11
+        assert tm.get(key) is None
+    finally:
+        tm.close()
+
+
+def test_concurrent_writers_share_one_file(tmp_path: Path) -> None:
+    path = tmp_path / "tm.sqlite3"
+    writers = [TranslationMemory(path, flush_interval_s=0.01) for _ in range(3)]
+
+    def write(tm: TranslationMemory, n: int) -> None:
+        for i in range(200):
+            tm.put(TranslationCache.make_key("m", f"{n}-{i}"), f"v{n}-{i}")
+        tm.flush(timeout=10)
+
+    threads = [Thread(target=write, args=(tm, n)) for n, tm in enumerate(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    try:
+        assert len(writers[0]) == 600
+        assert writers[2].get(TranslationCache.make_key("m", "0-199")) == "v0-199"
+        assert all(tm.stats()["errors"] == 0 for tm in writers)
+    finally:
+        for tm in writers:
+            tm.close()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Any, List, Tuple
+
+try:
+    from src.api.warmup import Warmup, parse_pairs
+except Exception:
+    from warmup import Warmup, parse_pairs  # type: ignore
+
+
+def test_parse_pairs_skips_invalid_items() -> None:
+    assert parse_pairs(" pt-en, EN-PT ;bogus,, es-") == [("pt", "en"), ("en", "pt")]
+
+
+def test_warmup_loads_each_model_once_and_reports() -> None:
+    loads: List[str] = []
+    generates: List[Tuple[str, int]] = []
+
+    def resolve(src: str, tgt: str) -> List[str]:
+        if src == "xx":
+            raise ValueError("pair_not_supported")
+        return [f"{src}-en", f"en-{tgt}"] if "en" not in (src, tgt) else [f"{src}-{tgt}"]
+
+    def generate(model_id: str, texts: List[str]) -> Any:
+        generates.append((model_id, len(texts)))
+        return [("", 0.0)] * len(texts)
+
+    warmup = Warmup(resolve, loads.append, generate, batch_size=4)
+    assert not warmup.ready
+    warmup.run([("pt", "es"), ("pt", "en"), ("es", "fr"), ("xx", "en")])
+
+    assert warmup.ready
+    assert loads == ["pt-en", "en-es", "es-en", "en-fr"]
+    assert generates[:2] == [("pt-en", 1), ("pt-en", 4)]
+    report = warmup.report()
+    assert report["models"]["en-fr"]["status"] == "ok"
+    assert "warmup_ms" in report["models"]["pt-en"]
+    assert report["errors"] == ["xx-en: pair_not_supported"]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import torch
+from transformers import MarianConfig, MarianMTModel
+
+try:
+    from src.api.inference import generate_batch
+    from src.api.workers import ProcessWorkerPool
+except Exception:
+    from inference import generate_batch  # type: ignore
+    from workers import ProcessWorkerPool  # type: ignore
+
+
+class CharTokenizer:
+    pad_token_id = 0
+    eos_token_id = 1
+
+    def __call__(self, texts: List[str], return_tensors: Any = None, **_: Any) -> Dict[str, Any]:
+        ids = [[2 + ord(c) % 30 for c in t] + [1] for t in texts]
+        if return_tensors is None:
+            return {"input_ids": ids}
+        width = max(len(i) for i in ids)
+        return {
+            "input_ids": torch.tensor([i + [0] * (width - len(i)) for i in ids]),
+            "attention_mask": torch.tensor([[1] * len(i) + [0] * (width - len(i)) for i in ids]),
+        }
+
+    def batch_decode(self, sequences: Any, skip_special_tokens: bool = True) -> List[str]:
+        return [" ".join(str(int(x)) for x in seq if int(x) > 1) for seq in sequences]
+
+
+def _tiny_model() -> MarianMTModel:
+    torch.manual_seed(0)
+    config = MarianConfig(
+        vocab_size=32,
+        d_model=8,
+        encoder_layers=1,
+        decoder_layers=1,
+        encoder_attention_heads=2,
+        decoder_attention_heads=2,
+        encoder_ffn_dim=16,
+        decoder_ffn_dim=16,
+        max_position_embeddings=64,
+        pad_token_id=0,
+        eos_token_id=1,
+        decoder_start_token_id=0,
+    )
+    return MarianMTModel(config).eval()
+
+
+def test_process_pool_matches_in_process_generation() -> None:
+    tokenizer, model = CharTokenizer(), _tiny_model()
+    model.share_memory()
+    kwargs = {"max_new_tokens": 8}
+    expected = generate_batch(tokenizer, model, ["abc", "hello"], kwargs)
+
+    pool = ProcessWorkerPool(1)
+    try:
+        assert pool.generate("tiny", tokenizer, model, ["abc", "hello"], kwargs) == expected
+        assert pool.generate("tiny", tokenizer, model, ["abc"], kwargs) == expected[:1]
+        stats = pool.stats()
+        assert stats["workers"][0]["models"] == ["tiny"]
+        assert stats["workers"][0]["completed"] == 2
+        pool.drop("tiny")
+        assert pool.stats()["workers"][0]["models"] == []
+    finally:
+        pool.close()
+
+
+def test_warm_loads_and_runs_the_model_on_every_worker() -> None:
+    tokenizer, model = CharTokenizer(), _tiny_model()
+    model.share_memory()
+    kwargs = {"max_new_tokens": 8}
+
+    pool = ProcessWorkerPool(2)
+    try:
+        pool.warm("tiny", tokenizer, model, ["abc"], kwargs)
+        workers = pool.stats()["workers"]
+        assert [w["models"] for w in workers] == [["tiny"], ["tiny"]]
+        assert [w["completed"] for w in workers] == [1, 1]
+        # Live traffic now finds the model on whichever worker it lands on.
+        assert pool.generate("tiny", tokenizer, model, ["abc"], kwargs) == generate_batch(
+            tokenizer, model, ["abc"], kwargs
+        )
+    finally:
+        pool.close()
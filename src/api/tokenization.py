@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, List, Tuple
+
+import torch
+
+Encoder = Callable[[List[str]], Dict[str, Any]]
+
+
+def pad_batch(tokenizer: Any, ids: List[List[int]]) -> Dict[str, torch.Tensor]:
+    """Pads token ids into ``input_ids``/``attention_mask`` tensors on the tokenizer's padding side."""
+    pad_id = getattr(tokenizer, "pad_token_id", None) or 0
+    left = getattr(tokenizer, "padding_side", "right") == "left"
+    width = max((len(row) for row in ids), default=0)
+    input_ids, attention_mask = [], []
+    for row in ids:
+        fill = width - len(row)
+        input_ids.append([pad_id] * fill + row if left else row + [pad_id] * fill)
+        attention_mask.append([0] * fill + [1] * len(row) if left else [1] * len(row) + [0] * fill)
+    return {
+        "input_ids": torch.tensor(input_ids, dtype=torch.long),
+        "attention_mask": torch.tensor(attention_mask, dtype=torch.long),
+    }
+
+
+class EncodingCache:
+    """LRU of the token ids of recently encoded inputs, keyed by model and text.
+
+    Retries, repeated phrases and pivot intermediates skip the tokenizer; the misses of a
+    batch are encoded together in a single tokenizer call. Token counts of cached inputs
+    are available without encoding again through :meth:`token_counts`.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max(1, max_entries)
+        self._data: OrderedDict[Tuple[str, str], List[int]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def token_ids(self, model_id: str, tokenizer: Any, texts: List[str]) -> List[List[int]]:
+        found: Dict[str, List[int]] = {}
+        with self._lock:
+            for text in texts:
+                ids = self._data.get((model_id, text))
+                if ids is not None:
+                    self._data.move_to_end((model_id, text))
+                    found[text] = ids
+            missing = [t for t in dict.fromkeys(texts) if t not in found]
+            # Repeats of a missing text within the batch are encoded once and count as hits.
+            self.misses += len(missing)
+            self.hits += len(texts) - len(missing)
+
+        if missing:
+            encoded = tokenizer(missing, truncation=True)["input_ids"]
+            fresh = {text: list(ids) for text, ids in zip(missing, encoded)}
+            found.update(fresh)
+            with self._lock:
+                for text, ids in fresh.items():
+                    self._data[(model_id, text)] = ids
+                    self._data.move_to_end((model_id, text))
+                while len(self._data) > self.max_entries:
+                    self._data.popitem(last=False)
+        return [found[text] for text in texts]
+
+    def encode(self, model_id: str, tokenizer: Any, texts: List[str]) -> Dict[str, torch.Tensor]:
+        return pad_batch(tokenizer, self.token_ids(model_id, tokenizer, texts))
+
+    def encoder(self, model_id: str, tokenizer: Any) -> Encoder:
+        return lambda texts: self.encode(model_id, tokenizer, texts)
+
+    def token_counts(self, model_id: str, tokenizer: Any, texts: List[str]) -> List[int]:
+        return [len(ids) for ids in self.token_ids(model_id, tokenizer, texts)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, MutableMapping, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+@dataclass
+class Span:
+    name: str
+    start: float
+    duration_s: float
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+class Trace:
+    """Spans recorded while serving one request.
+
+    Spans may be added from any thread that runs work for the request; durations measured
+    elsewhere (e.g. by a shared micro-batch) are added with :meth:`add`.
+    """
+
+    def __init__(self, name: str, trace_id: Optional[str] = None) -> None:
+        self.name = name
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.spans: List[Span] = []
+        self.attrs: Dict[str, Any] = {}
+        self._lock = Lock()
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, start=start, **attrs)
+
+    def add(self, name: str, duration_s: float, start: Optional[float] = None, **attrs: Any) -> None:
+        span = Span(name, start if start is not None else time.perf_counter() - duration_s, max(0.0, duration_s), attrs)
+        with self._lock:
+            self.spans.append(span)
+
+    def elapsed_s(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` value: spans summed per name, in order of first appearance, plus ``total``."""
+        with self._lock:
+            spans = list(self.spans)
+        totals: Dict[str, float] = {}
+        descs: Dict[str, str] = {}
+        for span in spans:
+            name = _TOKEN.sub("_", span.name)
+            totals[name] = totals.get(name, 0.0) + span.duration_s
+            if "desc" in span.attrs:
+                descs.setdefault(name, str(span.attrs["desc"]).replace('"', "'"))
+        parts = []
+        for name, seconds in totals.items():
+            part = f"{name};dur={seconds * 1000:.1f}"
+            if name in descs:
+                part += f';desc="{descs[name]}"'
+            parts.append(part)
+        parts.append(f"total;dur={self.elapsed_s() * 1000:.1f}")
+        return ", ".join(parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": round(self.started_at, 3),
+            "duration_ms": round(self.elapsed_s() * 1000, 3),
+            **self.attrs,
+            "spans": [
+                {
+                    "name": s.name,
+                    "offset_ms": round((s.start - self.started) * 1000, 3),
+                    "duration_ms": round(s.duration_s * 1000, 3),
+                    **s.attrs,
+                }
+                for s in spans
+            ],
+        }
+
+
+class TraceExporter(Protocol):
+    def export(self, trace: Trace) -> None: ...
+
+
+class JsonLogExporter:
+    """Logs every finished trace as one JSON line."""
+
+    def __init__(self, log: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        self._log = log or logging.getLogger("neurotranslator.trace")
+        self._level = level
+
+    def export(self, trace: Trace) -> None:
+        self._log.log(self._level, json.dumps(trace.to_dict(), ensure_ascii=False))
+
+
+_CURRENT: ContextVar[Optional[Trace]] = ContextVar("nt_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[None]:
+    """Records a span on the current request's trace; a no-op outside of a traced request."""
+    trace = _CURRENT.get()
+    if trace is None:
+        yield
+        return
+    with trace.span(name, **attrs):
+        yield
+
+
+def add_span(name: str, duration_s: float, **attrs: Any) -> None:
+    trace = _CURRENT.get()
+    if trace is not None:
+        trace.add(name, duration_s, **attrs)
+
+
+def mark_since_start(name: str) -> None:
+    """Records a span from the start of the current trace until now (e.g. request parsing)."""
+    trace = _CURRENT.get()
+    if trace is not None:
+        trace.add(name, trace.elapsed_s(), start=trace.started)
+
+
+class Tracer:
+    def __init__(self, exporters: Optional[List[TraceExporter]] = None) -> None:
+        self._exporters: List[TraceExporter] = list(exporters or [])
+
+    def add_exporter(self, exporter: TraceExporter) -> None:
+        self._exporters.append(exporter)
+
+    def remove_exporter(self, exporter: TraceExporter) -> None:
+        self._exporters.remove(exporter)
+
+    @contextmanager
+    def start(self, name: str, trace_id: Optional[str] = None) -> Iterator[Trace]:
+        trace = Trace(name, trace_id)
+        token = _CURRENT.set(trace)
+        try:
+            yield trace
+        finally:
+            _CURRENT.reset(token)
+
+    def finish(self, trace: Trace) -> None:
+        for exporter in list(self._exporters):
+            try:
+                exporter.export(trace)
+            except Exception:
+                logger.exception("Trace exporter %r failed", exporter)
+
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+ASGIApp = Callable[[Scope, Callable[[], Awaitable[Message]], Callable[[Message], Awaitable[None]]], Awaitable[None]]
+
+
+class TracingMiddleware:
+    """ASGI middleware that traces every HTTP request.
+
+    The ``Server-Timing`` header is written when the response starts, so streamed responses
+    only report the spans recorded before their first byte; exporters run once the last body
+    chunk was sent and see the complete trace. An ``X-Request-ID`` header is reused as the
+    trace id and echoed back.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer) -> None:
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(
+        self, scope: Scope, receive: Callable[[], Awaitable[Message]], send: Callable[[Message], Awaitable[None]]
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope.get("headers", []):
+            if key == b"x-request-id":
+                request_id = _TOKEN.sub("", value.decode("latin-1"))[:64] or None
+        with self.tracer.start(f"{scope.get('method', '')} {scope.get('path', '')}", request_id) as trace:
+            finished = False
+
+            async def traced_send(message: Message) -> None:
+                nonlocal finished
+                if message["type"] == "http.response.start":
+                    trace.attrs["status"] = message.get("status")
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    headers.append((b"x-request-id", trace.trace_id.encode("latin-1")))
+                    message["headers"] = headers
+                await send(message)
+                if message["type"] == "http.response.body" and not message.get("more_body", False) and not finished:
+                    finished = True
+                    self.tracer.finish(trace)
+
+            try:
+                await self.app(scope, receive, traced_send)
+            finally:
+                if not finished:
+                    self.tracer.finish(trace)
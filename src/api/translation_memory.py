@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sqlite3
+import time
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, Tuple[Tuple[str, Any], ...]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tm (
+    model_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    params TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model_id, text, params)
+);
+CREATE INDEX IF NOT EXISTS tm_last_used ON tm (last_used);
+CREATE TABLE IF NOT EXISTS tm_meta (id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL, bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO tm_meta (id, entries, bytes) SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM tm;
+CREATE TRIGGER IF NOT EXISTS tm_insert AFTER INSERT ON tm BEGIN
+    UPDATE tm_meta SET entries = entries + 1, bytes = bytes + new.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS tm_update AFTER UPDATE OF size ON tm BEGIN
+    UPDATE tm_meta SET bytes = bytes + new.size - old.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS tm_delete AFTER DELETE ON tm BEGIN
+    UPDATE tm_meta SET entries = entries - 1, bytes = bytes - old.size WHERE id = 0;
+END;
+"""
+
+_UPSERT = """
+INSERT INTO tm (model_id, text, params, value, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (model_id, text, params) DO UPDATE SET
+    value = excluded.value, size = excluded.size, created = excluded.created, last_used = excluded.last_used
+"""
+
+
+def _params(key: CacheKey) -> str:
+    return json.dumps(list(key[2]), ensure_ascii=False, separators=(",", ":"))
+
+
+def _decode(raw: str) -> Any:
+    value = json.loads(raw)
+    # Tuples (e.g. the API's ``(translation, confidence)``) come back from JSON as lists.
+    return tuple(value) if isinstance(value, list) else value
+
+
+class TranslationMemory:
+    """Persistent translation memory in a SQLite database (WAL mode), shared by the processes of one service.
+
+    Keys are :class:`~cache.TranslationCache` keys (model, normalized text, generation
+    parameters). Lookups read the database directly; writes and last-used updates are
+    queued and committed in batches by a background thread, so serving never waits on
+    the disk. Several processes may open the same file: WAL lets readers proceed while one
+    writer commits, and writers wait up to ``busy_timeout_s`` for each other. When the
+    database exceeds ``max_entries`` or ``max_bytes`` the least recently used entries are
+    deleted down to 90% of the cap. With ``ttl_s`` entries older than that are misses.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: int = 1_000_000,
+        max_bytes: int = 1024 * 1024 * 1024,
+        ttl_s: Optional[float] = None,
+        flush_interval_s: float = 0.2,
+        max_pending: int = 10_000,
+        busy_timeout_s: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = str(path)
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl_s = ttl_s if ttl_s and ttl_s > 0 else None
+        self.flush_interval_s = max(0.0, flush_interval_s)
+        self.busy_timeout_s = busy_timeout_s
+        self._clock = clock
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._writer = self._connect()
+        self._writer.executescript(_SCHEMA)
+        self._reader = self._connect()
+        self._read_lock = Lock()
+        self._lock = Lock()
+        self._pending: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.dropped = 0
+        self.evictions = 0
+        self.errors = 0
+        self._closed = False
+        self._thread = Thread(target=self._run, name="translation-memory", daemon=True)
+        self._thread.start()
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        try:
+            row = self._read(key)
+        except sqlite3.Error:
+            logger.exception("Translation memory read failed")
+            with self._lock:
+                self.errors += 1
+            return None
+        now = self._clock()
+        if row is None or (self.ttl_s is not None and now - row[1] > self.ttl_s):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        self._enqueue(("touch", key, now))
+        return _decode(row[0])
+
+    def put(self, key: CacheKey, value: Any) -> None:
+        self._enqueue(("put", key, value, self._clock()))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until everything queued so far is committed."""
+        if self._closed:
+            return True
+        done = Event()
+        self._pending.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._pending.put(None)
+        self._thread.join(timeout=10)
+        with self._read_lock:
+            self._reader.close()
+        self._writer.close()
+
+    def __len__(self) -> int:
+        return self._totals()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self._totals()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "entries": entries,
+                "bytes": size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "writes": self.writes,
+                "pending": self._pending.qsize(),
+                "dropped": self.dropped,
+                "evictions": self.evictions,
+                "errors": self.errors,
+            }
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_s, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _read(self, key: CacheKey) -> Optional[Tuple[str, float]]:
+        sql = "SELECT value, created FROM tm WHERE model_id = ? AND text = ? AND params = ?"
+        args = (key[0], key[1], _params(key))
+        with self._read_lock:
+            return self._reader.execute(sql, args).fetchone()
+
+    def _totals(self) -> Tuple[int, int]:
+        try:
+            with self._read_lock:
+                row = self._reader.execute("SELECT entries, bytes FROM tm_meta WHERE id = 0").fetchone()
+        except sqlite3.Error:
+            return 0, 0
+        return (int(row[0]), int(row[1])) if row else (0, 0)
+
+    def _enqueue(self, item: Tuple[Any, ...]) -> None:
+        try:
+            self._pending.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            item = self._pending.get()
+            batch: List[Any] = [item]
+            deadline = time.monotonic() + self.flush_interval_s
+            while item is not None and len(batch) < 1000:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or item[0] == "flush":
+                    break
+                try:
+                    item = self._pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+            self._commit([b for b in batch if b is not None and b[0] != "flush"])
+            for b in batch:
+                if b is not None and b[0] == "flush":
+                    b[1].set()
+            if batch[-1] is None:
+                return
+
+    def _commit(self, batch: List[Tuple[Any, ...]]) -> None:
+        if not batch:
+            return
+        puts = []
+        touches = []
+        for item in batch:
+            if item[0] == "put":
+                _, key, value, now = item
+                raw = json.dumps(value, ensure_ascii=False)
+                size = len(key[0].encode("utf-8")) + len(key[1].encode("utf-8")) + len(raw.encode("utf-8"))
+                if size <= self.max_bytes:
+                    puts.append((key[0], key[1], _params(key), raw, size, now, now))
+            else:
+                _, key, now = item
+                touches.append((now, key[0], key[1], _params(key)))
+        conn = self._writer
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(_UPSERT, puts)
+                conn.executemany(
+                    "UPDATE tm SET last_used = MAX(last_used, ?) WHERE model_id = ? AND text = ? AND params = ?",
+                    touches,
+                )
+                evicted = self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            logger.exception("Translation memory write of %d items failed", len(batch))
+            with self._lock:
+                self.errors += 1
+            return
+        with self._lock:
+            self.writes += len(puts)
+            self.evictions += evicted
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        entries, size = conn.execute("SELECT entries, bytes FROM tm_meta WHERE id = 0").fetchone()
+        if entries <= self.max_entries and size <= self.max_bytes:
+            return 0
+        target_entries = int(self.max_entries * 0.9)
+        target_bytes = int(self.max_bytes * 0.9)
+        evicted = 0
+        while entries > target_entries or size > target_bytes:
+            # Entries to drop to reach the target, at least a small batch when over the byte cap.
+            count = max(entries - target_entries, 64 if size > target_bytes else 0, 1)
+            evicted += conn.execute(
+                "DELETE FROM tm WHERE rowid IN (SELECT rowid FROM tm ORDER BY last_used LIMIT ?)",
+                (count,),
+            ).rowcount
+            entries, size = conn.execute("SELECT entries, bytes FROM tm_meta WHERE id = 0").fetchone()
+            if entries == 0:
+                break
+        return evicted
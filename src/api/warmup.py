@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TEXT = "This short sentence warms up the translation model."
+
+
+def parse_pairs(raw: str) -> List[Tuple[str, str]]:
+    pairs: List[Tuple[str, str]] = []
+    for item in raw.replace(";", ",").split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        src, sep, tgt = item.partition("-")
+        if not sep or not src or not tgt:
+            logger.warning("Ignoring invalid preload pair %r", item)
+            continue
+        pairs.append((src, tgt))
+    return pairs
+
+
+class Warmup:
+    """Preloads the models behind a list of pairs and runs a synthetic ``generate`` on each.
+
+    The service reports ready only after :meth:`run` finished, whether or not every model
+    warmed up successfully; failures are listed per model.
+    """
+
+    def __init__(
+        self,
+        resolve_models: Callable[[str, str], List[str]],
+        load: Callable[[str], Any],
+        generate: Callable[[str, List[str]], Any],
+        batch_size: int = 1,
+    ) -> None:
+        self._resolve_models = resolve_models
+        self._load = load
+        self._generate = generate
+        self.batch_size = max(1, batch_size)
+        self._lock = Lock()
+        self.state = "pending"
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self.errors: List[str] = []
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def run(self, pairs: Sequence[Tuple[str, str]]) -> None:
+        with self._lock:
+            self.state = "running"
+            self.started_at = time.time()
+
+        model_ids: List[str] = []
+        for src, tgt in pairs:
+            try:
+                model_ids.extend(m for m in self._resolve_models(src, tgt) if m not in model_ids)
+            except Exception as exc:
+                self._error(f"{src}-{tgt}: {exc}")
+
+        for model_id in model_ids:
+            report: Dict[str, Any] = {"status": "running"}
+            with self._lock:
+                self.models[model_id] = report
+            try:
+                started = time.perf_counter()
+                self._load(model_id)
+                report["load_ms"] = int((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                self._generate(model_id, [WARMUP_TEXT])
+                if self.batch_size > 1:
+                    self._generate(model_id, [WARMUP_TEXT] * self.batch_size)
+                report["warmup_ms"] = int((time.perf_counter() - started) * 1000)
+                report["status"] = "ok"
+                logger.info("Warm-up of %s finished in %d ms", model_id, report["load_ms"] + report["warmup_ms"])
+            except Exception as exc:
+                report["status"] = "failed"
+                self._error(f"{model_id}: {exc}")
+                logger.exception("Warm-up of %s failed", model_id)
+
+        with self._lock:
+            self.state = "ready"
+            self.finished_at = time.time()
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            duration = None
+            if self.started_at is not None and self.finished_at is not None:
+                duration = int((self.finished_at - self.started_at) * 1000)
+            return {
+                "ready": self.state == "ready",
+                "state": self.state,
+                "duration_ms": duration,
+                "models": {k: dict(v) for k, v in self.models.items()},
+                "errors": list(self.errors),
+            }
+
+    def _error(self, message: str) -> None:
+        with self._lock:
+            self.errors.append(message)
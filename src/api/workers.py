@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from functools import partial
+from threading import Lock, Thread
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+import torch
+import torch.multiprocessing as mp
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_main(
+    requests: Any,
+    results: Any,
+    torch_threads: int,
+    encoding_cache_entries: int = 0,
+    buckets: Tuple[int, ...] = (),
+    max_batch_tokens: int = 0,
+) -> None:
+    try:
+        from .inference import generate_bucketed
+        from .tokenization import EncodingCache
+    except Exception:
+        from inference import generate_bucketed  # type: ignore
+        from tokenization import EncodingCache  # type: ignore
+
+    if torch_threads > 0:
+        torch.set_num_threads(torch_threads)
+    encodings = EncodingCache(encoding_cache_entries) if encoding_cache_entries > 0 else None
+
+    models: Dict[str, Tuple[Any, Any]] = {}
+    while True:
+        msg = requests.get()
+        if msg is None:
+            return
+        kind = msg[0]
+        if kind == "load":
+            _, model_id, tokenizer, model = msg
+            models[model_id] = (tokenizer, model)
+        elif kind == "drop":
+            models.pop(msg[1], None)
+        elif kind == "generate":
+            _, task_id, model_id, prepared, generation_kwargs, with_confidence = msg
+            try:
+                tokenizer, model = models[model_id]
+                timings: Dict[str, float] = {}
+                token_ids = (
+                    partial(encodings.token_ids, model_id, tokenizer) if encodings is not None else None
+                )
+                output = generate_bucketed(
+                    tokenizer,
+                    model,
+                    prepared,
+                    generation_kwargs,
+                    with_confidence,
+                    timings=timings,
+                    token_ids=token_ids,
+                    boundaries=buckets,
+                    max_tokens=max_batch_tokens,
+                )
+                results.put((task_id, True, (output, timings)))
+            except Exception as exc:
+                results.put((task_id, False, f"{type(exc).__name__}: {exc}"))
+
+
+@dataclass
+class _Worker:
+    index: int
+    requests: Any
+    process: Any
+    loaded: Set[str] = field(default_factory=set)
+    outstanding: Set[int] = field(default_factory=set)
+    completed: int = 0
+
+
+class ProcessWorkerPool:
+    """Serves ``generate`` calls from N worker processes that share the parent's model weights.
+
+    The parent loads each model once and moves its tensors to shared memory
+    (``model.share_memory()``); the first task for a model on a worker ships the model
+    through a ``torch.multiprocessing`` queue, which passes storage handles rather than
+    copying weights. Tasks go to the worker with the fewest outstanding tasks; :meth:`warm`
+    loads and warms a model on every worker. With ``encoding_cache_entries`` > 0 every
+    worker keeps its own LRU of encoded inputs. Each task is split into length buckets
+    (``buckets``, ``max_batch_tokens``) like in-process batches.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        torch_threads: int = 0,
+        encoding_cache_entries: int = 0,
+        buckets: Tuple[int, ...] = (),
+        max_batch_tokens: int = 0,
+    ) -> None:
+        self._ctx = mp.get_context("spawn")
+        self.torch_threads = max(0, torch_threads)
+        self.encoding_cache_entries = max(0, encoding_cache_entries)
+        self.buckets = tuple(buckets)
+        self.max_batch_tokens = max(0, max_batch_tokens)
+        self._results = self._ctx.Queue()
+        self._lock = Lock()
+        self._tasks: Dict[int, Tuple[Future, _Worker]] = {}
+        self._ids = itertools.count()
+        self._closed = False
+        self._workers: List[_Worker] = [self._spawn(i) for i in range(max(1, processes))]
+        self._reader = Thread(target=self._read_results, name="process-pool-results", daemon=True)
+        self._reader.start()
+
+    def generate(
+        self,
+        model_id: str,
+        tokenizer: Any,
+        model: Any,
+        prepared: List[str],
+        generation_kwargs: Mapping[str, Any],
+        with_confidence: bool = True,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> List[Tuple[str, float]]:
+        with self._lock:
+            worker = min(self._workers, key=lambda w: len(w.outstanding))
+            fut = self._submit(worker, model_id, tokenizer, model, prepared, generation_kwargs, with_confidence)
+        output, worker_timings = fut.result()
+        if timings is not None:
+            timings.update(worker_timings)
+        return output
+
+    def warm(
+        self,
+        model_id: str,
+        tokenizer: Any,
+        model: Any,
+        prepared: List[str],
+        generation_kwargs: Mapping[str, Any],
+        with_confidence: bool = True,
+    ) -> None:
+        """Loads ``model_id`` on every worker and runs one ``generate`` on each, waiting for all.
+
+        :meth:`generate` breaks ties toward the first worker, so sequential warm-up calls
+        through it would only ever reach that one.
+        """
+        with self._lock:
+            futures = [
+                self._submit(worker, model_id, tokenizer, model, prepared, generation_kwargs, with_confidence)
+                for worker in self._workers
+            ]
+        for fut in futures:
+            fut.result()
+
+    def drop(self, model_id: str) -> None:
+        with self._lock:
+            for worker in self._workers:
+                if model_id in worker.loaded:
+                    worker.requests.put(("drop", model_id))
+                    worker.loaded.discard(model_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "processes": len(self._workers),
+                "torch_threads": self.torch_threads or None,
+                "workers": [
+                    {
+                        "pid": w.process.pid,
+                        "alive": w.process.is_alive(),
+                        "outstanding": len(w.outstanding),
+                        "completed": w.completed,
+                        "models": sorted(w.loaded),
+                    }
+                    for w in self._workers
+                ],
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        for worker in workers:
+            worker.requests.put(None)
+        for worker in workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+    def _submit(
+        self,
+        worker: _Worker,
+        model_id: str,
+        tokenizer: Any,
+        model: Any,
+        prepared: List[str],
+        generation_kwargs: Mapping[str, Any],
+        with_confidence: bool,
+    ) -> Future:
+        # Called with the lock held.
+        fut: Future = Future()
+        task_id = next(self._ids)
+        self._tasks[task_id] = (fut, worker)
+        worker.outstanding.add(task_id)
+        if model_id not in worker.loaded:
+            worker.requests.put(("load", model_id, tokenizer, model))
+            worker.loaded.add(model_id)
+        worker.requests.put(("generate", task_id, model_id, prepared, dict(generation_kwargs), with_confidence))
+        return fut
+
+    def _spawn(self, index: int) -> _Worker:
+        requests = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                requests,
+                self._results,
+                self.torch_threads,
+                self.encoding_cache_entries,
+                self.buckets,
+                self.max_batch_tokens,
+            ),
+            name=f"inference-{index}",
+            daemon=True,
+        )
+        process.start()
+        return _Worker(index, requests, process)
+
+    def _read_results(self) -> None:
+        while True:
+            try:
+                task_id, ok, payload = self._results.get(timeout=1.0)
+            except queue.Empty:
+                self._reap_dead_workers()
+                continue
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                entry = self._tasks.pop(task_id, None)
+                if entry is not None:
+                    entry[1].outstanding.discard(task_id)
+                    entry[1].completed += 1
+            if entry is None:
+                continue
+            if ok:
+                entry[0].set_result(payload)
+            else:
+                entry[0].set_exception(RuntimeError(payload))
+
+    def _reap_dead_workers(self) -> None:
+        failed: List[Future] = []
+        with self._lock:
+            if self._closed:
+                return
+            for i, worker in enumerate(self._workers):
+                if worker.process.is_alive():
+                    continue
+                logger.error("Inference worker %s (pid %s) died; respawning", worker.index, worker.process.pid)
+                for task_id in worker.outstanding:
+                    entry = self._tasks.pop(task_id, None)
+                    if entry is not None:
+                        failed.append(entry[0])
+                self._workers[i] = self._spawn(worker.index)
+        for fut in failed:
+            fut.set_exception(RuntimeError("inference_worker_died"))
+
@@ -0,0 +1,274 @@
+"""
+Detecção de idioma rápida e com cache para o NeuroTranslator
+Atalhos por sistema de escrita, pontuação vetorizada por n-gramas de caracteres
+e langdetect determinístico apenas para textos longos
+"""
+
+import hashlib
+import re
+import unicodedata
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from langdetect import DetectorFactory, detect_langs
+    HAS_LANGDETECT = True
+except ImportError:
+    HAS_LANGDETECT = False
+
+_KANA = re.compile(r"[぀-ヿㇰ-ㇿｦ-ﾟ]")
+_HAN = re.compile(r"[㐀-䶿一-鿿豈-﫿]")
+_CYRILLIC = re.compile(r"[Ѐ-ӿ]")
+_NOT_LETTER = re.compile(r"[^\w\s]|[\d_]")
+
+# Amostras de texto comum por idioma de escrita latina; zh, ja e ru são decididos pelo sistema de escrita
+_SAMPLES = {
+    'pt': (
+        "o que você está fazendo hoje não é possível para nós mas ainda assim vamos tentar "
+        "eu não sei se ele vai conseguir chegar a tempo porque o trânsito está muito ruim "
+        "obrigado pela sua atenção e até amanhã bom dia boa tarde boa noite tudo bem com você "
+        "a informação foi enviada para o seu endereço de e-mail e o pedido já está a caminho "
+        "nós precisamos de mais tempo para terminar o trabalho da semana que vem então "
+        "ela disse que não gosta de café mas prefere chá com açúcar e pão de manhã "
+        "os dados são armazenados com segurança na nuvem e as traduções são rápidas "
+        "você pode me ajudar onde fica a estação quanto custa isso eu gostaria de uma mesa"
+    ),
+    'en': (
+        "what are you doing today it is not possible for us but we will still try "
+        "i do not know if he will be able to arrive on time because the traffic is very bad "
+        "thank you for your attention and see you tomorrow good morning good night how are you "
+        "the information was sent to your email address and the order is already on its way "
+        "we need more time to finish the work of the next week so please wait for us "
+        "she said that she does not like coffee but prefers tea with sugar and bread in the morning "
+        "the data is stored safely in the cloud and the translations are fast "
+        "can you help me where is the station how much is this i would like a table"
+    ),
+    'es': (
+        "qué estás haciendo hoy no es posible para nosotros pero aun así vamos a intentarlo "
+        "no sé si él podrá llegar a tiempo porque el tráfico está muy mal "
+        "gracias por su atención y hasta mañana buenos días buenas noches cómo estás "
+        "la información fue enviada a su dirección de correo y el pedido ya está en camino "
+        "necesitamos más tiempo para terminar el trabajo de la semana que viene así que espera "
+        "ella dijo que no le gusta el café pero prefiere el té con azúcar y pan por la mañana "
+        "los datos se almacenan con seguridad en la nube y las traducciones son rápidas "
+        "puedes ayudarme dónde está la estación cuánto cuesta esto me gustaría una mesa"
+    ),
+    'fr': (
+        "qu'est-ce que tu fais aujourd'hui ce n'est pas possible pour nous mais nous allons essayer "
+        "je ne sais pas s'il pourra arriver à l'heure parce que la circulation est très mauvaise "
+        "merci pour votre attention et à demain bonjour bonsoir comment allez-vous "
+        "l'information a été envoyée à votre adresse e-mail et la commande est déjà en route "
+        "nous avons besoin de plus de temps pour finir le travail de la semaine prochaine "
+        "elle a dit qu'elle n'aime pas le café mais préfère le thé avec du sucre et du pain le matin "
+        "les données sont stockées en toute sécurité dans le nuage et les traductions sont rapides "
+        "pouvez-vous m'aider où est la gare combien ça coûte je voudrais une table"
+    ),
+    'de': (
+        "was machst du heute das ist für uns nicht möglich aber wir werden es trotzdem versuchen "
+        "ich weiß nicht ob er rechtzeitig ankommen kann weil der verkehr sehr schlecht ist "
+        "danke für ihre aufmerksamkeit und bis morgen guten morgen gute nacht wie geht es dir "
+        "die information wurde an ihre e-mail-adresse geschickt und die bestellung ist schon unterwegs "
+        "wir brauchen mehr zeit um die arbeit der nächsten woche fertig zu machen also warte bitte "
+        "sie sagte dass sie keinen kaffee mag aber tee mit zucker und brot am morgen bevorzugt "
+        "die daten werden sicher in der cloud gespeichert und die übersetzungen sind schnell "
+        "können sie mir helfen wo ist der bahnhof wie viel kostet das ich hätte gern einen tisch"
+    ),
+    'it': (
+        "che cosa stai facendo oggi non è possibile per noi ma proveremo lo stesso "
+        "non so se lui riuscirà ad arrivare in tempo perché il traffico è molto brutto "
+        "grazie per la vostra attenzione e a domani buongiorno buonanotte come stai "
+        "l'informazione è stata inviata al tuo indirizzo email e l'ordine è già in viaggio "
+        "abbiamo bisogno di più tempo per finire il lavoro della prossima settimana quindi aspetta "
+        "lei ha detto che non le piace il caffè ma preferisce il tè con lo zucchero e il pane la mattina "
+        "i dati sono conservati in modo sicuro nel cloud e le traduzioni sono veloci "
+        "puoi aiutarmi dov'è la stazione quanto costa questo vorrei un tavolo"
+    ),
+}
+
+
+def _normalize(text: str) -> str:
+    """Minúsculas, NFC e apenas letras e espaços (dígitos e pontuação não indicam idioma)"""
+    text = unicodedata.normalize('NFC', text).casefold()
+    return " ".join(_NOT_LETTER.sub(" ", text).split())
+
+
+def _ngrams(text: str, sizes: Tuple[int, ...]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for word in text.split():
+        padded = f" {word} "
+        for n in sizes:
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+class NgramScorer:
+    """
+    Classificador por n-gramas de caracteres (naive Bayes com suavização)
+
+    Os perfis de todos os idiomas ficam em uma matriz (idiomas x n-gramas) de
+    log-probabilidades; um lote de textos vira uma matriz de contagens e é
+    pontuado com um único produto de matrizes.
+    """
+
+    def __init__(self, samples: Dict[str, str], sizes: Tuple[int, ...] = (1, 2, 3), alpha: float = 0.5):
+        self.sizes = sizes
+        self.languages = list(samples)
+        profiles = [_ngrams(_normalize(text), sizes) for text in samples.values()]
+        vocab = sorted(set().union(*profiles))
+        self._index = {gram: i for i, gram in enumerate(vocab)}
+        counts = np.zeros((len(profiles), len(vocab)), dtype=np.float64)
+        for row, profile in enumerate(profiles):
+            for gram, count in profile.items():
+                counts[row, self._index[gram]] = count
+        totals = counts.sum(axis=1, keepdims=True)
+        self._log_probs = np.log((counts + alpha) / (totals + alpha * len(vocab)))
+
+    def scores(self, texts: List[str]) -> np.ndarray:
+        """Probabilidades (textos x idiomas); textos sem n-gramas conhecidos ficam uniformes"""
+        counts = np.zeros((len(texts), len(self._index)), dtype=np.float64)
+        for row, text in enumerate(texts):
+            for gram, count in _ngrams(_normalize(text), self.sizes).items():
+                col = self._index.get(gram)
+                if col is not None:
+                    counts[row, col] = count
+        logits = counts @ self._log_probs.T
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def predict(self, texts: List[str]) -> List[Tuple[str, float]]:
+        if not texts:
+            return []
+        probs = self.scores(texts)
+        best = probs.argmax(axis=1)
+        return [(self.languages[i], float(probs[row, i])) for row, i in enumerate(best)]
+
+
+class LanguageDetector:
+    """
+    Detector de idioma com cache LRU por hash do texto
+
+    Ordem de decisão: cache; kana (ja), ideogramas (zh) ou cirílico (ru) pelo sistema
+    de escrita; textos curtos (ou sem langdetect) pelo NgramScorer; textos longos pelo
+    langdetect com semente fixa, restrito aos idiomas suportados. Textos sem letras
+    retornam o idioma padrão.
+    """
+
+    def __init__(self,
+                 languages: Iterable[str],
+                 cache_size: int = 4096,
+                 short_text_chars: int = 200,
+                 seed: int = 0,
+                 default: str = 'pt'):
+        self.languages = set(languages)
+        self.cache_size = max(1, cache_size)
+        self.short_text_chars = short_text_chars
+        self.default = default
+        self.scorer = NgramScorer({lang: text for lang, text in _SAMPLES.items() if lang in self.languages})
+        if HAS_LANGDETECT:
+            # langdetect é aleatório por padrão; a semente torna o resultado reproduzível
+            DetectorFactory.seed = seed
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.by_method = {'script': 0, 'ngram': 0, 'langdetect': 0, 'default': 0}
+
+    def detect(self, text: str) -> str:
+        """Detectar o idioma de um texto"""
+        return self.detect_many([text])[0]
+
+    def detect_many(self, texts: List[str]) -> List[str]:
+        """
+        Detectar o idioma de vários textos
+
+        Textos repetidos são detectados uma vez e todos os textos curtos ausentes do
+        cache são pontuados juntos.
+        """
+        keys = [self._key(text) for text in texts]
+        found: Dict[bytes, str] = {}
+        with self._lock:
+            for key in keys:
+                lang = self._cache.get(key)
+                if lang is not None:
+                    self._cache.move_to_end(key)
+                    found[key] = lang
+            missing = {key: text for key, text in zip(keys, texts) if key not in found}
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        detected: Dict[bytes, str] = {}
+        methods: Dict[str, int] = {}
+        short: Dict[bytes, str] = {}
+        for key, text in missing.items():
+            lang, method = self._shortcut(text)
+            if lang is None and (not HAS_LANGDETECT or len(text) < self.short_text_chars):
+                short[key] = text
+                continue
+            if lang is None:
+                lang, method = self._langdetect(text)
+            detected[key] = lang
+            methods[method] = methods.get(method, 0) + 1
+
+        for key, (lang, _) in zip(short, self.scorer.predict(list(short.values()))):
+            detected[key] = lang
+            methods['ngram'] = methods.get('ngram', 0) + 1
+
+        with self._lock:
+            for method, count in methods.items():
+                self.by_method[method] += count
+            for key, lang in detected.items():
+                self._cache[key] = lang
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        found.update(detected)
+        return [found[key] for key in keys]
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._cache),
+                'max_entries': self.cache_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'by_method': dict(self.by_method)
+            }
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        normalized = " ".join(unicodedata.normalize('NFC', text).split())
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+
+    def _shortcut(self, text: str) -> Tuple[Optional[str], str]:
+        """Decisões imediatas pelo sistema de escrita (ou idioma padrão para textos sem letras)"""
+        if 'ja' in self.languages and _KANA.search(text):
+            return 'ja', 'script'
+        if 'zh' in self.languages and _HAN.search(text):
+            return 'zh', 'script'
+        if 'ru' in self.languages and _CYRILLIC.search(text):
+            return 'ru', 'script'
+        if not _normalize(text):
+            return self.default, 'default'
+        return None, ''
+
+    def _langdetect(self, text: str) -> Tuple[str, str]:
+        try:
+            for candidate in detect_langs(text):
+                lang = candidate.lang.split('-')[0]
+                if lang in self.languages:
+                    return lang, 'langdetect'
+        except Exception:
+            pass
+        return self.scorer.predict([text])[0][0], 'ngram'
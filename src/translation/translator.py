@@ -6,6 +6,7 @@ Autor: Flávio Henrique Barbosa
 
 import time
 import logging
+from functools import partial
 from typing import Dict, Any, Optional, List
 import numpy as np
 from pathlib import Path
@@ -15,12 +16,52 @@ try:
     import torch
     import transformers
     from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
-    from langdetect import detect, detect_langs
     HAS_TRANSFORMERS = True
 except ImportError:
     print("⚠️ Bibliotecas de ML não encontradas. Execute: pip install torch transformers langdetect")
     HAS_TRANSFORMERS = False
 
+try:
+    from .language_detection import LanguageDetector
+except ImportError:
+    from translation.language_detection import LanguageDetector  # type: ignore
+
+try:
+    from ..api.cache import TranslationCache, read_warm_file
+    from ..api.segmentation import split_sentences
+except ImportError:
+    from api.cache import TranslationCache, read_warm_file  # type: ignore
+    from api.segmentation import split_sentences  # type: ignore
+
+try:
+    from ..api.fuzzy import FuzzyMatcher, NearDuplicateIndex
+    from ..api.translation_memory import TranslationMemory
+except ImportError:
+    from api.fuzzy import FuzzyMatcher, NearDuplicateIndex  # type: ignore
+    from api.translation_memory import TranslationMemory  # type: ignore
+
+try:
+    from ..api.quantization import quantize_dynamic_int8
+except ImportError:
+    try:
+        from api.quantization import quantize_dynamic_int8  # type: ignore
+    except ImportError:
+        quantize_dynamic_int8 = None
+
+try:
+    from ..api.bucketing import DEFAULT_BUCKETS
+    from ..api.inference import generate_bucketed
+    from ..api.tokenization import EncodingCache
+except ImportError:
+    try:
+        from api.bucketing import DEFAULT_BUCKETS  # type: ignore
+        from api.inference import generate_bucketed  # type: ignore
+        from api.tokenization import EncodingCache  # type: ignore
+    except ImportError:
+        DEFAULT_BUCKETS = ()
+        generate_bucketed = None
+        EncodingCache = None
+
 class LanguageManager:
     """Gerenciador de idiomas com suporte a 9 idiomas"""
     
@@ -107,14 +148,62 @@ class NeuroTranslator:
         # Configurações de performance
         self.max_length = self.config.get('max_length', 512)
         self.batch_size = self.config.get('batch_size', 8)
+        # Lotes por faixa de comprimento em tokens, limitados em tokens com padding (0 = sem limite)
+        self.batch_buckets = tuple(self.config.get('batch_buckets', DEFAULT_BUCKETS))
+        self.max_batch_tokens = self.config.get('max_batch_tokens', 4096)
         self.device = self.config.get('device', 'auto')
+        # Textos longos são traduzidos frase a frase; frases maiores que isso são quebradas
+        self.segment_max_chars = self.config.get('segment_max_chars', 400)
         
         if self.device == 'auto':
             self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
         
+        # Quantização int8 dinâmica (somente CPU): True para todos os pares
+        # ou lista de pares, ex.: ['pt-en', 'en-pt']
+        self.quantize = self.config.get('quantize', False)
+        
+        # LRU de entradas já tokenizadas (0 desativa): frases repetidas pulam o tokenizer
+        encoding_entries = self.config.get('encoding_cache_entries', 4096)
+        self.encodings = EncodingCache(encoding_entries) if EncodingCache is not None and encoding_entries > 0 else None
+        
+        # Detecção de idioma com cache LRU, atalhos por sistema de escrita e semente fixa
+        self.language_detector = LanguageDetector(
+            LanguageManager.SUPPORTED_LANGUAGES,
+            cache_size=self.config.get('detect_cache_size', 4096),
+            short_text_chars=self.config.get('detect_short_text_chars', 200),
+            seed=self.config.get('detect_seed', 0)
+        )
+        
         # Cache de modelos carregados
         self.loaded_models: Dict[str, Any] = {}
-        self.translation_cache: Dict[str, str] = {}
+        
+        # Memória de tradução persistente (SQLite), compartilhada entre processos e execuções do tradutor;
+        # as chaves usam os modelos e o max_length do tradutor e não coincidem com as da API
+        self.translation_memory = None
+        if self.config.get('tm_path'):
+            self.translation_memory = TranslationMemory(
+                self.config['tm_path'],
+                max_entries=self.config.get('tm_max_entries', 1_000_000),
+                max_bytes=self.config.get('tm_max_bytes', 1024 * 1024 * 1024),
+                ttl_s=self.config.get('cache_ttl', None)
+            )
+        
+        # Cache de traduções LRU limitado por entradas/bytes, com TTL opcional
+        self.translation_cache = TranslationCache(
+            max_entries=self.config.get('cache_max_entries', 10_000),
+            max_bytes=self.config.get('cache_max_bytes', 64 * 1024 * 1024),
+            ttl_s=self.config.get('cache_ttl', None),
+            store=self.translation_memory
+        )
+        
+        # Números, URLs e e-mails mascarados na chave; índice de quase-duplicatas opcional (limiar > 0)
+        self.fuzzy = None
+        if self.config.get('cache_placeholders', True):
+            threshold = self.config.get('cache_fuzzy_threshold', 0.0)
+            index = NearDuplicateIndex(threshold, max_entries=self.config.get('cache_max_entries', 10_000)) if threshold > 0 else None
+            self.fuzzy = FuzzyMatcher(self.translation_cache, index)
+        if self.config.get('cache_warm_file'):
+            self.warm_cache(self.config['cache_warm_file'])
         
         # Estatísticas de performance
         self.stats = {
@@ -139,26 +228,7 @@ class NeuroTranslator:
             str: Código do idioma detectado
         """
         try:
-            # Usar langdetect para detecção robusta
-            detected = detect(text)
-            
-            # Verificar se está nos idiomas suportados
-            if detected in LanguageManager.SUPPORTED_LANGUAGES:
-                return detected
-            
-            # Se não estiver suportado, tentar detectar várias possibilidades
-            langs = detect_langs(text)
-            for lang in langs:
-                lang_code = str(lang).split(':')[0]
-                if lang_code in LanguageManager.SUPPORTED_LANGUAGES:
-                    return lang_code
-            
-            # Fallback para português ou inglês baseado em caracteres
-            if any(ord(c) > 127 for c in text):  # Caracteres especiais
-                return 'pt'
-            else:
-                return 'en'
-                
+            return self.language_detector.detect(text)
         except Exception as e:
             self.logger.warning(f"Erro na detecção de idioma: {e}")
             return 'pt'  # Fallback padrão
@@ -191,12 +261,17 @@ class NeuroTranslator:
             self.logger.info(f"Carregando modelo {model_name} para {pair_key}")
             
             # Carregar tokenizer e modelo
-            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
             model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
             
             # Mover para device apropriado
             model = model.to(self.device)
             
+            # Quantização int8 dinâmica das camadas Linear (CPU)
+            if self._should_quantize(pair_key):
+                model = quantize_dynamic_int8(model)
+                self.logger.info(f"Modelo {pair_key} quantizado para int8")
+            
             # Criar pipeline de tradução
             translation_pipeline = pipeline(
                 "translation",
@@ -268,13 +343,25 @@ class NeuroTranslator:
                     "cached": False
                 }
             
-            # Verificar cache
-            cache_key = f"{source_lang}-{target_lang}:{text}"
-            if use_cache and cache_key in self.translation_cache:
+            # Segmentar em frases (preservando espaços e quebras de parágrafo)
+            segments = split_sentences(text, max_chars=self.segment_max_chars)
+            sentences = list(dict.fromkeys(s for s, _ in segments if s))
+            
+            # Verificar cache por frase
+            translated: Dict[str, str] = {}
+            misses: List[str] = []
+            for sentence in sentences:
+                cached = self._cached(sentence, source_lang, target_lang) if use_cache else None
+                if cached is not None:
+                    translated[sentence] = cached
+                else:
+                    misses.append(sentence)
+            
+            if not misses:
                 self.stats['cache_hits'] += 1
                 return {
                     "original": text,
-                    "translation": self.translation_cache[cache_key],
+                    "translation": self._join_segments(segments, translated),
                     "source_lang": source_lang,
                     "target_lang": target_lang,
                     "confidence": 0.95,
@@ -285,23 +372,15 @@ class NeuroTranslator:
             
             self.stats['cache_misses'] += 1
             
-            # Carregar modelo se necessário
-            if not self.load_model(source_lang, target_lang):
-                # Fallback para tradução simulada
-                translation = self._simulate_translation(text, source_lang, target_lang)
-            else:
-                # Obter pipeline carregado
-                pair_key = f"{source_lang}-{target_lang}"
-                pipeline = self.loaded_models[pair_key]
-                
-                # Realizar tradução
-                result = pipeline(text, max_length=self.max_length)
-                translation = result[0]['translation_text']
+            # Traduzir as frases ausentes do cache em lote
+            translated.update(zip(misses, self._translate_sentences(misses, source_lang, target_lang)))
             
             # Armazenar no cache
             if use_cache:
-                self.translation_cache[cache_key] = translation
+                for sentence in misses:
+                    self._remember(sentence, source_lang, target_lang, translated[sentence])
             
+            translation = self._join_segments(segments, translated)
             processing_time = time.time() - start_time
             
             # Atualizar estatísticas
@@ -335,6 +414,227 @@ class NeuroTranslator:
                 "error": str(e)
             }
     
+    def translate_many(self,
+                       texts: List[str],
+                       source_lang: str = "auto",
+                       target_lang: str = "en",
+                       use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Traduzir vários textos de uma vez
+        
+        Textos repetidos são traduzidos uma vez; com source_lang 'auto' cada texto é
+        detectado e agrupado por idioma. As frases ausentes do cache de cada grupo são
+        ordenadas por tamanho (menos padding) e traduzidas em lotes de batch_size.
+        
+        Args:
+            texts: Textos para tradução
+            source_lang: Idioma de origem ('auto' para detecção automática)
+            target_lang: Idioma de destino
+            use_cache: Se deve usar cache de tradução
+            
+        Returns:
+            Lista de dicts no formato de translate(), na ordem de entrada
+        """
+        start_time = time.time()
+        translations_before = self.stats['translations']
+        unique = list(dict.fromkeys(t.strip() for t in texts if t and t.strip()))
+        
+        # Agrupar por idioma de origem (detectado em lote quando 'auto')
+        if source_lang == "auto":
+            try:
+                langs = self.language_detector.detect_many(unique)
+            except Exception as e:
+                self.logger.warning(f"Erro na detecção de idioma: {e}")
+                langs = ['pt'] * len(unique)
+        else:
+            langs = [source_lang] * len(unique)
+        groups: Dict[str, List[str]] = {}
+        for text, lang in zip(unique, langs):
+            groups.setdefault(lang, []).append(text)
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        for lang, group in groups.items():
+            try:
+                results.update(self._translate_group(group, lang, target_lang, use_cache))
+            except Exception as e:
+                self.logger.error(f"Erro na tradução em lote ({lang}-{target_lang}): {e}")
+                for text in group:
+                    results[text] = {
+                        "original": text,
+                        "translation": None,
+                        "source_lang": lang,
+                        "target_lang": target_lang,
+                        "confidence": 0.0,
+                        "model_used": "error",
+                        "cached": False,
+                        "error": str(e)
+                    }
+        
+        processing_time = time.time() - start_time
+        if self.stats['translations'] > translations_before:
+            self.stats['total_time'] += processing_time
+            self.stats['avg_time'] = self.stats['total_time'] / self.stats['translations']
+        output = []
+        for text in texts:
+            key = text.strip() if text else ""
+            if key not in results:
+                output.append({
+                    "original": text,
+                    "translation": None,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "confidence": 0.0,
+                    "processing_time": processing_time,
+                    "model_used": "error",
+                    "cached": False,
+                    "error": "Texto vazio fornecido"
+                })
+                continue
+            # Tempo total do lote: os textos são traduzidos juntos
+            output.append({**results[key], "processing_time": processing_time})
+        return output
+    
+    def _translate_group(self, texts: List[str], source_lang: str, target_lang: str,
+                         use_cache: bool) -> Dict[str, Dict[str, Any]]:
+        """Traduz textos de um mesmo idioma de origem com uma única passagem em lote pelas frases"""
+        if source_lang not in LanguageManager.SUPPORTED_LANGUAGES:
+            raise ValueError(f"Idioma de origem '{source_lang}' não suportado")
+        if target_lang not in LanguageManager.SUPPORTED_LANGUAGES:
+            raise ValueError(f"Idioma de destino '{target_lang}' não suportado")
+        
+        def result(text: str, translation: str, confidence: float, model_used: str, cached: bool) -> Dict[str, Any]:
+            return {
+                "original": text,
+                "translation": translation,
+                "source_lang": source_lang,
+                "target_lang": target_lang,
+                "confidence": confidence,
+                "model_used": model_used,
+                "cached": cached
+            }
+        
+        if source_lang == target_lang:
+            return {text: result(text, text, 1.0, "none", False) for text in texts}
+        
+        segments = {text: split_sentences(text, max_chars=self.segment_max_chars) for text in texts}
+        sentences = list(dict.fromkeys(s for segs in segments.values() for s, _ in segs if s))
+        
+        translated: Dict[str, str] = {}
+        misses: List[str] = []
+        for sentence in sentences:
+            cached = self._cached(sentence, source_lang, target_lang) if use_cache else None
+            if cached is not None:
+                translated[sentence] = cached
+            else:
+                misses.append(sentence)
+        
+        if misses:
+            # Frases de tamanho parecido no mesmo lote desperdiçam menos padding
+            ordered = sorted(misses, key=len)
+            translated.update(zip(ordered, self._translate_sentences(ordered, source_lang, target_lang)))
+            if use_cache:
+                for sentence in misses:
+                    self._remember(sentence, source_lang, target_lang, translated[sentence])
+        
+        missing = set(misses)
+        out: Dict[str, Dict[str, Any]] = {}
+        for text, segs in segments.items():
+            translation = self._join_segments(segs, translated)
+            if any(s in missing for s, _ in segs):
+                self.stats['cache_misses'] += 1
+                self.stats['translations'] += 1
+                out[text] = {**result(text, translation, 0.85, f"{source_lang}-{target_lang}", False), "device": self.device}
+            else:
+                self.stats['cache_hits'] += 1
+                out[text] = result(text, translation, 0.95, "cache", True)
+        return out
+    
+    def _translate_sentences(self, sentences: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """Traduz uma lista de frases em lotes de comprimento parecido (até batch_size frases)"""
+        if not self.load_model(source_lang, target_lang):
+            # Fallback para tradução simulada
+            return [self._simulate_translation(s, source_lang, target_lang) for s in sentences]
+        pipeline = self.loaded_models[f"{source_lang}-{target_lang}"]
+        if generate_bucketed is None:
+            results = pipeline(sentences, max_length=self.max_length, batch_size=self.batch_size)
+            return [r['translation_text'] for r in results]
+        
+        # Mesmo modelo do pipeline, com a tokenização servida pelo cache de codificações
+        # e cada lote com padding só até a maior frase da sua faixa de comprimento
+        token_ids = None
+        if self.encodings is not None:
+            model_name = LanguageManager.get_model_for_pair(source_lang, target_lang)
+            token_ids = partial(self.encodings.token_ids, model_name, pipeline.tokenizer)
+        outputs = generate_bucketed(
+            pipeline.tokenizer, pipeline.model, sentences, {'max_length': self.max_length},
+            with_confidence=False, token_ids=token_ids, boundaries=self.batch_buckets,
+            max_tokens=self.max_batch_tokens, max_items=self.batch_size
+        )
+        return [text for text, _ in outputs]
+    
+    @staticmethod
+    def _join_segments(segments, translated: Dict[str, str]) -> str:
+        """Remonta o texto traduzido mantendo os separadores originais entre as frases"""
+        return "".join(translated.get(sentence, sentence) + sep for sentence, sep in segments)
+    
+    def _should_quantize(self, pair_key: str) -> bool:
+        """Verifica se o par deve usar quantização int8 dinâmica"""
+        if self.device != 'cpu' or quantize_dynamic_int8 is None:
+            return False
+        if isinstance(self.quantize, (list, tuple, set)):
+            return pair_key in self.quantize
+        return bool(self.quantize)
+    
+    def _cache_key(self, text: str, source_lang: str, target_lang: str):
+        """Chave de cache normalizada: (modelo, texto, parâmetros de geração)"""
+        model_name = LanguageManager.get_model_for_pair(source_lang, target_lang)
+        params = {'max_length': self.max_length}
+        if self._should_quantize(f"{source_lang}-{target_lang}"):
+            params['int8'] = True
+        return TranslationCache.make_key(model_name, text, params)
+    
+    def _cached(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """Consulta exata no cache e, se falhar, por placeholders/quase-duplicatas"""
+        key = self._cache_key(text, source_lang, target_lang)
+        cached = self.translation_cache.get(key)
+        if cached is None and self.fuzzy is not None:
+            hit = self.fuzzy.get(key[0], text, dict(key[2]))
+            cached = hit[0] if hit is not None else None
+        return cached
+    
+    def _remember(self, text: str, source_lang: str, target_lang: str, translation: str):
+        """Armazenar tradução no cache (e seu modelo com placeholders)"""
+        key = self._cache_key(text, source_lang, target_lang)
+        self.translation_cache.put(key, translation)
+        if self.fuzzy is not None:
+            self.fuzzy.put(key[0], text, dict(key[2]), translation)
+    
+    def warm_cache(self, path: str) -> int:
+        """
+        Pré-aquecer o cache a partir de um arquivo .json/.jsonl
+        
+        Cada registro deve conter 'source', 'target', 'text' e 'translation'.
+        
+        Returns:
+            int: Número de entradas carregadas
+        """
+        entries = []
+        try:
+            for record in read_warm_file(path):
+                text = record.get('text')
+                translation = record.get('translation')
+                if not isinstance(text, str) or not isinstance(translation, str):
+                    continue
+                entries.append((text.strip(), record.get('source', ''), record.get('target', ''), translation))
+        except Exception as e:
+            self.logger.warning(f"Erro ao pré-aquecer cache de traduções: {e}")
+            return 0
+        for text, source_lang, target_lang, translation in entries:
+            self._remember(text, source_lang, target_lang, translation)
+        count = len(entries)
+        self.logger.info(f"Cache de traduções pré-aquecido com {count} entradas")
+        return count
+    
     def _simulate_translation(self, text: str, source_lang: str, target_lang: str) -> str:
         """
         Tradução simulada para fallback (será substituída por IA real)
@@ -401,6 +701,10 @@ class NeuroTranslator:
         return {
             **self.stats,
             'cache_size': len(self.translation_cache),
+            'cache': self.translation_cache.stats(),
+            'encodings': self.encodings.stats() if self.encodings is not None else None,
+            'fuzzy': self.fuzzy.stats() if self.fuzzy is not None else None,
+            'language_detection': self.language_detector.stats(),
             'loaded_models': len(self.loaded_models),
             'supported_languages': len(LanguageManager.SUPPORTED_LANGUAGES),
             'device': self.device
@@ -418,6 +722,11 @@ class NeuroTranslator:
             del self.loaded_models[pair_key]
             self.logger.info(f"Modelo {pair_key} descarregado")
     
+    def close(self):
+        """Gravar as traduções pendentes na memória de tradução e fechá-la"""
+        if self.translation_memory is not None:
+            self.translation_memory.close()
+    
     def unload_all_models(self):
         """Descarregar todos os modelos da memória"""
         self.loaded_models.clear()
@@ -70,6 +70,9 @@ class NeuroTranslatorGUI(ctk.CTk):
         self.camera_manager = None
         self.speech_recognizer = None
         self.translator = None
+        self.live_session = None
+        self._live_pair = None
+        self._live_pending = False
         
         # Inicializar variáveis de controle ANTES de criar widgets
         self.auto_translate_var = ctk.BooleanVar(value=True)  # Ativado por padrão
@@ -425,6 +428,57 @@ class NeuroTranslatorGUI(ctk.CTk):
             error_msg = f"Erro na tradução: {str(e)}"
             self.after(0, self._update_translation_error, error_msg)
     
+    def translate_live(self):
+        """Traduzir incrementalmente o texto reconhecido, reaproveitando frases já traduzidas"""
+        text = self.input_text.get("1.0", "end-1c").strip()
+        if not text:
+            return
+        if self.is_translating:
+            # Reexecutar ao fim da tradução atual com o texto mais recente
+            self._live_pending = True
+            return
+        
+        self._lazy_init_translator()
+        source_lang = self._map_language(self.source_lang_combo.get(), to_code=True)
+        target_lang = self._map_language(self.target_lang_combo.get(), to_code=True)
+        
+        # Nova sessão ao trocar o par de idiomas; as frases traduzidas só valem para o mesmo par
+        if self.live_session is None or self._live_pair != (source_lang, target_lang):
+            from ..api.live import LiveSession
+            
+            def translate_sentences(sentences):
+                results = [self.translator.translate(s, source_lang, target_lang) for s in sentences]
+                self._live_confidence = sum(r.get("confidence", 0.0) for r in results) / len(results)
+                return [r.get("translation") or "" for r in results]
+            
+            self.live_session = LiveSession(translate_sentences)
+            self._live_pair = (source_lang, target_lang)
+            self._live_confidence = 0.0
+        
+        self.is_translating = True
+        thread = threading.Thread(target=self._translate_live_worker, args=(text,), daemon=True)
+        thread.start()
+    
+    def _translate_live_worker(self, text: str):
+        """Worker thread para tradução incremental"""
+        try:
+            start_time = time.time()
+            diff = self.live_session.update(text)
+            print(f"🔄 DEBUG: Tradução incremental - {diff['translated']} frase(s) traduzida(s), "
+                  f"{diff['count'] - diff['translated']} reaproveitada(s)")
+            result = {"translation": diff["translated_text"], "confidence": self._live_confidence}
+            self.after(0, self._finish_live_translation, result, time.time() - start_time)
+        except Exception as e:
+            print(f"❌ DEBUG: Erro no _translate_live_worker: {e}")
+            self.after(0, self._update_translation_error, f"Erro na tradução: {str(e)}")
+    
+    def _finish_live_translation(self, result: Dict[str, Any], processing_time: float):
+        """Exibir a tradução incremental e processar o parcial que chegou durante ela"""
+        self._update_translation_result(result, processing_time)
+        if self._live_pending:
+            self._live_pending = False
+            self.translate_live()
+    
     def _update_translation_result(self, result: Dict[str, Any], processing_time: float):
         """Atualizar resultado da tradução na interface"""
         try:
@@ -675,7 +729,7 @@ class NeuroTranslatorGUI(ctk.CTk):
             if auto_translate_enabled:
                 print("🔄 DEBUG: Tradução automática habilitada, iniciando tradução...")
                 # Aguardar um pouco para garantir que a interface foi atualizada
-                self.after(100, self.translate_text)
+                self.after(100, self.translate_live)
             else:
                 print("🔄 DEBUG: Tradução automática desabilitada")
                 
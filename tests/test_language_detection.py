@@ -0,0 +1,66 @@
+"""
+Testes para a detecção de idioma
+"""
+
+import unittest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from translation.language_detection import LanguageDetector
+
+LANGUAGES = ['pt', 'en', 'es', 'fr', 'de', 'zh', 'ja', 'it', 'ru']
+
+
+class TestLanguageDetector(unittest.TestCase):
+    """Testes para a classe LanguageDetector"""
+    
+    def setUp(self):
+        """Configuração inicial para os testes"""
+        self.detector = LanguageDetector(LANGUAGES)
+        
+    def test_script_shortcuts(self):
+        """Kana, ideogramas e cirílico decidem o idioma sem pontuação"""
+        self.assertEqual(self.detector.detect_many(["こんにちは", "東京へ行きます", "你好世界", "Привет"]),
+                         ['ja', 'ja', 'zh', 'ru'])
+        self.assertEqual(self.detector.stats()['by_method']['script'], 4)
+        
+    def test_short_latin_texts(self):
+        """Frases curtas dos idiomas de escrita latina"""
+        texts = {
+            "Bom dia, tudo bem com você?": 'pt',
+            "Good morning, how are you?": 'en',
+            "Buenos días, ¿cómo estás?": 'es',
+            "Bonjour, comment ça va?": 'fr',
+            "Guten Morgen, wie geht's?": 'de',
+            "Buongiorno, come stai?": 'it',
+        }
+        self.assertEqual(self.detector.detect_many(list(texts)), list(texts.values()))
+        
+    def test_cache_and_batch_order(self):
+        """Textos repetidos são detectados uma vez e o resultado segue a ordem de entrada"""
+        result = self.detector.detect_many(["Thank you", "Obrigado pela ajuda", "Thank you"])
+        self.assertEqual(result, ['en', 'pt', 'en'])
+        self.assertEqual(self.detector.detect("Thank  you"), 'en')
+        stats = self.detector.stats()
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hits'], 2)
+        
+    def test_text_without_letters_uses_default(self):
+        """Números e pontuação não indicam idioma"""
+        self.assertEqual(self.detector.detect("123 ?!"), 'pt')
+        
+    def test_deterministic_long_text(self):
+        """Textos longos dão sempre o mesmo resultado"""
+        text = ("Hoje eu fui ao mercado comprar frutas e verduras para a semana toda, mas esqueci a lista "
+                "em casa e tive que voltar para buscar antes de terminar as compras do mês inteiro.")
+        results = set()
+        for _ in range(3):
+            self.detector.clear()
+            results.add(self.detector.detect(text * 2))
+        self.assertEqual(results, {'pt'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Testes para a tradução em lote (NeuroTranslator.translate_many)
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from translation.translator import NeuroTranslator
+
+
+class TestTranslateMany(unittest.TestCase):
+    """Testes de translate_many com o modelo substituído por um stub"""
+
+    def setUp(self):
+        """Tradutor em CPU cujas frases são 'traduzidas' sem carregar modelos"""
+        self.translator = NeuroTranslator({'device': 'cpu'})
+        self.calls = []
+
+        def translate_sentences(sentences, source_lang, target_lang):
+            self.calls.append((source_lang, target_lang, list(sentences)))
+            return [f"{target_lang}:{s}" for s in sentences]
+
+        patcher = mock.patch.object(self.translator, '_translate_sentences', side_effect=translate_sentences)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def translated(self):
+        """Frases enviadas ao modelo, em todas as chamadas"""
+        return [s for _, _, sentences in self.calls for s in sentences]
+
+    def test_input_order_and_duplicates(self):
+        """Resultados na ordem de entrada; textos repetidos traduzidos uma vez"""
+        texts = ["Bom dia", "Obrigado", " Bom dia ", "Até logo", "Obrigado"]
+        results = self.translator.translate_many(texts, source_lang='pt', target_lang='en')
+
+        self.assertEqual([r['original'] for r in results], ["Bom dia", "Obrigado", "Bom dia", "Até logo", "Obrigado"])
+        self.assertEqual([r['translation'] for r in results],
+                         ["en:Bom dia", "en:Obrigado", "en:Bom dia", "en:Até logo", "en:Obrigado"])
+        self.assertEqual(sorted(self.translated()), ["Até logo", "Bom dia", "Obrigado"])
+        self.assertEqual(self.translator.stats['translations'], 3)
+
+    def test_empty_item_keeps_its_error(self):
+        """Um item vazio recebe seu erro sem afetar os demais"""
+        results = self.translator.translate_many(["Olá", "", "   "], source_lang='pt', target_lang='en')
+
+        self.assertEqual(results[0]['translation'], "en:Olá")
+        self.assertNotIn('error', results[0])
+        for result in results[1:]:
+            self.assertIsNone(result['translation'])
+            self.assertEqual(result['error'], "Texto vazio fornecido")
+        self.assertEqual(self.translated(), ["Olá"])
+
+    def test_auto_detection_groups_by_language(self):
+        """Com 'auto', cada idioma detectado é traduzido em um único grupo"""
+        languages = {"Bonjour": 'fr', "Olá": 'pt', "Merci": 'fr', "Obrigado": 'pt'}
+        with mock.patch.object(self.translator.language_detector, 'detect_many',
+                               side_effect=lambda texts: [languages[t] for t in texts]) as detect:
+            results = self.translator.translate_many(list(languages), target_lang='en')
+
+        detect.assert_called_once_with(list(languages))
+        self.assertEqual([r['source_lang'] for r in results], ['fr', 'pt', 'fr', 'pt'])
+        self.assertEqual(sorted((src, sorted(s)) for src, _, s in self.calls),
+                         [('fr', ["Bonjour", "Merci"]), ('pt', ["Obrigado", "Olá"])])
+
+    def test_sentence_cache_hits_are_cached(self):
+        """Um texto cujas frases já estão todas no cache sai como 'cached'"""
+        self.translator.translate_many(["Bom dia. Boa noite."], source_lang='pt', target_lang='en')
+        self.calls.clear()
+
+        results = self.translator.translate_many(["Boa noite. Bom dia.", "Boa noite. Até logo."],
+                                                 source_lang='pt', target_lang='en')
+
+        self.assertEqual(results[0]['translation'], "en:Boa noite. en:Bom dia.")
+        self.assertTrue(results[0]['cached'])
+        self.assertEqual(results[0]['model_used'], "cache")
+        self.assertFalse(results[1]['cached'])
+        self.assertEqual(self.translated(), ["Até logo."])
+
+    def test_placeholder_template_fills_new_numbers(self):
+        """O modelo com placeholders de 'Pedido 1234' responde 'Pedido 999' com o novo número"""
+        self.translator.translate_many(["Pedido 1234"], source_lang='pt', target_lang='en')
+        self.calls.clear()
+
+        results = self.translator.translate_many(["Pedido 999"], source_lang='pt', target_lang='en')
+
+        self.assertEqual(results[0]['translation'], "en:Pedido 999")
+        self.assertTrue(results[0]['cached'])
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.translator.fuzzy.stats()['template_hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()